@@ -39,6 +39,7 @@ except ImportError:
     from . import configuration as cf
     from . import UnitObject, Interaction, Utility, AStar, Engine
 
+import timeit
 import logging
 logger = logging.getLogger(__name__)
  
@@ -47,6 +48,10 @@ logger = logging.getLogger(__name__)
 # Slower by about ~2.5x
 QUICK_MOVE = True
 
+# whether the secondary AI measures paths to its targets with one
+# distance field flood instead of a separate AStar search for each target
+DISTANCE_FIELD = True
+
 PRIMARYAI = {'Move': 1,
              'Attack': 2,
              'Steal': 4,
@@ -73,6 +78,14 @@ class AI(object):
         self.did_something = False
 
         self.state = 'Init'
+        # Resumable decision pipeline, continued each frame until it finishes
+        self.planner = None
+        self.planner_key = None
+        # Whether the planner finished ahead of this unit's turn
+        self.planned = False
+        # Telemetry for the current decision
+        self.frames_used = 0
+        self.worst_slice = 0
 
         self.range = view_range # (0, 1, 2)
         self.priority = ai_priority # higher moves first
@@ -87,6 +100,11 @@ class AI(object):
         self.inner_ai = None
         self.valid_moves = set()
         self.available_targets = []
+        # Whether to tell the rest of my group once the decision is used
+        self.group_ping = False
+        # What the decision depends on. See get_plan_key
+        self.plan_region = []
+        self.plan_targets = []
 
     def change_ai(self, ai1, ai2):
         logger.debug('AI Change. From %s %s to %s %s', self.ai1_state, self.ai2_state, ai1, ai2)
@@ -94,140 +112,251 @@ class AI(object):
         self.ai2_state = ai2
 
     def get_true_valid_moves(self, gameStateObj):
-        valid_moves = self.unit.getValidMoves(gameStateObj)
+        return self.remove_occupied(self.unit.getValidMoves(gameStateObj), gameStateObj)
+
+    def remove_occupied(self, valid_moves, gameStateObj):
         # Make sure we don't move on top of another unit... getValidMoves returns positions coincident with allied units
         other_unit_positions = {unit.position for unit in gameStateObj.allunits if unit.position and unit is not self.unit}
         return valid_moves - other_unit_positions
 
-    # Now a state machine
-    def think(self, gameStateObj):
-        success = False
-        self.did_something = False
-        time1 = Engine.get_time()
+    def think(self, gameStateObj, speculative=False):
+        """
+        Continues the decision pipeline for up to cf.CONSTANTS['ai_frame_budget'] microseconds.
+        Returns True once a decision has been made.
+        If speculative, the decision is kept for this unit's turn, as long as nothing it depends on changes before then
+        """
         orig_pos = self.unit.position
+        key = None
+        if self.planner or self.planned:
+            key = self.get_plan_key(gameStateObj)
+            if key != self.planner_key:
+                logger.debug('AI %s %s board changed since planning began. Replanning', self.unit.name, self.unit.position)
+                self.abandon_plan()
+                key = None
+        if self.planned:
+            if not speculative:
+                logger.debug('AI %s %s using decision planned ahead of time', self.unit.name, self.unit.position)
+                self.planned = False
+                if self.group_ping:
+                    self.ai_group_ping(gameStateObj)
+            return True
 
-        # Can do more than one pass through per frame if it doesn't take much time (half of a frame)
-        logger.debug('AI Thinking...')
-        while Engine.get_true_time() - time1 < GC.FRAMERATE//2:
-            logger.debug('Current State: %s', self.state)
-
-            if self.state == 'Init':
-                self.start_time = Engine.get_time()
-                logger.debug('Starting AI with name: %s, position: %s, class: %s, AI1: %s, AI2 %s, Range: %s', 
-                             self.unit.name, self.unit.position, self.unit.klass, self.ai1_state, self.ai2_state, self.range)
-                self.clean_up()
-                if self.ai1_state & PRIMARYAI['Move']:
-                    self.valid_moves = self.get_true_valid_moves(gameStateObj)
-                else:
-                    self.valid_moves = {self.unit.position}                    
-                self.state = 'Escape'
-
-            elif self.state == 'Escape':
-                if self.ai1_state & PRIMARYAI['Enemy Seize']:
-                    success = self.run_simple_ai(self.valid_moves, 'Enemy_Seize', gameStateObj) 
-                if not success and self.ai1_state & PRIMARYAI['Escape']:
-                    success = self.run_simple_ai(self.valid_moves, 'Escape', gameStateObj)
-                if not success and self.ai1_state & PRIMARYAI['Thief Escape']:
-                    success = self.run_simple_ai(self.valid_moves, 'Thief_Escape', gameStateObj)
-                self.state = 'Steal'
-
-            elif self.state == 'Steal':
-                if self.ai1_state & PRIMARYAI['Unlock'] and self.unit.can_unlock():
-                    success = self.run_unlock_ai(self.valid_moves, gameStateObj)
-                elif self.ai1_state & PRIMARYAI['Steal'] and 'steal' in self.unit.status_bundle and len(self.unit.items) < cf.CONSTANTS['max_items']:
-                    success = self.run_steal_ai(gameStateObj, self.valid_moves)
-                self.state = 'Attack_Init'
-
-            elif self.state == 'Attack_Init':
-                if self.ai1_state & PRIMARYAI['Attack']:
-                    self.inner_ai = Primary_AI(self.unit, self.valid_moves, self.team_ignore, self.name_ignore, gameStateObj)
-                    if self.inner_ai.skip_flag:
-                        self.state = 'AttackTiles'
-                    else:
-                        self.state = 'Attack'
-                else:
-                    self.state = 'AttackTiles'
-
-            elif self.state == 'Attack':
-                done, self.target_to_interact_with, self.position_to_move_to, self.item_to_use = self.inner_ai.run(gameStateObj)
-                if done:
-                    if self.target_to_interact_with:
-                        self.ai_group_ping(gameStateObj)
-                        success = True
-                    self.state = 'AttackTiles'
-
-            elif self.state == 'AttackTiles':
-                if self.ai1_state & PRIMARYAI['Attack Tile']:
-                    success = self.run_attack_tile_ai(self.valid_moves, gameStateObj)
-                self.state = 'Loot'
-            
-            elif self.state == 'Loot':
-                if self.ai1_state & PRIMARYAI['Destructible']:
-                    success = self.run_simple_ai(self.valid_moves, 'Destructible', gameStateObj, 'HP')
-                self.state = 'Secondary_Init'
-
-            elif self.state == 'Secondary_Init':
-                if self.ai2_state == 0:
-                    self.available_targets = []
-                elif self.ai2_state == 1:
-                    self.available_targets = [unit for unit in gameStateObj.allunits if unit.position and self.unit.checkIfEnemy(unit) and 
-                                              unit.team not in self.team_ignore and unit.name not in self.name_ignore]
-                elif self.ai2_state == 2:
-                    self.available_targets = [unit for unit in gameStateObj.allunits if unit.position and self.unit.checkIfAlly(unit) and
-                                              unit is not self.unit and unit.team not in self.team_ignore and unit.name not in self.name_ignore]
-                elif self.ai2_state == 3:
-                    self.available_targets = [tile for position, tile in gameStateObj.map.tiles.items()
-                                              if 'Destructible' in gameStateObj.map.tile_info_dict[position] or
-                                              'HP' in gameStateObj.map.tile_info_dict[position]]
-                elif self.ai2_state == 4: 
-                    self.available_targets = [tile for position, tile in gameStateObj.map.tiles.items()
-                                              if 'Locked' in gameStateObj.map.tile_info_dict[position]]
-                elif self.ai2_state == 5:
-                    self.available_targets = [tile for position, tile in gameStateObj.map.tiles.items() 
-                                              if 'Escape' in gameStateObj.map.tile_info_dict[position]]
-                elif self.ai2_state == 6:
-                    self.available_targets = [tile for position, tile in gameStateObj.map.tiles.items()
-                                              if 'Thief_Escape' in gameStateObj.map.tile_info_dict[position]]
-                elif self.ai2_state == 7:
-                    self.available_targets = [unit for unit in gameStateObj.allunits if unit.position and 'Boss' in unit.tags and
-                                              unit.team not in self.team_ignore and unit.name not in self.name_ignore]
-                elif self.ai2_state == 8:
-                    self.available_targets = [tile for position, tile in gameStateObj.map.tiles.items()
-                                              if 'Enemy_Seize' in gameStateObj.map.tile_info_dict[position]]
-                else:
-                    self.available_targets = [unit for unit in gameStateObj.allunits if unit.position and
-                                              (unit.name == self.ai2_state or unit.event_id == self.ai2_state)]
-
-                self.inner_ai = Secondary_AI(self.available_targets, self.unit, self.range, gameStateObj)
-                self.state = 'Secondary'
-
-            elif self.state == 'Secondary':
-                if self.inner_ai.update(gameStateObj):
-                    self.position_to_move_to = self.inner_ai.position_to_move_to
-                    self.inner_ai = None
-                    if self.position_to_move_to:
-                        self.ai_group_ping(gameStateObj)
-                        success = True
-                    self.state = 'Tertiary'
-
-            elif self.state == 'Tertiary':
-                # Filter using range
-                if self.range == 0 or self.range == 1:
-                    self.available_targets = []
-                success = self.run_tertiary_ai(self.valid_moves, self.available_targets, gameStateObj)
-                self.state = 'Done'
-
-            # if cf.OPTIONS['debug']: print('AI Time Taken:', Engine.get_time() - time1)
-
-            if success or self.state == 'Done':
-                # print('AI Time Taken:', Engine.get_time() - self.start_time)
-                self.did_something = success
-                self.state = 'Init'
-                return True
-        if QUICK_MOVE:
-            self.quick_move(orig_pos, gameStateObj, test=True) # Return back to original position so that the in-between frames aren't weird
+        self.did_something = False
+        if not self.planner:
+            self.planner = self.plan(gameStateObj)
+            self.frames_used = 0
+            self.worst_slice = 0
+
+        # The key only needs working out again if this slice changes what the decision depends on
+        plan_region, plan_targets = self.plan_region, self.plan_targets
+        # Can do more than one step per frame if it doesn't take much time
+        budget = cf.CONSTANTS['ai_frame_budget']/1000000.
+        time1 = timeit.default_timer()
+        done = False
+        while timeit.default_timer() - time1 < budget:
+            try:
+                next(self.planner)
+            except StopIteration:
+                done = True
+                break
+        time_slice = int((timeit.default_timer() - time1) * 1000000)
+        self.frames_used += 1
+        self.worst_slice = max(self.worst_slice, time_slice)
+
+        if done:
+            logger.debug('AI %s %s decided in %s frames. Worst slice: %s us. Budget: %s us', self.unit.name, self.unit.position,
+                         self.frames_used, self.worst_slice, cf.CONSTANTS['ai_frame_budget'])
+            self.planner = None
+            self.state = 'Init'
+            self.planned = speculative
+            if speculative:
+                if key is None or self.plan_region is not plan_region or self.plan_targets is not plan_targets:
+                    key = self.get_plan_key(gameStateObj)
+                self.planner_key = key
+            elif self.group_ping:
+                self.ai_group_ping(gameStateObj)
+            return True
+        self.put_back(orig_pos, gameStateObj)
+        if key is None or self.plan_region is not plan_region or self.plan_targets is not plan_targets:
+            key = self.get_plan_key(gameStateObj)
+        self.planner_key = key
         return False
 
+    def put_back(self, orig_pos, gameStateObj):
+        """
+        Undoes what testing moves and items did to the unit, so that nothing sees it mid-test in between frames.
+        The next unit can be planning for several frames while another unit moves or fights
+        """
+        if isinstance(self.inner_ai, Primary_AI):
+            self.inner_ai.put_back_items()
+        if self.unit.position != orig_pos:
+            self.quick_move(orig_pos, gameStateObj, test=True)
+            # Test moves take away the auras of other units without pulling them back in
+            self.unit.pull_auras(gameStateObj)
+
+    def get_plan_region(self, gameStateObj):
+        """
+        Every tile the unit could reach, every tile its movement search looked at from there,
+        and every tile it could target from one of those
+        """
+        if self.ai1_state & PRIMARYAI['Move']:
+            moves = self.unit.getValidMoves(gameStateObj)
+        else:
+            moves = {self.unit.position}
+        return Utility.get_shell(moves, range(max(1, self.unit.getMaxRange()) + 1), gameStateObj.map)
+
+    def get_plan_key(self, gameStateObj):
+        """
+        Everything a decision depends on: this unit, who is standing on its plan region and their HP,
+        the terrain of the plan region, and where its candidate targets are and their HP.
+        A decision is still good as long as the key has not changed, so units moving elsewhere do not affect it
+        """
+        key = [self.unit.position, self.unit.currenthp, tuple(self.unit.items), tuple(sorted(status.id for status in self.unit.status_effects)),
+               self.ai1_state, self.ai2_state, self.range]
+        grid_manager = gameStateObj.grid_manager
+        tiles = gameStateObj.map.tiles
+        for position in self.plan_region:
+            unit = grid_manager.get_unit_node(position)
+            key.append((unit.id, unit.currenthp) if unit else None)
+            key.append(tiles[position])
+        for target in self.plan_targets:
+            key.append((target.position, getattr(target, 'currenthp', None)))
+        return tuple(key)
+
+    def abandon_plan(self):
+        if isinstance(self.inner_ai, Primary_AI):
+            self.inner_ai.put_back_items()
+        if self.planner:
+            self.planner.close()
+        self.planner = None
+        self.planned = False
+        self.state = 'Init'
+        self.clean_up()
+
+    # Now a generator
+    def plan(self, gameStateObj):
+        """
+        Runs each stage of the AI in order, yielding whenever it is safe to stop for the frame.
+        Stops as soon as a stage succeeds. self.did_something holds whether it succeeded
+        """
+        success = False
+        self.state = 'Init'
+        self.start_time = Engine.get_time()
+        logger.debug('Starting AI with name: %s, position: %s, class: %s, AI1: %s, AI2 %s, Range: %s', 
+                     self.unit.name, self.unit.position, self.unit.klass, self.ai1_state, self.ai2_state, self.range)
+        self.clean_up()
+        if self.ai1_state & PRIMARYAI['Move']:
+            # The movement search stops every few tiles
+            for valid_moves in self.unit.searchValidMoves(gameStateObj):
+                yield
+            self.valid_moves = self.remove_occupied(valid_moves, gameStateObj)
+        else:
+            self.valid_moves = {self.unit.position}
+        self.plan_region = self.get_plan_region(gameStateObj)
+        yield
+
+        self.state = 'Escape'
+        if self.ai1_state & PRIMARYAI['Enemy Seize']:
+            success = self.run_simple_ai(self.valid_moves, 'Enemy_Seize', gameStateObj) 
+        if not success and self.ai1_state & PRIMARYAI['Escape']:
+            success = self.run_simple_ai(self.valid_moves, 'Escape', gameStateObj)
+        if not success and self.ai1_state & PRIMARYAI['Thief Escape']:
+            success = self.run_simple_ai(self.valid_moves, 'Thief_Escape', gameStateObj)
+        if success:
+            self.did_something = True
+            return
+        yield
+
+        self.state = 'Steal'
+        if self.ai1_state & PRIMARYAI['Unlock'] and self.unit.can_unlock():
+            success = self.run_unlock_ai(self.valid_moves, gameStateObj)
+        elif self.ai1_state & PRIMARYAI['Steal'] and 'steal' in self.unit.status_bundle and len(self.unit.items) < cf.CONSTANTS['max_items']:
+            success = self.run_steal_ai(gameStateObj, self.valid_moves)
+        if success:
+            self.did_something = True
+            return
+        yield
+
+        self.state = 'Attack'
+        if self.ai1_state & PRIMARYAI['Attack']:
+            self.inner_ai = Primary_AI(self.unit, self.valid_moves, self.team_ignore, self.name_ignore, gameStateObj)
+            yield
+            if not self.inner_ai.skip_flag:
+                # Each step tests one target, or gathers the targets of one valid move
+                done = False
+                while not done:
+                    done, self.target_to_interact_with, self.position_to_move_to, self.item_to_use = self.inner_ai.run(gameStateObj)
+                    yield
+                if self.target_to_interact_with:
+                    self.group_ping = True
+                    self.did_something = True
+                    return
+
+        self.state = 'AttackTiles'
+        if self.ai1_state & PRIMARYAI['Attack Tile']:
+            success = self.run_attack_tile_ai(self.valid_moves, gameStateObj)
+        if success:
+            self.did_something = True
+            return
+
+        self.state = 'Loot'
+        if self.ai1_state & PRIMARYAI['Destructible']:
+            success = self.run_simple_ai(self.valid_moves, 'Destructible', gameStateObj, 'HP')
+        if success:
+            self.did_something = True
+            return
+        yield
+
+        self.state = 'Secondary'
+        if self.ai2_state == 0:
+            self.available_targets = []
+        elif self.ai2_state == 1:
+            self.available_targets = [unit for unit in gameStateObj.allunits if unit.position and self.unit.checkIfEnemy(unit) and 
+                                      unit.team not in self.team_ignore and unit.name not in self.name_ignore]
+        elif self.ai2_state == 2:
+            self.available_targets = [unit for unit in gameStateObj.allunits if unit.position and self.unit.checkIfAlly(unit) and
+                                      unit is not self.unit and unit.team not in self.team_ignore and unit.name not in self.name_ignore]
+        elif self.ai2_state == 3:
+            self.available_targets = [tile for position, tile in gameStateObj.map.tiles.items()
+                                      if 'Destructible' in gameStateObj.map.tile_info_dict[position] or
+                                      'HP' in gameStateObj.map.tile_info_dict[position]]
+        elif self.ai2_state == 4: 
+            self.available_targets = [tile for position, tile in gameStateObj.map.tiles.items()
+                                      if 'Locked' in gameStateObj.map.tile_info_dict[position]]
+        elif self.ai2_state == 5:
+            self.available_targets = [tile for position, tile in gameStateObj.map.tiles.items() 
+                                      if 'Escape' in gameStateObj.map.tile_info_dict[position]]
+        elif self.ai2_state == 6:
+            self.available_targets = [tile for position, tile in gameStateObj.map.tiles.items()
+                                      if 'Thief_Escape' in gameStateObj.map.tile_info_dict[position]]
+        elif self.ai2_state == 7:
+            self.available_targets = [unit for unit in gameStateObj.allunits if unit.position and 'Boss' in unit.tags and
+                                      unit.team not in self.team_ignore and unit.name not in self.name_ignore]
+        elif self.ai2_state == 8:
+            self.available_targets = [tile for position, tile in gameStateObj.map.tiles.items()
+                                      if 'Enemy_Seize' in gameStateObj.map.tile_info_dict[position]]
+        else:
+            self.available_targets = [unit for unit in gameStateObj.allunits if unit.position and
+                                      (unit.name == self.ai2_state or unit.event_id == self.ai2_state)]
+
+        self.plan_targets = list(self.available_targets)
+        self.inner_ai = Secondary_AI(self.available_targets, self.unit, self.range, gameStateObj)
+        yield
+        for _ in self.inner_ai.steps(gameStateObj):
+            yield
+        self.position_to_move_to = self.inner_ai.position_to_move_to
+        self.inner_ai = None
+        if self.position_to_move_to:
+            self.group_ping = True
+            self.did_something = True
+            return
+
+        self.state = 'Tertiary'
+        # Filter using range
+        if self.range == 0 or self.range == 1:
+            self.available_targets = []
+        self.did_something = self.run_tertiary_ai(self.valid_moves, self.available_targets, gameStateObj)
+
     def act(self, gameStateObj):
         logger.debug('AI Act!')
         if not self.unit.hasRunMoveAI:
@@ -470,6 +599,7 @@ class Primary_AI(object):
         self.unit = unit
         self.orig_pos = self.unit.position
         self.orig_item = self.unit.items[0] if self.unit.items else None
+        self.orig_items = list(self.unit.items)
         self.max_tp = 0
         self.skip_flag = False
         closest_enemy_distance = self.unit.distance_to_closest_enemy(gameStateObj)
@@ -512,9 +642,11 @@ class Primary_AI(object):
         self.name_ignore = name_ignore
 
         self.target_index = 0
+        self.valid_targets = []
+        # While set, each step of run gathers the targets of one valid move
+        self.gatherer = None
         if ATTACK_MODE:
-            self.get_all_valid_targets(gameStateObj)
-            self.possible_moves = self.get_possible_moves(gameStateObj)
+            self.gatherer = self.gather_targets(gameStateObj)
         else:
             self.get_valid_targets(gameStateObj)
 
@@ -550,14 +682,23 @@ class Primary_AI(object):
         else:
             self.valid_targets = []
 
-    def get_all_valid_targets(self, gameStateObj):
-        logger.debug(self.items[self.item_index])
-        self.valid_targets = self.unit.getTargets(gameStateObj, self.items[self.item_index], self.valid_moves,
-                                                  team_ignore=self.team_ignore, name_ignore=self.name_ignore)
-        if 0 in self.items[self.item_index].RNG:
-            self.valid_targets += self.valid_moves # Hack to target self in all valid positions
-            self.valid_targets = list(set(self.valid_targets))  # Only uniques
+    def gather_targets(self, gameStateObj):
+        """
+        Finds every target of the current item from any valid move, and the moves to strike the first one from.
+        Yields after each valid move, so a big movement range can be spread over several frames
+        """
+        item = self.items[self.item_index]
+        logger.debug(item)
+        valid_targets = set()
+        for move in self.valid_moves:
+            valid_targets.update(self.unit.getTargets(gameStateObj, item, [move],
+                                                      team_ignore=self.team_ignore, name_ignore=self.name_ignore))
+            yield
+        if 0 in item.RNG:
+            valid_targets.update(self.valid_moves) # Hack to target self in all valid positions
+        self.valid_targets = list(valid_targets)
         logger.debug('Valid Targets: %s', self.valid_targets)
+        self.possible_moves = self.get_possible_moves(gameStateObj)
 
     def get_possible_moves(self, gameStateObj):
         # logger.debug('%s %s %s %s', self.target_index, self.valid_targets, self.item_index, self.items)
@@ -574,6 +715,14 @@ class Primary_AI(object):
         self.unit.position = move
         self.unit.arrive(gameStateObj, serializing=test)
 
+    def put_back_items(self):
+        # Equips the item that was equipped before testing began
+        if self.orig_item and EQUIP:
+            self.unit.equip(self.orig_item)
+            # Equipping moves the item to the top, so put the rest back in order too
+            if set(self.unit.items) == set(self.orig_items):
+                self.unit.items[:] = self.orig_items
+
     def run(self, gameStateObj):
         if ATTACK_MODE:
             return self.run_2(gameStateObj)
@@ -607,6 +756,8 @@ class Primary_AI(object):
             move = self.valid_moves[self.move_index]
             target = self.valid_targets[self.target_index]
             item = self.items[self.item_index]
+            if EQUIP:
+                self.unit.equip(item) # In case it was put back in between frames
             if QUICK_MOVE and self.unit.position != move:
                 self.quick_move(move, gameStateObj, test=True)
             self.determine_utility(move, target, item, gameStateObj)
@@ -617,7 +768,12 @@ class Primary_AI(object):
 
     def run_2(self, gameStateObj):
         # logger.debug('%s %s %s %s %s %s', self.move_index, self.target_index, self.item_index, self.possible_moves, self.valid_targets, self.items)
-        if self.item_index >= len(self.items):
+        if self.gatherer:
+            try:
+                next(self.gatherer)
+            except StopIteration:
+                self.gatherer = None
+        elif self.item_index >= len(self.items):
             if QUICK_MOVE:
                 self.quick_move(self.orig_pos, gameStateObj, test=True)
             if self.orig_item and EQUIP:
@@ -631,8 +787,7 @@ class Primary_AI(object):
                 if EQUIP:
                     self.unit.equip(self.items[self.item_index])
                 logger.debug(self.items[self.item_index].name)
-                self.get_all_valid_targets(gameStateObj)
-                self.possible_moves = self.get_possible_moves(gameStateObj)
+                self.gatherer = self.gather_targets(gameStateObj)
         elif self.move_index >= len(self.possible_moves):
             self.move_index = 0
             self.target_index += 1
@@ -647,6 +802,8 @@ class Primary_AI(object):
                 move = Utility.farthest_away_pos(self.unit, self.possible_moves, gameStateObj.allunits)
             else:   
                 move = self.possible_moves[self.move_index]
+            if EQUIP:
+                self.unit.equip(item) # In case it was put back in between frames
             if QUICK_MOVE and self.unit.position != move:
                 self.quick_move(move, gameStateObj, test=True)
             # logger.debug('%s %s %s %s %s', self.unit.klass, self.unit.position, move, target, item)
@@ -789,9 +946,9 @@ class Primary_AI(object):
                 status_term = 0
                 for target in targets:
                     if any(status_id not in [s.id for s in target.status_effects] for status_id in spell.status):
-                        if (not spell.target_restrict or eval(spell.target_restrict)) and \
-                           (not spell.custom_ai or eval(spell.custom_ai)):
-                            status_term += eval(spell.custom_ai_value) if spell.custom_ai_value else 0.5
+                        if (not spell.target_restrict or Utility.evaluate(spell.target_restrict, globals(), locals())) and \
+                           (not spell.custom_ai or Utility.evaluate(spell.custom_ai, globals(), locals())):
+                            status_term += Utility.evaluate(spell.custom_ai_value, globals(), locals()) if spell.custom_ai_value else 0.5
 
                 logger.debug("Status: %s", status_term)
                 if status_term <= 0:
@@ -810,9 +967,9 @@ class Primary_AI(object):
                 raw_damage = self.unit.compute_damage(target, gameStateObj, spell)
                 my_damage = Utility.clamp(raw_damage/float(target.currenthp), 0, 1)
                 if spell.status and any(s_id not in [s.id for s in target.status_effects] for s_id in spell.status):
-                    if (not spell.target_restrict or eval(spell.target_restrict)) and \
-                       (not spell.custom_ai or eval(spell.custom_ai)):
-                        my_status = eval(spell.custom_ai_value) if spell.custom_ai_value else 1
+                    if (not spell.target_restrict or Utility.evaluate(spell.target_restrict, globals(), locals())) and \
+                       (not spell.custom_ai or Utility.evaluate(spell.custom_ai, globals(), locals())):
+                        my_status = Utility.evaluate(spell.custom_ai_value, globals(), locals()) if spell.custom_ai_value else 1
                     else:
                         my_status = 0
                 else:
@@ -849,7 +1006,7 @@ class Primary_AI(object):
             missing_health = defender.stats['HP'] - defender.currenthp
             if missing_health <= 0:
                 return 0
-            healing_term = Utility.clamp(int(eval(item.heal))/float(missing_health), 0, 1)
+            healing_term = Utility.clamp(int(Utility.evaluate(item.heal, globals(), locals()))/float(missing_health), 0, 1)
             help_term = Utility.clamp(missing_health/float(defender.stats['HP']), 0, 1)
             terms.append((healing_term, 10))
             terms.append((help_term, 20))
@@ -871,8 +1028,8 @@ class Secondary_AI(object):
         self.double_move = self.unit.stats['MOV']*2 + self.unit.getMaxRange()
 
         self.grid = gameStateObj.grid_manager.get_grid(self.unit)
-        self.pathfinder = AStar.AStar(self.unit.position, None, self.grid, gameStateObj.map.width, gameStateObj.map.height,
-                                      self.unit.team, 'pass_through' in self.unit.status_bundle)
+        self.pathfinder = AStar.get_astar(self.unit.position, None, self.grid, gameStateObj.map.width, gameStateObj.map.height,
+                                          self.unit.team, 'pass_through' in self.unit.status_bundle)
 
         # Flags so we don't do things twice
         self.widen_flag = False # Determines if we've already widened our search
@@ -881,6 +1038,9 @@ class Secondary_AI(object):
         self.reset()
 
     def reset(self):
+        self.distance_field = None
+        # Goal of the path search that steps finished ahead of update
+        self.searched_goal = None
         self.max_tp = 0
         self.best_target = None
         self.best_path = None
@@ -942,9 +1102,45 @@ class Secondary_AI(object):
 
         return False
 
-    def getPath(self, goal_pos, gameStateObj, limit=None):
+    def steps(self, gameStateObj):
+        """
+        Generator version of update. Yields after every target,
+        and every few tiles while flooding the distance field or searching for a path
+        """
+        while True:
+            if DISTANCE_FIELD and not self.distance_field and self.available_targets:
+                for _ in self.build_distance_field(gameStateObj):
+                    yield
+            elif not DISTANCE_FIELD and self.available_targets:
+                # Path to the target update looks at next
+                for _ in self.search_path(self.available_targets[-1].position, gameStateObj):
+                    yield
+            if self.update(gameStateObj):
+                return
+            yield
+
+    def build_distance_field(self, gameStateObj):
+        self.distance_field = AStar.DistanceField(self.unit.position, self.grid, gameStateObj.map.width, gameStateObj.map.height,
+                                                  self.unit.team, 'pass_through' in self.unit.status_bundle)
+        return self.distance_field.process_steps(gameStateObj.grid_manager.team_map, ally_block=self.ally_flag)
+
+    def search_path(self, goal_pos, gameStateObj):
+        limit = self.double_move if not self.widen_flag else None
         self.pathfinder.set_goal_pos(goal_pos)
-        self.pathfinder.process(gameStateObj, adj_good_enough=True, ally_block=self.ally_flag, limit=limit)
+        for _ in self.pathfinder.process_steps(gameStateObj, adj_good_enough=True, ally_block=self.ally_flag, limit=limit):
+            yield
+        self.searched_goal = goal_pos
+
+    def getPath(self, goal_pos, gameStateObj, limit=None):
+        if DISTANCE_FIELD:
+            if not self.distance_field:
+                for _ in self.build_distance_field(gameStateObj):
+                    pass
+            return self.distance_field.get_path(goal_pos, adj_good_enough=True, limit=limit)
+        if self.searched_goal != goal_pos:
+            self.pathfinder.set_goal_pos(goal_pos)
+            self.pathfinder.process(gameStateObj, adj_good_enough=True, ally_block=self.ally_flag, limit=limit)
+        self.searched_goal = None
         my_path = self.pathfinder.path
         self.pathfinder.reset()
         return my_path
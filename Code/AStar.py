@@ -1,5 +1,5 @@
 # A* implementation
-import heapq
+import heapq, itertools, array
 
 try:
     import GlobalConstants as GC
@@ -15,21 +15,54 @@ except:
     FAST_PATHFINDING = False
     print('Fast pathfinding not available. Falling back on default Python implementation.')
 
+if FAST_PATHFINDING:
+    # A binary built from an older fast_pathfinding.pyx is missing these,
+    # so use the Python implementation instead of mixing the two
+    try:
+        from fast_pathfinding import FlatGrid, FlatAStar, FlatDjikstra # noqa
+        for method in ('get_team_columns', 'get_cached_moves', 'set_cached_moves', 'get_move_cache_stats'):
+            getattr(fast_pathfinding.Grid_Manager, method)
+        for pathfinder in (fast_pathfinding.AStar, fast_pathfinding.Djikstra, FlatAStar, FlatDjikstra):
+            getattr(pathfinder, 'process_steps')
+    except (ImportError, AttributeError):
+        FAST_PATHFINDING = False
+        print('Fast pathfinding is out of date with fast_pathfinding.pyx. Falling back on default Python implementation. '
+              'Rebuild it with "python fast_pathfinding_setup.py build_ext --inplace" in the Code directory.')
+
+def compare_teams(team1, team2):
+    # Returns True if allies, false if enemies
+    if team1 == team2:
+        return True
+    elif (team1 == 'player' and team2 == 'other') or (team2 == 'player' and team1 == 'other'):
+        return True
+    return False
+
 if FAST_PATHFINDING:
     from fast_pathfinding import Grid_Manager as Grid_Manager
     from fast_pathfinding import AStar as AStar
     from fast_pathfinding import Djikstra as Djikstra
+    from fast_pathfinding import FlatGrid as FlatGrid
+    from fast_pathfinding import FlatAStar as FlatAStar
+    from fast_pathfinding import FlatDjikstra as FlatDjikstra
 else:
-    def compare_teams(team1, team2):
-        # Returns True if allies, false if enemies
-        if team1 == team2:
-            return True
-        elif (team1 == 'player' and team2 == 'other') or (team2 == 'player' and team1 == 'other'):
-            return True
-        return False
+    # Node search states. Only meaningful when the node's generation
+    # matches the generation of the search that is looking at it
+    UNSEEN, OPEN, CLOSED = 0, 1, 2
+    # Every search takes a new generation number, so nodes left over from
+    # an old search are simply treated as unseen instead of being reset
+    generation_counter = itertools.count(1)
+    # Generation of the search that began last. Searches share their grid's nodes and buffers,
+    # so a search paused by process_steps has to start over once another one has begun
+    last_generation = 0
+
+    def new_generation():
+        global last_generation
+        last_generation = next(generation_counter)
+        return last_generation
+
 
     class Node(object):
-        __slots__ = ['reachable', 'cost', 'x', 'y', 'parent', 'g', 'h', 'f']
+        __slots__ = ['reachable', 'cost', 'x', 'y', 'parent', 'g', 'h', 'f', 'generation', 'state']
         
         def __init__(self, x, y, reachable, cost):
             """
@@ -43,14 +76,16 @@ else:
             self.cost = cost
             self.x = x
             self.y = y
-            self.reset()
+            self.reset(0)
 
-        def reset(self):
+        def reset(self, generation):
             # Malleable properties
             self.parent = None
             self.g = 0
             self.h = 0
             self.f = 0
+            self.generation = generation
+            self.state = UNSEEN
 
         def __repr__(self):
             return '%s,%s ; %s %s'%(self.x, self.y, self.reachable, self.cost)
@@ -61,22 +96,81 @@ else:
         def __lt__(self, n):
             return self.cost < n
 
+    class SearchBuffers(object):
+        """
+        Scratch arrays for flat grid searches, shared by every grid of a Grid_Manager.
+        Only the search that began last may use them, and the generation stamps mean they never need clearing
+        """
+        __slots__ = ['g', 'f', 'parent', 'generation', 'state']
+
+        def __init__(self, size):
+            self.g = array.array('i', [0]) * size
+            self.f = array.array('d', [0]) * size
+            self.parent = array.array('i', [-1]) * size
+            self.generation = array.array('l', [0]) * size
+            self.state = array.array('b', [UNSEEN]) * size
+
+    class FlatGrid(object):
+        """
+        Movement costs of one mcost column, stored as contiguous arrays indexed by x * height + y.
+        Team occupancy and search buffers are shared with the other grids of the Grid_Manager
+        """
+        __slots__ = ['gridWidth', 'gridHeight', 'cost', 'reachable', 'team_ids', 'team_names', 'buffers']
+
+        def __init__(self, grid_width, grid_height, team_ids, team_names, buffers):
+            self.gridWidth = grid_width
+            self.gridHeight = grid_height
+            self.cost = array.array('i', [0]) * (grid_width * grid_height)
+            self.reachable = array.array('b', [0]) * (grid_width * grid_height)
+            self.team_ids = team_ids
+            self.team_names = team_names
+            self.buffers = buffers
+
+        def set_cost(self, idx, cost):
+            self.cost[idx] = cost
+            self.reachable[idx] = cost != 99
+
+        def __len__(self):
+            return len(self.cost)
+
+        def __getitem__(self, idx):
+            # For code that still expects a list of Nodes
+            return Node(idx // self.gridHeight, idx % self.gridHeight, self.reachable[idx], self.cost[idx])
+
     class Grid_Manager(object):
-        __slots__ = ['gridHeight', 'gridWidth', 'grids', 'team_map', 'unit_map', 'aura_map', 'known_auras']
+        __slots__ = ['gridHeight', 'gridWidth', 'grids', 'team_map', 'unit_map', 'aura_map', 'known_auras',
+                     'flat', 'team_ids', 'team_names', 'buffers',
+                     'version', 'move_cache', 'move_cache_version', 'move_cache_hits', 'move_cache_misses', 'team_columns']
 
         def __init__(self, tilemap):
             self.gridHeight = tilemap.height
             self.gridWidth = tilemap.width
             self.grids = {}
 
+            self.flat = cf.CONSTANTS['flat_grids']
+            if self.flat:
+                self.team_ids = array.array('b', [0]) * (self.gridWidth * self.gridHeight)
+                self.team_names = [None] # Team id 0 is an empty tile
+                self.buffers = SearchBuffers(self.gridWidth * self.gridHeight)
             for num in range(len(GC.MCOSTDATA['Normal'])):
-                self.grids[num] = self.init_grid(num, tilemap) # For each movement type
+                if self.flat:
+                    self.grids[num] = self.init_flat_grid(num, tilemap)
+                else:
+                    self.grids[num] = self.init_grid(num, tilemap) # For each movement type
 
             self.team_map = self.init_unit_map()
+            self.team_columns = {} # Key: Team, Value: Occupied positions as one bitmask per column
             self.unit_map = self.init_unit_map()
             self.aura_map = self.init_aura_map()
             self.known_auras = {} # Key: Aura, Value: Set of positions
 
+            # Bumped whenever occupancy or terrain changes
+            self.version = 0
+            self.move_cache = {} # Key: (unit id, position, movement left, mcost column, pass through, team), Value: Set of positions
+            self.move_cache_version = 0
+            self.move_cache_hits = 0
+            self.move_cache_misses = 0
+
         def init_unit_map(self):
             cells = []
             for x in range(self.gridWidth):
@@ -94,10 +188,21 @@ else:
         def set_unit_node(self, pos, unit):
             idx = pos[0] * self.gridHeight + pos[1]
             self.unit_map[idx] = unit
+            if self.team_map[idx]:
+                self.team_columns[self.team_map[idx]][pos[0]] &= ~(1 << pos[1])
             if unit:
                 self.team_map[idx] = unit.team
+                self.get_team_columns(unit.team)[pos[0]] |= 1 << pos[1]
             else:
                 self.team_map[idx] = None
+            self.version += 1
+            if self.flat:
+                self.team_ids[idx] = self.get_team_id(unit.team) if unit else 0
+
+        def get_team_id(self, team):
+            if team not in self.team_names:
+                self.team_names.append(team)
+            return self.team_names.index(team)
 
         def get_unit_node(self, pos):
             return self.unit_map[pos[0] * self.gridHeight + pos[1]]
@@ -105,6 +210,11 @@ else:
         def get_team_node(self, pos):
             return self.team_map[pos[0] * self.gridHeight + pos[1]]
 
+        def get_team_columns(self, team):
+            if team not in self.team_columns:
+                self.team_columns[team] = [0] * self.gridWidth
+            return self.team_columns[team]
+
         # === For Auras ===
         def reset_aura(self, aura):
             self.known_auras[aura] = set()
@@ -123,13 +233,35 @@ else:
             return self.aura_map[pos[0] * self.gridHeight + pos[1]]
 
         # === For Movement ===
-        def get_grid(self, unit):
+        def get_mcost_column(self, unit):
             if 'flying' in unit.status_bundle:
-                return self.grids[cf.CONSTANTS['flying_mcost_column']]
+                return cf.CONSTANTS['flying_mcost_column']
             elif 'fleet_of_foot' in unit.status_bundle:
-                return self.grids[cf.CONSTANTS['fleet_mcost_column']]
+                return cf.CONSTANTS['fleet_mcost_column']
             else:
-                return self.grids[unit.movement_group]
+                return unit.movement_group
+
+        def get_grid(self, unit):
+            return self.grids[self.get_mcost_column(unit)]
+
+        # === Movement Range Cache ===
+        def get_cached_moves(self, key):
+            if self.move_cache_version != self.version:
+                self.move_cache.clear()
+                self.move_cache_version = self.version
+            valid_moves = self.move_cache.get(key)
+            if valid_moves is None:
+                self.move_cache_misses += 1
+            else:
+                self.move_cache_hits += 1
+            return valid_moves
+
+        def set_cached_moves(self, key, valid_moves):
+            if self.move_cache_version == self.version:
+                self.move_cache[key] = frozenset(valid_moves)
+
+        def get_move_cache_stats(self):
+            return {'hits': self.move_cache_hits, 'misses': self.move_cache_misses, 'size': len(self.move_cache)}
 
         def init_grid(self, mode, tilemap):
             cells = []
@@ -140,12 +272,23 @@ else:
                     cells.append(Node(x, y, tile_cost != 99, tile_cost))
             return cells
 
+        def init_flat_grid(self, mode, tilemap):
+            grid = FlatGrid(self.gridWidth, self.gridHeight, self.team_ids, self.team_names, self.buffers)
+            for x in range(self.gridWidth):
+                for y in range(self.gridHeight):
+                    grid.set_cost(x * self.gridHeight + y, tilemap.tiles[(x, y)].get_mcost(mode))
+            return grid
+
         def update_tile(self, tile):
+            self.version += 1
             x = tile.position[0]
             y = tile.position[1]
             for num in range(len(GC.MCOSTDATA['Normal'])):
                 cost = tile.get_mcost(num)
-                self.grids[num][x * self.gridHeight + y] = Node(x, y, cost != 99, cost)
+                if self.flat:
+                    self.grids[num].set_cost(x * self.gridHeight + y, cost)
+                else:
+                    self.grids[num][x * self.gridHeight + y] = Node(x, y, cost != 99, cost)
 
         def draw_grid(self, grid_name):
             for y in range(self.gridHeight):
@@ -171,16 +314,11 @@ else:
             self.pass_through = pass_through
             self.reset()
 
-        def reset_grid(self):
-            for cell in self.cells:
-                cell.reset()
-
         def reset(self):
+            # No need to touch the grid, the next search just moves on to a new generation
             self.open = []
-            heapq.heapify(self.open)
-            self.closed = set()
+            self.generation = 0
             self.path = []
-            self.reset_grid()
 
         def set_goal_pos(self, goal_pos):
             self.goalposition = goal_pos
@@ -236,13 +374,47 @@ else:
             return path
             
         def process(self, gameStateObj, adj_good_enough=False, ally_block=False, limit=None):
+            self.start_search()
+            self.search(gameStateObj, adj_good_enough, ally_block, limit)
+
+        def process_steps(self, gameStateObj, adj_good_enough=False, ally_block=False, limit=None, step=64):
+            """
+            Generator version of process that yields every step tiles closed,
+            so the caller can spread the search over several frames.
+            If another search begins in between, this one starts over with bigger steps. Afterwards self.path has the result
+            """
+            self.start_search()
+            while not self.search(gameStateObj, adj_good_enough, ally_block, limit, step):
+                yield
+                if self.generation != last_generation:
+                    # Take bigger steps each time, so it can't be kept from ever finishing
+                    step *= 2
+                    self.start_search()
+
+        def start_search(self):
+            self.open = []
+            self.path = []
+            self.generation = new_generation()
+            self.start.reset(self.generation)
+            self.start.state = OPEN
             # add starting cell to open heap queue
             heapq.heappush(self.open, (self.start.f, self.start))
+
+        def search(self, gameStateObj, adj_good_enough=False, ally_block=False, limit=None, step=0):
+            """
+            Continues the search until it is done, or until step more tiles have been closed.
+            Returns whether it is done
+            """
+            generation = self.generation
+            closed = 0
             while self.open:
                 # pop cell from heap queue
                 f, cell = heapq.heappop(self.open)
-                # add cell to closed set so we don't process it twice
-                self.closed.add(cell)
+                # Lazy deletion -- skip entries left behind by a decrease-key
+                if cell.state == CLOSED or f != cell.f:
+                    continue
+                # close cell so we don't process it twice
+                cell.state = CLOSED
                 # If this cell is past the limit, just return None. No valid path
                 # Uses f, not g, because g will cut off if first greedy path fails
                 # f only cuts off if all cells are bad
@@ -255,10 +427,14 @@ else:
                 # get adjacent cells for cell
                 adj_cells = self.get_adjacent_cells(cell)
                 for c in adj_cells:
-                    if c.reachable and c not in self.closed:
+                    if c.reachable:
+                        if c.generation != generation:
+                            c.reset(generation)
+                        elif c.state == CLOSED:
+                            continue
                         unit_team = gameStateObj.grid_manager.get_team_node((c.x, c.y))
                         if not unit_team or (not ally_block and compare_teams(self.unit_team, unit_team)) or self.pass_through:
-                            if (c.f, c) in self.open:
+                            if c.state == OPEN:
                                 # if adj cell in open list, check if current path is
                                 # better than the one previously found for this adj
                                 # cell.
@@ -268,20 +444,25 @@ else:
                             else:
                                 self.update_cell(c, cell)
                                 # Add adj cell to open list
+                                c.state = OPEN
                                 heapq.heappush(self.open, (c.f, c))
+                closed += 1
+                if closed == step:
+                    return False
+            self.open = []
+            return True
 
     # THIS ACTUALLY WORKS!!!
     class Djikstra(object):
-        __slots__ = ['open', 'closed', 'cells', 'gridHeight', 'gridWidth', 'startposition', 'start', 'unit_team', 'pass_through']
+        __slots__ = ['open', 'closed', 'generation', 'cells', 'gridHeight', 'gridWidth', 'startposition', 'start', 'unit_team', 'pass_through']
 
         def __init__(self, startposition, grid, grid_width, grid_height, unit_team, pass_through):
             self.open = []
-            heapq.heapify(self.open)
-            self.closed = set()
+            self.closed = []
+            self.generation = 0
             self.cells = grid # Must keep order.
             self.gridHeight = grid_height
             self.gridWidth = grid_width
-            self.reset_grid()
             self.startposition = startposition
             self.start = self.get_cell(self.startposition[0], self.startposition[1])
             self.unit_team = unit_team
@@ -290,10 +471,6 @@ else:
         def get_cell(self, x, y):
             return self.cells[x * self.gridHeight + y]
 
-        def reset_grid(self):
-            for cell in self.cells:
-                cell.reset()
-
         def get_adjacent_cells(self, cell):
             """
             Returns adjacent cells to a cell. Clockwise starting from the one on
@@ -315,22 +492,62 @@ else:
             adj.parent = cell
             
         def process(self, team_map, movement_left):
+            self.start_search()
+            self.search(team_map, movement_left)
+            return self.get_valid_moves()
+
+        def process_steps(self, team_map, movement_left, step=64):
+            """
+            Generator version of process that yields every step tiles closed,
+            so the caller can spread the search over several frames.
+            If another search begins in between, this one starts over with bigger steps. Afterwards get_valid_moves has the result
+            """
+            self.start_search()
+            while not self.search(team_map, movement_left, step):
+                yield
+                if self.generation != last_generation:
+                    # Take bigger steps each time, so it can't be kept from ever finishing
+                    step *= 2
+                    self.start_search()
+
+        def start_search(self):
+            self.open = []
+            self.closed = []
+            self.generation = new_generation()
+            self.start.reset(self.generation)
+            self.start.state = OPEN
             # add starting cell to open heap queue
             heapq.heappush(self.open, (self.start.g, self.start))
+
+        def search(self, team_map, movement_left, step=0):
+            """
+            Continues the search until it is done, or until step more tiles have been closed.
+            Returns whether it is done
+            """
+            generation = self.generation
+            closed = 0
             while self.open:
                 # pop cell from heap queue
                 g, cell = heapq.heappop(self.open)
                 if g > movement_left:
-                    return {(node.x, node.y) for node in self.closed}
-                # add cell to closed set so we don't process it twice
-                self.closed.add(cell)
+                    break
+                # Lazy deletion -- skip entries left behind by a decrease-key
+                if cell.state == CLOSED or g != cell.g:
+                    continue
+                # close cell so we don't process it twice
+                cell.state = CLOSED
+                self.closed.append(cell)
                 # get adjacent cells for cell
                 adj_cells = self.get_adjacent_cells(cell)
                 for c in adj_cells:
-                    if c.reachable and c not in self.closed:
+                    if c.reachable:
+                        if c.generation != generation:
+                            c.reset(generation)
+                        elif c.state == CLOSED:
+                            continue
                         unit_team = team_map[c.x * self.gridHeight + c.y]
                         if not unit_team or compare_teams(self.unit_team, unit_team) or self.pass_through:
-                            if (c.g, c) in self.open:
+                            if c.state == OPEN:
                                 # if adj cell in open list, check if current path is
                                 # better than the one previously found for this adj
                                 # cell.
@@ -340,6 +557,392 @@ else:
                             else:
                                 self.update_cell(c, cell)
                                 # Add adj cell to open list
+                                c.state = OPEN
                                 heapq.heappush(self.open, (c.g, c))
-            # Sometimes gets here if unit is enclosed.
+                closed += 1
+                if closed == step:
+                    return False
+            # Sometimes runs out of cells if unit is enclosed.
+            self.open = []
+            return True
+
+        def get_valid_moves(self):
             return {(node.x, node.y) for node in self.closed}
+
+    class FlatAStar(object):
+        """
+        AStar over a FlatGrid. Works on tile indices instead of Nodes
+        """
+        def __init__(self, startposition, goalposition, grid, grid_width, grid_height, unit_team, pass_through):
+            self.grid = grid
+            self.gridHeight = grid_height
+            self.gridWidth = grid_width
+            self.startposition = startposition
+            self.start = self.startposition[0] * self.gridHeight + self.startposition[1]
+            self.goalposition = None
+            self.end = None
+            self.adj_end = None
+            if goalposition:
+                self.set_goal_pos(goalposition)
+            self.unit_team = unit_team
+            self.pass_through = pass_through
+            self.reset()
+
+        def reset(self):
+            self.open = []
+            self.generation = 0
+            self.path = []
+
+        def set_goal_pos(self, goal_pos):
+            self.goalposition = goal_pos
+            self.end = self.goalposition[0] * self.gridHeight + self.goalposition[1]
+            self.adj_end = self.get_adjacent_cells(self.end)
+
+        def get_heuristic(self, idx):
+            """Compute the heuristic for this cell, h
+            h is approximate distance between this cell and the ending cell"""
+            # Get main heuristic
+            dx1 = idx // self.gridHeight - self.goalposition[0]
+            dy1 = idx % self.gridHeight - self.goalposition[1]
+            h = abs(dx1) + abs(dy1)
+            # Are we going in direction of goal? -
+            # Slight nudge in direction that lies along path from start to end
+            dx2 = self.startposition[0] - self.goalposition[0]
+            dy2 = self.startposition[1] - self.goalposition[1]
+            cross = abs(dx1 * dy2 - dx2 * dy1)
+            return h + cross*.001
+
+        def get_adjacent_cells(self, idx):
+            """
+            Returns adjacent cells to a cell. Clockwise starting from the one on
+            the right"""
+            x, y = divmod(idx, self.gridHeight)
+            cells = []
+            if x < self.gridWidth-1:
+                cells.append(idx + self.gridHeight)
+            if y > 0:
+                cells.append(idx - 1)
+            if x > 0:
+                cells.append(idx - self.gridHeight)
+            if y < self.gridHeight-1:
+                cells.append(idx + 1)
+            return cells
+
+        def return_path(self, idx):
+            parent = self.grid.buffers.parent
+            path = []
+            while idx >= 0:
+                path.append(divmod(idx, self.gridHeight))
+                idx = parent[idx]
+            return path
+
+        def process(self, gameStateObj, adj_good_enough=False, ally_block=False, limit=None):
+            self.start_search()
+            self.search(gameStateObj, adj_good_enough, ally_block, limit)
+
+        def process_steps(self, gameStateObj, adj_good_enough=False, ally_block=False, limit=None, step=64):
+            """
+            Generator version of process that yields every step tiles closed,
+            so the caller can spread the search over several frames.
+            If another search begins in between, this one starts over with bigger steps. Afterwards self.path has the result
+            """
+            self.start_search()
+            while not self.search(gameStateObj, adj_good_enough, ally_block, limit, step):
+                yield
+                if self.generation != last_generation:
+                    # Take bigger steps each time, so it can't be kept from ever finishing
+                    step *= 2
+                    self.start_search()
+
+        def start_search(self):
+            buffers = self.grid.buffers
+            self.open = []
+            self.path = []
+            self.generation = new_generation()
+            start = self.start
+            buffers.g[start], buffers.f[start], buffers.parent[start] = 0, 0, -1
+            buffers.generation[start], buffers.state[start] = self.generation, OPEN
+            # add starting cell to open heap queue
+            heapq.heappush(self.open, (0, start))
+
+        def search(self, gameStateObj, adj_good_enough=False, ally_block=False, limit=None, step=0):
+            """
+            Continues the search until it is done, or until step more tiles have been closed.
+            Returns whether it is done
+            """
+            grid = self.grid
+            cost, reachable, team_ids = grid.cost, grid.reachable, grid.team_ids
+            buffers = grid.buffers
+            g, f, parent, stamp, state = buffers.g, buffers.f, buffers.parent, buffers.generation, buffers.state
+            allies = [team is not None and compare_teams(self.unit_team, team) for team in grid.team_names]
+            generation = self.generation
+            closed = 0
+            while self.open:
+                # pop cell from heap queue
+                cell_f, cell = heapq.heappop(self.open)
+                # Lazy deletion -- skip entries left behind by a decrease-key
+                if state[cell] == CLOSED or cell_f != f[cell]:
+                    continue
+                # close cell so we don't process it twice
+                state[cell] = CLOSED
+                # If this cell is past the limit, just return None. No valid path
+                if limit and cell_f > limit:
+                    break
+                # if ending cell, display found path
+                if cell == self.end or (adj_good_enough and cell in self.adj_end):
+                    self.path = self.return_path(cell)
+                    break
+                for c in self.get_adjacent_cells(cell):
+                    if reachable[c]:
+                        if stamp[c] != generation:
+                            stamp[c] = generation
+                            state[c] = UNSEEN
+                        elif state[c] == CLOSED:
+                            continue
+                        team_id = team_ids[c]
+                        if not team_id or (not ally_block and allies[team_id]) or self.pass_through:
+                            new_g = g[cell] + cost[c]
+                            if state[c] != OPEN or g[c] > new_g:
+                                g[c] = new_g
+                                f[c] = new_g + self.get_heuristic(c)
+                                parent[c] = cell
+                                state[c] = OPEN
+                                heapq.heappush(self.open, (f[c], c))
+                closed += 1
+                if closed == step:
+                    return False
+            self.open = []
+            return True
+
+    class FlatDjikstra(object):
+        """
+        Djikstra over a FlatGrid. Works on tile indices instead of Nodes
+        """
+        __slots__ = ['open', 'closed', 'generation', 'grid', 'gridHeight', 'gridWidth', 'startposition', 'start', 'unit_team', 'pass_through']
+
+        def __init__(self, startposition, grid, grid_width, grid_height, unit_team, pass_through):
+            self.open = []
+            self.closed = []
+            self.generation = 0
+            self.grid = grid
+            self.gridHeight = grid_height
+            self.gridWidth = grid_width
+            self.startposition = startposition
+            self.start = self.startposition[0] * self.gridHeight + self.startposition[1]
+            self.unit_team = unit_team
+            self.pass_through = pass_through
+
+        def get_adjacent_cells(self, idx):
+            """
+            Returns adjacent cells to a cell. Clockwise starting from the one on
+            the right"""
+            x, y = divmod(idx, self.gridHeight)
+            cells = []
+            if x < self.gridWidth-1:
+                cells.append(idx + self.gridHeight)
+            if y > 0:
+                cells.append(idx - 1)
+            if x > 0:
+                cells.append(idx - self.gridHeight)
+            if y < self.gridHeight-1:
+                cells.append(idx + 1)
+            return cells
+
+        def process(self, team_map, movement_left):
+            self.start_search()
+            self.search(team_map, movement_left)
+            return self.get_valid_moves()
+
+        def process_steps(self, team_map, movement_left, step=64):
+            """
+            Generator version of process that yields every step tiles closed,
+            so the caller can spread the search over several frames.
+            If another search begins in between, this one starts over with bigger steps. Afterwards get_valid_moves has the result
+            """
+            self.start_search()
+            while not self.search(team_map, movement_left, step):
+                yield
+                if self.generation != last_generation:
+                    # Take bigger steps each time, so it can't be kept from ever finishing
+                    step *= 2
+                    self.start_search()
+
+        def start_search(self):
+            buffers = self.grid.buffers
+            self.open = []
+            self.closed = []
+            self.generation = new_generation()
+            start = self.start
+            buffers.g[start], buffers.parent[start], buffers.generation[start], buffers.state[start] = 0, -1, self.generation, OPEN
+            # add starting cell to open heap queue
+            heapq.heappush(self.open, (0, start))
+
+        def search(self, team_map, movement_left, step=0):
+            """
+            Continues the search until it is done, or until step more tiles have been closed.
+            Returns whether it is done
+            """
+            # team_map is unused. The FlatGrid carries its own team occupancy
+            grid = self.grid
+            cost, reachable, team_ids = grid.cost, grid.reachable, grid.team_ids
+            buffers = grid.buffers
+            g, parent, stamp, state = buffers.g, buffers.parent, buffers.generation, buffers.state
+            allies = [team is not None and compare_teams(self.unit_team, team) for team in grid.team_names]
+            generation = self.generation
+            closed = 0
+            while self.open:
+                # pop cell from heap queue
+                cell_g, cell = heapq.heappop(self.open)
+                if cell_g > movement_left:
+                    break
+                # Lazy deletion -- skip entries left behind by a decrease-key
+                if state[cell] == CLOSED or cell_g != g[cell]:
+                    continue
+                # close cell so we don't process it twice
+                state[cell] = CLOSED
+                self.closed.append(cell)
+                for c in self.get_adjacent_cells(cell):
+                    if reachable[c]:
+                        if stamp[c] != generation:
+                            stamp[c] = generation
+                            state[c] = UNSEEN
+                        elif state[c] == CLOSED:
+                            continue
+                        team_id = team_ids[c]
+                        if not team_id or allies[team_id] or self.pass_through:
+                            new_g = cell_g + cost[c]
+                            if state[c] != OPEN or g[c] > new_g:
+                                g[c] = new_g
+                                parent[c] = cell
+                                state[c] = OPEN
+                                heapq.heappush(self.open, (new_g, c))
+                closed += 1
+                if closed == step:
+                    return False
+            # Sometimes runs out of cells if unit is enclosed.
+            self.open = []
+            return True
+
+        def get_valid_moves(self):
+            return {divmod(idx, self.gridHeight) for idx in self.closed}
+
+class DistanceField(object):
+    """
+    One Djikstra flood from a start position over the whole map, with the same
+    blocking rules as AStar. Afterwards the distance and path to any tile is a lookup,
+    so many targets can be compared without running a search for each one
+    """
+    def __init__(self, startposition, grid, grid_width, grid_height, unit_team, pass_through):
+        self.gridHeight = grid_height
+        self.gridWidth = grid_width
+        self.startposition = startposition
+        self.start = self.startposition[0] * self.gridHeight + self.startposition[1]
+        if isinstance(grid, FlatGrid):
+            self.cost, self.reachable = grid.cost, grid.reachable
+        else:
+            self.cost = [cell.cost for cell in grid]
+            self.reachable = [cell.reachable for cell in grid]
+        self.unit_team = unit_team
+        self.pass_through = pass_through
+        self.g = {}
+        self.parent = {}
+
+    def get_adjacent_cells(self, idx):
+        """
+        Returns adjacent cells to a cell. Clockwise starting from the one on
+        the right"""
+        x, y = divmod(idx, self.gridHeight)
+        cells = []
+        if x < self.gridWidth-1:
+            cells.append(idx + self.gridHeight)
+        if y > 0:
+            cells.append(idx - 1)
+        if x > 0:
+            cells.append(idx - self.gridHeight)
+        if y < self.gridHeight-1:
+            cells.append(idx + 1)
+        return cells
+
+    def process(self, team_map, ally_block=False):
+        for _ in self.process_steps(team_map, ally_block):
+            pass
+
+    def process_steps(self, team_map, ally_block=False, step=64):
+        """
+        Generator that floods the field, yielding every step tiles closed
+        so the caller can spread the work over several frames
+        """
+        g, parent, cost, reachable = self.g, self.parent, self.cost, self.reachable
+        closed = set()
+        g[self.start] = 0
+        parent[self.start] = None
+        open_list = [(0, self.start)]
+        while open_list:
+            cell_g, cell = heapq.heappop(open_list)
+            # Lazy deletion -- skip entries left behind by a decrease-key
+            if cell in closed or cell_g != g[cell]:
+                continue
+            closed.add(cell)
+            if not len(closed) % step:
+                yield
+            for c in self.get_adjacent_cells(cell):
+                if reachable[c] and c not in closed:
+                    unit_team = team_map[c]
+                    if not unit_team or (not ally_block and compare_teams(self.unit_team, unit_team)) or self.pass_through:
+                        new_g = cell_g + cost[c]
+                        if c not in g or g[c] > new_g:
+                            g[c] = new_g
+                            parent[c] = cell
+                            heapq.heappush(open_list, (new_g, c))
+
+    def get_heuristic(self, idx, goal_pos):
+        # Same heuristic as AStar
+        x, y = divmod(idx, self.gridHeight)
+        dx1 = x - goal_pos[0]
+        dy1 = y - goal_pos[1]
+        dx2 = self.startposition[0] - goal_pos[0]
+        dy2 = self.startposition[1] - goal_pos[1]
+        return abs(dx1) + abs(dy1) + abs(dx1 * dy2 - dx2 * dy1)*.001
+
+    def get_distance(self, pos):
+        """Movement cost from the start to pos, or None if pos could not be reached"""
+        return self.g.get(pos[0] * self.gridHeight + pos[1])
+
+    def get_path(self, goal_pos, adj_good_enough=False, limit=None):
+        """
+        Returns the path in the same format as AStar.path (goal first, start last),
+        or an empty list if there is no path
+        """
+        goal = goal_pos[0] * self.gridHeight + goal_pos[1]
+        # AStar can only reach the goal through one of its neighbours,
+        # so when those are good enough it always stops on one of them
+        if adj_good_enough and goal != self.start:
+            candidates = self.get_adjacent_cells(goal)
+        else:
+            candidates = [goal]
+        best, best_f = None, None
+        for cell in candidates:
+            if cell in self.g:
+                # Pick the one AStar would have closed first
+                f = self.g[cell] + self.get_heuristic(cell, goal_pos)
+                if best is None or f < best_f:
+                    best, best_f = cell, f
+        if best is None or (limit and best_f > limit):
+            return []
+        path = []
+        while best is not None:
+            path.append(divmod(best, self.gridHeight))
+            best = self.parent[best]
+        return path
+
+def get_astar(startposition, goalposition, grid, grid_width, grid_height, unit_team, pass_through):
+    """Returns the AStar pathfinder that matches the kind of grid"""
+    if isinstance(grid, FlatGrid):
+        return FlatAStar(startposition, goalposition, grid, grid_width, grid_height, unit_team, pass_through)
+    return AStar(startposition, goalposition, grid, grid_width, grid_height, unit_team, pass_through)
+
+def get_djikstra(startposition, grid, grid_width, grid_height, unit_team, pass_through):
+    """Returns the Djikstra pathfinder that matches the kind of grid"""
+    if isinstance(grid, FlatGrid):
+        return FlatDjikstra(startposition, grid, grid_width, grid_height, unit_team, pass_through)
+    return Djikstra(startposition, grid, grid_width, grid_height, unit_team, pass_through)
@@ -1,14 +1,25 @@
-import os
+import os, timeit
 
 try:
-    import Engine
+    import Engine, Utility
+    import configuration as cf
 except ImportError:
-    from . import Engine
+    from . import Engine, Utility
+    from . import configuration as cf
+
+import logging
+logger = logging.getLogger(__name__)
 
 class BattleAnimationManager(object):
+    """
+    Only finds where each battle animation is at startup.
+    A class's sheets, or an effect's sheets, are decoded the first time they are needed. The least recently used
+    are dropped again once they take up more than cf.CONSTANTS['anim_memory_budget'] megabytes
+    """
     def __init__(self, COLORKEY, home='./'):
-        self.generated_klasses = set()
+        self.colorkey = COLORKEY
         # Class Animations
+        # Key: klass, Value: {weapon: {'images': {palette name: path}, 'script': path, 'index': path}}
         self.directory = {}
         for root, dirs, files in os.walk(home + 'Data/Animations/'):
             for name in files:
@@ -24,15 +35,13 @@ class BattleAnimationManager(object):
                     self.directory[klass][weapon]['images'] = {}
                 full_name = os.path.join(root, name)
                 if name.endswith('.png'):
-                    image = Engine.image_load(full_name, convert=True)
-                    Engine.set_colorkey(image, COLORKEY, rleaccel=True)
-                    self.directory[klass][weapon]['images'][desc[:-4]] = image
+                    self.directory[klass][weapon]['images'][desc[:-4]] = full_name
                 elif name.endswith('Script.txt'):
                     self.directory[klass][weapon]['script'] = full_name
                 elif name.endswith('Index.txt'):
                     self.directory[klass][weapon]['index'] = full_name
         # Custom Spell Animations
-        self.generated_effects = set()
+        # Key: effect, Value: {'images': {palette name: path}, 'script': path, 'index': path}
         self.effects = {}
         for root, dirs, files in os.walk(home + 'Data/Effects/'):
             for name in files:
@@ -46,48 +55,141 @@ class BattleAnimationManager(object):
                     self.effects[effect]['images'] = {}
                 full_name = os.path.join(root, name)
                 if name.endswith('.png'):
-                    image = Engine.image_load(full_name, convert_alpha=True)
-                    self.effects[effect]['images'][desc[:-4]] = image
+                    self.effects[effect]['images'][desc[:-4]] = full_name
                 elif name.endswith('Script.txt'):
                     self.effects[effect]['script'] = full_name
                 elif name.endswith('Index.txt'):
                     self.effects[effect]['index'] = full_name
 
+        # Decoded animations
+        # Key: ('klass', klass) or ('effect', effect), Value: animations
+        # Battles in progress keep their own references, so dropping animations here never breaks them
+        self.loaded = Utility.LRUCache(cf.CONSTANTS['anim_memory_budget']*1024*1024, self.discard_variants)
+        self.scripts = {} # Parsed scripts by path. These are small, so they are kept
+        self.failed = set() # (klass, weapon) with images but no index, so they are not looked for again
+        self.num_loads = 0
+        self.load_time = 0.
+
+    def add_loaded(self, key, animations, memory, time1):
+        self.num_loads += 1
+        self.load_time += timeit.default_timer() - time1
+        logger.debug('Loaded battle animation %s %s: %s bytes', key[0], key[1], memory)
+        self.loaded.put(key, animations, memory)
+
+    def discard_variants(self, key, animations):
+        logger.debug('Dropped battle animation %s %s', key[0], key[1])
+        # Flipped, flashed and faded frames are keyed on the frame they came from, so drop them too
+        try:
+            import BattleAnimation
+        except ImportError:
+            from . import BattleAnimation
+        if key[0] == 'klass':
+            images = [animation['images'] for animation in animations.values()]
+        else:
+            images = [animations['images']]
+        frames = {frame[0] for palettes in images for frame_directory in palettes.values() for frame in frame_directory.values()}
+        BattleAnimation.VARIANTS.discard_frames(frames)
+
+    def get_script(self, script):
+        if script not in self.scripts:
+            self.scripts[script] = self.parse_script(script)
+        return self.scripts[script]
+
+    def get_missing_frames(self, script, images):
+        # Returns {palette name: [frame names the script uses that the palette does not have]}
+        try:
+            import BattleAnimation
+        except ImportError:
+            from . import BattleAnimation
+        missing = {}
+        if script:
+            for name, frame_directory in images.items():
+                missing_frames = BattleAnimation.validate_script(script, frame_directory)
+                if missing_frames:
+                    missing[name] = missing_frames
+        return missing
+
+    def report_missing_frames(self, name, script, images):
+        for palette_name, missing_frames in sorted(self.get_missing_frames(script, images).items()):
+            print('Warning! %s %s is missing frames: %s' % (name, palette_name, ', '.join(missing_frames)))
+
+    def validate_all(self):
+        # Loads every animation and returns {name: {palette name: missing frame names}} for the ones with problems
+        problems = {}
+        for klass in sorted(self.directory):
+            klass_animations = self.generate(klass)
+            if klass_animations is None:
+                problems[klass] = 'Missing index'
+                continue
+            for weapon, animation in klass_animations.items():
+                missing = self.get_missing_frames(animation['script'], animation['images'])
+                if missing:
+                    problems[klass + '-' + weapon] = missing
+        for effect in sorted(self.effects):
+            animation = self.generate_effect(effect)
+            missing = self.get_missing_frames(animation['script'], animation['images'])
+            if missing:
+                problems[effect] = missing
+        return problems
+
+    def get_stats(self):
+        stats = self.loaded.get_stats()
+        stats.update({'loads': self.num_loads, 'load_time': self.load_time})
+        return stats
+
     def generate(self, klass):
-        if klass in self.directory and klass not in self.generated_klasses:
-            klass_directory = self.directory[klass]
-            for weapon in klass_directory:
+        # Returns {weapon: {'images': {palette name: frame directory}, 'script': poses}}, or None if an index is missing
+        if any((klass, weapon) in self.failed for weapon in self.directory[klass]):
+            return None
+        key = ('klass', klass)
+        klass_animations = self.loaded.get(key)
+        if klass_animations is None:
+            missing = [weapon for weapon, paths in self.directory[klass].items() if paths['images'] and 'index' not in paths]
+            if missing:
+                for weapon in missing:
+                    self.failed.add((klass, weapon))
+                    logger.error("Couldn't find index for %s-%s", klass, weapon)
+                return None
+            time1 = timeit.default_timer()
+            klass_animations = {}
+            memory = 0
+            for weapon, paths in self.directory[klass].items():
                 frame_directory = {}
-                for name, anim in klass_directory[weapon]['images'].items():
-                    if 'index' not in klass_directory[weapon]:
-                        return False
-                    frame_directory[name] = self.format_index(klass_directory[weapon]['index'], anim)
-                # print(frame_directory)
-                klass_directory[weapon]['images'] = frame_directory
-                if 'script' in klass_directory[weapon]:
-                    klass_directory[weapon]['script'] = self.parse_script(klass_directory[weapon]['script'])
+                for name, image_path in paths['images'].items():
+                    anim = Engine.image_load(image_path, convert=True)
+                    Engine.set_colorkey(anim, self.colorkey, rleaccel=True)
+                    memory += Utility.get_image_memory(anim)
+                    frame_directory[name] = self.format_index(paths['index'], anim)
+                if 'script' in paths:
+                    script = self.get_script(paths['script'])
                 else: # Search default klass
-                    default_script = self.directory[klass[:-1] + '0'][weapon]['script']
-                    if isinstance(default_script, dict):  # Already parsed
-                        klass_directory[weapon]['script'] = default_script
-                    else:
-                        klass_directory[weapon]['script'] = self.parse_script(default_script)
-            
-            self.generated_klasses.add(klass)  # Don't generate twice
-        return True
+                    script = self.get_script(self.directory[klass[:-1] + '0'][weapon]['script'])
+                self.report_missing_frames(klass + '-' + weapon, script, frame_directory)
+                klass_animations[weapon] = {'images': frame_directory, 'script': script}
+            self.add_loaded(key, klass_animations, memory, time1)
+        return klass_animations
 
     def generate_effect(self, effect):
-        if effect in self.effects and effect not in self.generated_effects:
-            self.generated_effects.add(effect)
-            e_dict = self.effects[effect]
+        # Returns {'images': {palette name: frame directory}, 'script': poses}
+        key = ('effect', effect)
+        effect_animations = self.loaded.get(key)
+        if effect_animations is None:
+            time1 = timeit.default_timer()
+            paths = self.effects[effect]
             frame_directory = {}
-            for name, anim in e_dict['images'].items():
-                if 'index' not in e_dict:
-                    print("Error! Couldn't find index for %s!" % effect)
-                    return False
-                frame_directory[name] = self.format_index(e_dict['index'], anim)
-            e_dict['images'] = frame_directory
-            e_dict['script'] = self.parse_script(e_dict['script'])
+            memory = 0
+            if paths['images'] and 'index' not in paths:
+                print("Error! Couldn't find index for %s!" % effect)
+            else:
+                for name, image_path in paths['images'].items():
+                    anim = Engine.image_load(image_path, convert_alpha=True)
+                    memory += Utility.get_image_memory(anim)
+                    frame_directory[name] = self.format_index(paths['index'], anim)
+            script = self.get_script(paths['script']) if 'script' in paths else None
+            self.report_missing_frames(effect, script, frame_directory)
+            effect_animations = {'images': frame_directory, 'script': script}
+            self.add_loaded(key, effect_animations, memory, time1)
+        return effect_animations
 
     def partake(self, klass, gender=0, item=None, magic=False, distance=1):
         klass = klass + str(gender)
@@ -95,7 +197,8 @@ class BattleAnimationManager(object):
             gender = (gender//5) * 5  # Get nearest default
             klass = klass[:-1] + str(gender)
         if klass in self.directory:
-            if not self.generate(klass):
+            klass_animations = self.generate(klass)
+            if klass_animations is None:
                 return None
             check_item = False
             if not item:
@@ -108,10 +211,10 @@ class BattleAnimationManager(object):
                 weapon = 'Ranged' + item.spritetype
             else:
                 weapon = item.spritetype
-            if weapon in self.directory[klass]:
+            if weapon in klass_animations:
                 if check_item and item.id not in self.effects:
                     return None
-                return self.directory[klass][weapon]
+                return klass_animations[weapon]
             else:
                 return None
         else:
@@ -119,13 +222,13 @@ class BattleAnimationManager(object):
 
     def get_effect(self, effect, name=None):
         if effect in self.effects:
-            self.generate_effect(effect)
-            if not name or name not in self.effects[effect]['images']:
+            effect_animations = self.generate_effect(effect)
+            if not name or name not in effect_animations['images']:
                 name = 'Image'
-            if name in self.effects[effect]['images']:
-                return self.effects[effect]['images'][name], self.effects[effect]['script']
+            if name in effect_animations['images']:
+                return effect_animations['images'][name], effect_animations['script']
             else:
-                return None, self.effects[effect]['script']
+                return None, effect_animations['script']
         else:
             print('Effect %s not found in self.effects!' % effect)
             return None, None
@@ -151,6 +254,11 @@ class BattleAnimationManager(object):
         return frame_directory
 
     def parse_script(self, script):
+        # Returns {pose: [commands]}, compiled for BattleAnimation.run_command
+        try:
+            import BattleAnimation
+        except ImportError:
+            from . import BattleAnimation
         with open(script) as fp:
             all_lines = [line.strip() for line in fp.readlines()]
             all_lines = [line.split(';') for line in all_lines if line and not line.startswith('#')]
@@ -163,12 +271,10 @@ class BattleAnimationManager(object):
                 if current_pose in poses:
                     print('Warning! Pose %s already present in %s'%(current_pose, script))
                 poses[current_pose] = []
-            elif line[0] == 'effect':
-                effect = line[1]
-                self.generate_effect(effect)
-                poses[current_pose].append(line)
             else:
                 poses[current_pose].append(line)
+        for pose, lines in poses.items():
+            poses[pose] = BattleAnimation.compile_pose(lines, pose, script)
         # Duplicate for ranged and miss if not explicitly provided
         if 'RangedDodge' not in poses and 'Dodge' in poses:
             poses['RangedDodge'] = poses['Dodge']
@@ -0,0 +1,116 @@
+# Keeps decoded images and sounds on disk, so later launches do not have to decode them again
+import os, zlib, timeit, threading
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+try:
+    import Engine
+except ImportError:
+    from . import Engine
+
+import logging
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1 # Change whenever the layout of an entry changes, so old cache files are ignored
+COMPRESSION = 1 # zlib level for pixel and sample buffers. 1 is nearly as fast to read back as no compression
+
+class AssetCache(object):
+    """
+    Decoded assets by source path. An entry is only used while the source file has the same modification time
+    and size it had when the entry was made, and while the display (or mixer) format is the same.
+    Entries for files that no longer exist are dropped when the cache is saved
+    """
+    def __init__(self, filename, asset_format):
+        self.filename = filename
+        self.format = asset_format
+        self.entries = {}
+        self.changed = False
+        self.save_lock = threading.Lock()  # The warm-up thread and exit can both save
+        self.hits = 0
+        self.misses = 0
+        if os.path.isfile(filename):
+            try:
+                with open(filename, 'rb') as fp:
+                    version, asset_format, entries = pickle.load(fp)
+                if version == CACHE_VERSION and asset_format == self.format:
+                    self.entries = entries
+                else:
+                    self.changed = True
+            except Exception as e:
+                logger.warning('Could not read asset cache %s: %s', filename, e)
+                self.changed = True
+
+    def get_stamp(self, path, *args):
+        stat = os.stat(path)
+        return (stat.st_mtime, stat.st_size) + args
+
+    def get_entry(self, path, stamp):
+        entry = self.entries.get(path)
+        if entry and entry[0] == stamp:
+            return entry[1]
+        return None
+
+    def set_entry(self, path, stamp, data):
+        self.entries[path] = (stamp, data)
+        self.changed = True
+        self.misses += 1
+
+    def load_image(self, path, convert=False, convert_alpha=False, colorkey=None):
+        stamp = self.get_stamp(path, convert, convert_alpha)
+        data = self.get_entry(path, stamp)
+        if data:
+            size, flags, bitsize, masks, pitch, raw = data
+            image = Engine.surface_from_buffer(size, flags, bitsize, masks, pitch, zlib.decompress(raw))
+        else:
+            image = None
+        if image:
+            self.hits += 1
+        else:
+            image = Engine.image_load(path, convert=convert, convert_alpha=convert_alpha)
+            size, flags, bitsize, masks, pitch, raw = Engine.surface_to_buffer(image)
+            self.set_entry(path, stamp, (size, flags, bitsize, masks, pitch, zlib.compress(raw, COMPRESSION)))
+        if colorkey:
+            Engine.set_colorkey(image, colorkey, rleaccel=True)
+        return image
+
+    def load_sound(self, path):
+        stamp = self.get_stamp(path)
+        raw = self.get_entry(path, stamp)
+        if raw:
+            self.hits += 1
+            return Engine.sound_from_buffer(zlib.decompress(raw))
+        sound = Engine.create_sound(path)
+        self.set_entry(path, stamp, zlib.compress(Engine.sound_to_buffer(sound), COMPRESSION))
+        return sound
+
+    def save(self):
+        with self.save_lock:
+            self.write()
+
+    def write(self):
+        removed = [path for path in list(self.entries) if not os.path.isfile(path)]
+        for path in removed:
+            del self.entries[path]
+        if not (self.changed or removed):
+            return
+        time1 = timeit.default_timer()
+        # Another thread may add entries while this one writes, so write a copy
+        self.changed = False
+        entries = dict(self.entries)
+        # Write to a temporary file first, so a failed save does not leave half a cache behind
+        try:
+            with open(self.filename + 'tmp', 'wb') as fp:
+                pickle.dump((CACHE_VERSION, self.format, entries), fp, pickle.HIGHEST_PROTOCOL)
+            if os.path.isfile(self.filename):
+                os.remove(self.filename)
+            os.rename(self.filename + 'tmp', self.filename)
+        except (IOError, OSError) as e:
+            self.changed = True
+            logger.warning('Could not write asset cache %s: %s', self.filename, e)
+        logger.debug('Saved asset cache %s: %d entries in %.1f ms', self.filename, len(entries),
+                     (timeit.default_timer() - time1)*1000)
+
+    def get_stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
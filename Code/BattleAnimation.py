@@ -3,14 +3,57 @@ import random
 try:
     import GlobalConstants as GC
     import Engine, Image_Modification
-    import CustomObjects
+    import CustomObjects, Utility
 except ImportError:
     from . import GlobalConstants as GC
     from . import Engine, Image_Modification
-    from . import CustomObjects
+    from . import CustomObjects, Utility
 
 speed = 1
 
+# Whether flipped, flashed and faded frame images are kept and shared, instead of being built again on every draw
+CACHE_VARIANTS = True
+VARIANT_MEMORY = 8*1024*1024 # Bytes of frame images kept around
+OPACITY_STEP = 4 # Opacities are rounded to a multiple of this, so a fade does not need a new image for every value
+
+class VariantCache(object):
+    """Frame images after flipping, flashing and fading, shared by every animation that draws the same frame."""
+    def __init__(self, max_memory):
+        self.images = Utility.LRUCache(max_memory)
+
+    def get(self, key, build, *args):
+        image = self.images.get(key)
+        if image is None:
+            image = build(*args)
+            self.images.put(key, image)
+        return image
+
+    def discard_frames(self, frames):
+        # Every key starts with the frame image it was made from, which keeps that frame's whole sheet loaded
+        for key in self.images.keys():
+            if key[0] in frames:
+                self.images.discard(key)
+
+    def get_stats(self):
+        return self.images.get_stats()
+
+VARIANTS = VariantCache(VARIANT_MEMORY)
+
+def get_stats():
+    return VARIANTS.get_stats()
+
+def gray_variant(image):
+    return Image_Modification.gray_image(image.convert_alpha())
+
+def flash_variant(image, color):
+    return Image_Modification.flicker_image(image.convert_alpha(), color)
+
+def opacity_variant(image, opacity, blend):
+    if blend:
+        return Image_Modification.flickerImageTranslucentBlend(image, opacity)
+    else:
+        return Image_Modification.flickerImageTranslucent255(image.convert_alpha(), opacity)
+
 class Loop(object):
     def __init__(self, start):
         self.start_index = start
@@ -48,6 +91,7 @@ class BattleAnimation(object):
         self.flash_color = None
         self.flash_frames = 0
         self.flash_image = None
+        self.flash_key = None # What the flash image was made from, if it is shared
         # Opacity
         self.opacity = 255
         # Offset
@@ -86,10 +130,10 @@ class BattleAnimation(object):
         if self.state != 'Inert':
             # Handle deferred commands
             self.deferred_commands = \
-                [(num_frames - 1, line) for num_frames, line in self.deferred_commands if num_frames > 0]
-            for num_frames, line in self.deferred_commands:
+                [(num_frames - 1, op) for num_frames, op in self.deferred_commands if num_frames > 0]
+            for num_frames, op in self.deferred_commands:
                 if num_frames <= 0:
-                    self.parse_line(line)
+                    self.run_command(op)
 
         if self.state == 'Run':
             # Handle reading script
@@ -163,309 +207,325 @@ class BattleAnimation(object):
         self.script_index = 0
 
     def get_frames(self, num):
-        return max(1, int(int(num) * speed))
+        return max(1, int(num * speed))
 
     def read_script(self):
         script = self.poses[self.current_pose]
         while(self.script_index < len(script) and self.processing):
-            line = script[self.script_index]
-            self.parse_line(line)
+            self.run_command(script[self.script_index])
             self.script_index += 1
 
-    def parse_line(self, line):
-        # print(self.right, line)
+    def run_command(self, op):
+        # print(self.right, op)
         self.base_state = False
-        # === TIMING AND IMAGES ===
-        if line[0] == 'f':
-            self.frame_count = 0
-            self.num_frames = self.get_frames(line[1])
-            self.current_frame = self.frame_directory.get(line[2])
-            self.processing = False
-            if line[2] == 'Stand':
-                self.base_state = True
-            if len(line) > 3 and line[3]:  # Under frame
-                self.under_frame = self.frame_directory.get(line[3])
-            else:
-                self.under_frame = None
-            self.over_frame = None
-            if len(line) > 4 and line[4]:
-                self.personal_offset = tuple(int(num) for num in line[4].split(','))
-        elif line[0] == 'of':
-            self.frame_count = 0
-            self.num_frames = self.get_frames(line[1])
-            self.under_frame = None
-            self.processing = False
-            self.over_frame = self.frame_directory.get(line[2])
-            if len(line) > 3:  # Current frame
-                self.current_frame = self.frame_directory.get(line[3])
-            else:
-                self.current_frame = None
-        elif line[0] == 'uf':
-            self.frame_count = 0
-            self.num_frames = self.get_frames(line[1])
-            self.current_frame = None
+        command = COMMANDS.get(op[0])
+        if command:
+            command(self, *op[1:])
+        else:
+            print('%s is not supported command'%(op[0]))
+
+    # === TIMING AND IMAGES ===
+    def command_f(self, num_frames, frame, under_frame, offset, stand):
+        self.frame_count = 0
+        self.num_frames = self.get_frames(num_frames)
+        self.current_frame = self.frame_directory.get(frame)
+        self.processing = False
+        if stand:
+            self.base_state = True
+        self.under_frame = self.frame_directory.get(under_frame) if under_frame else None
+        self.over_frame = None
+        if offset:
+            self.personal_offset = offset
+
+    def command_of(self, num_frames, over_frame, frame):
+        self.frame_count = 0
+        self.num_frames = self.get_frames(num_frames)
+        self.under_frame = None
+        self.processing = False
+        self.over_frame = self.frame_directory.get(over_frame)
+        self.current_frame = self.frame_directory.get(frame) if frame is not None else None
+
+    def command_uf(self, num_frames, under_frame, offset):
+        self.frame_count = 0
+        self.num_frames = self.get_frames(num_frames)
+        self.current_frame = None
+        self.over_frame = None
+        self.under_frame = self.frame_directory.get(under_frame)
+        self.processing = False
+        if offset:
+            self.personal_offset = offset
+
+    def command_wait(self, num_frames):
+        self.frame_count = 0
+        self.num_frames = self.get_frames(num_frames)
+        self.current_frame = None
+        self.under_frame = None
+        self.over_frame = None
+        self.processing = False
+
+    # === SFX ===
+    def command_sound(self, sounds):
+        sound = random.choice(sounds)
+        GC.SOUNDDICT[sound].play()
+
+    def command_stop_sound(self, sounds):
+        for sound in sounds:
+            GC.SOUNDDICT[sound].stop()
+
+    # === COMBAT HIT ===
+    def command_start_hit(self, shake, sound):
+        if shake:
+            if self.owner.outcome() == 2:
+                self.owner.shake(4)  # Critical
+            elif self.owner.def_damage() > 0:
+                self.owner.shake(1)
+            else:  # No Damage -- Hit spark handles anim
+                self.owner.shake(2)
+        self.owner.start_hit(sound)
+        # Also offset partner by [-1, -2, -3, -2, -1]
+        if self.partner:
+            self.partner.lr_offset = [-1, -2, -3, -2, -1]
+
+    def command_wait_for_hit(self, frame, under_frame):
+        if self.wait_for_hit:
+            self.current_frame = self.frame_directory[frame] if frame is not None else None
+            self.under_frame = self.frame_directory[under_frame] if under_frame is not None else None
             self.over_frame = None
-            self.under_frame = self.frame_directory.get(line[2])
+            self.state = 'Wait'
             self.processing = False
-            if len(line) > 3:
-                self.personal_offset = tuple(int(num) for num in line[3].split(','))
-        elif line[0] == 'wait':
-            self.frame_count = 0
-            self.num_frames = self.get_frames(line[1])
-            self.current_frame = None
-            self.under_frame = None
-            self.over_frame = None
+            self.base_state = True
+
+    def command_spell_hit(self, shake, sound):
+        # To handle ruin item
+        if not self.item.half or self.owner.def_damage() > 0:
+            self.owner.start_hit(sound, self.owner.outcome() == 0)
+            self.state = 'Wait'
             self.processing = False
-        # === SFX ===
-        elif line[0] == 'sound':
-            sound = random.choice(line[1:])
-            GC.SOUNDDICT[sound].play()
-        elif line[0] == 'stop_sound':
-            for sound in line[1:]:
-                GC.SOUNDDICT[sound].stop()
-        # === COMBAT HIT ===
-        elif line[0] == 'start_hit':
-            if 'no_shake' not in line:
-                if self.owner.outcome() == 2:
-                    self.owner.shake(4)  # Critical
-                elif self.owner.def_damage() > 0:
-                    self.owner.shake(1)
-                else:  # No Damage -- Hit spark handles anim
+            if self.owner.def_damage() > 0:
+                if shake:
+                    if self.owner.outcome() == 2:  # Crit
+                        self.owner.shake(4)
+                    else:
+                        self.owner.shake(3)
+            elif self.owner.def_damage() == 0:
+                if shake:
                     self.owner.shake(2)
-            self.owner.start_hit('no_sound' not in line)
-            # Also offset partner by [-1, -2, -3, -2, -1]
-            if self.partner:
-                self.partner.lr_offset = [-1, -2, -3, -2, -1]
-        elif line[0] == 'wait_for_hit':
-            if self.wait_for_hit:
-                if len(line) > 1:
-                    self.current_frame = self.frame_directory[line[1]]
-                else:
-                    self.current_frame = None
-                if len(line) > 2:
-                    self.under_frame = self.frame_directory[line[2]]
-                else:
-                    self.under_frame = None
-                self.over_frame = None
-                self.state = 'Wait'
-                self.processing = False
-                self.base_state = True
-        elif line[0] == 'spell_hit':
-            # To handle ruin item
-            if not self.item.half or self.owner.def_damage() > 0:
-                self.owner.start_hit('no_sound' not in line, self.owner.outcome() == 0)
-                self.state = 'Wait'
-                self.processing = False
-                if self.owner.def_damage() > 0:
-                    if 'no_shake' not in line:
-                        if self.owner.outcome() == 2:  # Crit
-                            self.owner.shake(4)
-                        else:
-                            self.owner.shake(3)
-                elif self.owner.def_damage() == 0:
-                    if 'no_shake' not in line:
-                        self.owner.shake(2)
-                    if self.item and (self.item.weapon or (self.item.spell and self.item.damage)):
-                        self.no_damage()
-        elif line[0] == 'miss':
+                if self.item and (self.item.weapon or (self.item.spell and self.item.damage)):
+                    self.no_damage()
+
+    def command_miss(self, shake, sound):
+        if self.right:
+            position = (72, 21)
+        else:
+            position = (128, 21)  # Enemy's position
+        team = self.owner.right.team if self.right else self.owner.left.team
+        image = GC.IMAGESDICT['MissBlue' if team == 'player' else 'MissRed']
+        anim = CustomObjects.Animation(image, position, (5, 4), ignore_map=True, 
+                                       set_timing=(1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+                                                   1, 1, 1, 1, 1, 1, 1, 1, 1, 23))
+        self.animations.append(anim)
+        if not self.item.half:  # Spell hit handles this
+            self.owner.start_hit(sound, True)  # Miss
+        if self.partner:
+            self.partner.dodge()
+
+    # === FLASHING ===
+    def command_parent_tint_loop(self, num_frames, colors):
+        if self.parent:
+            self.parent.flash(self.get_frames(num_frames), list(colors))
+
+    def command_parent_tint(self, num_frames, color):
+        if self.parent:
+            self.parent.flash(self.get_frames(num_frames), color)
+
+    def command_enemy_tint(self, num_frames, color):
+        if self.partner:
+            self.partner.flash(self.get_frames(num_frames), color)
+
+    def command_enemy_gray(self, num_frames):
+        if self.partner:
+            self.partner.flash(self.get_frames(num_frames), 'gray')
+
+    def command_enemy_flash_white(self, num_frames):
+        if self.partner:
+            self.partner.flash(self.get_frames(num_frames), (248, 248, 248))
+
+    def command_self_flash_white(self, num_frames):
+        self.flash(self.get_frames(num_frames), (248, 248, 248))
+
+    def command_screen_flash_white(self, num_frames, fade_out):
+        fade_out = self.get_frames(fade_out) if fade_out is not None else 0
+        self.owner.flash_color(self.get_frames(num_frames), fade_out, color=(248, 248, 248))
+
+    def command_screen_blend(self, num_frames, color):
+        self.owner.flash_color(self.get_frames(num_frames), color=color)
+
+    def command_foreground_blend(self, num_frames, color):
+        self.foreground_frames = self.get_frames(num_frames)
+        self.foreground = GC.IMAGESDICT['BlackBackground'].copy()
+        self.foreground.fill(color)
+
+    def command_background_blend(self, num_frames, color):
+        self.background_frames = self.get_frames(num_frames)
+        self.background = GC.IMAGESDICT['BlackBackground'].copy()
+        self.background.fill(color)
+
+    def command_darken(self):
+        self.owner.darken()
+
+    def command_lighten(self):
+        self.owner.lighten()
+
+    def command_platform_shake(self):
+        self.owner.platform_shake()
+
+    def command_screen_shake(self):
+        self.owner.shake(1)
+
+    # === ANIMATIONS ===
+    def command_hit_spark(self):
+        if self.owner.def_damage() > 0:
             if self.right:
-                position = (72, 21)
+                position = (-110, -30)
             else:
-                position = (128, 21)  # Enemy's position
-            team = self.owner.right.team if self.right else self.owner.left.team
-            image = GC.IMAGESDICT['MissBlue' if team == 'player' else 'MissRed']
-            anim = CustomObjects.Animation(image, position, (5, 4), ignore_map=True, 
-                                           set_timing=(1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
-                                                       1, 1, 1, 1, 1, 1, 1, 1, 1, 23))
+                position = (-40, -30)  # Enemy's position
+            image = GC.IMAGESDICT['HitSpark']
+            anim = CustomObjects.Animation(image, position, (3, 5), 14, ignore_map=True, 
+                                           set_timing=(-1, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1))
             self.animations.append(anim)
-            if not self.item.half:  # Spell hit handles this
-                self.owner.start_hit('no_sound' not in line, True)  # Miss
-            if self.partner:
-                self.partner.dodge()
-        # === FLASHING ===
-        elif line[0] == 'parent_tint_loop':
-            num_frames = self.get_frames(line[1])
-            color = [tuple([int(num) for num in color.split(',')]) for color in line[2:]]
-            if self.parent:
-                self.parent.flash(num_frames, color)
-        elif line[0] == 'parent_tint':
-            num_frames = self.get_frames(line[1])
-            color = tuple([int(num) for num in line[2].split(',')])
-            if self.parent:
-                self.parent.flash(num_frames, color)
-        elif line[0] == 'enemy_tint':
-            num_frames = self.get_frames(line[1])
-            color = tuple([int(num) for num in line[2].split(',')])
-            if self.partner:
-                self.partner.flash(num_frames, color)
-        elif line[0] == 'enemy_gray':
-            num_frames = self.get_frames(line[1])
-            if self.partner:
-                self.partner.flash(num_frames, 'gray')
-        elif line[0] == 'enemy_flash_white':
-            num_frames = self.get_frames(line[1])
-            if self.partner:
-                self.partner.flash(num_frames, (248, 248, 248))
-        elif line[0] == 'self_flash_white':
-            num_frames = self.get_frames(line[1])
-            self.flash(num_frames, (248, 248, 248))
-        elif line[0] == 'screen_flash_white':
-            num_frames = self.get_frames(line[1])
-            if len(line) > 2:
-                fade_out = self.get_frames(line[2])
-            else:
-                fade_out = 0
-            self.owner.flash_color(num_frames, fade_out, color=(248, 248, 248))
-        elif line[0] == 'screen_blend':
-            num_frames = self.get_frames(line[1])
-            color = tuple(int(num) for num in line[2].split(','))
-            self.owner.flash_color(num_frames, color=color)
-        elif line[0] == 'foreground_blend':
-            self.foreground_frames = self.get_frames(line[1])
-            color = tuple([int(num) for num in line[2].split(',')])
-            self.foreground = GC.IMAGESDICT['BlackBackground'].copy()
-            self.foreground.fill(color)
-        elif line[0] == 'background_blend':
-            self.background_frames = self.get_frames(line[1])
-            color = tuple([int(num) for num in line[2].split(',')])
-            self.background = GC.IMAGESDICT['BlackBackground'].copy()
-            self.background.fill(color)
-        elif line[0] == 'darken':
-            self.owner.darken()
-        elif line[0] == 'lighten':
-            self.owner.lighten()
-        elif line[0] == 'platform_shake':
-            self.owner.platform_shake()
-        elif line[0] == 'screen_shake':
-            self.owner.shake(1)
-        # === ANIMATIONS ===
-        elif line[0] == 'hit_spark':
-            if self.owner.def_damage() > 0:
-                if self.right:
-                    position = (-110, -30)
-                else:
-                    position = (-40, -30)  # Enemy's position
-                image = GC.IMAGESDICT['HitSpark']
-                anim = CustomObjects.Animation(image, position, (3, 5), 14, ignore_map=True, 
-                                               set_timing=(-1, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1))
-                self.animations.append(anim)
-            else:  # No Damage
-                self.no_damage()
-        elif line[0] == 'crit_spark':
-            if self.owner.def_damage() > 0:
-                image = GC.IMAGESDICT['CritSpark']
-                if not self.right:
-                    image = Engine.flip_horiz(image)  # If on the left, then need to swap so enemy can have it
-                anim = CustomObjects.Animation(image, (-40, -30), (3, 5), 15, ignore_map=True, 
-                                               set_timing=(-1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1))
-                self.animations.append(anim)
-            else:  # No Damage
-                self.no_damage()
-        # === EFFECTS ===
-        elif line[0] == 'effect':
-            image, script = GC.ANIMDICT.get_effect(line[1], self.palette_name)
-            # print('Effect', script)
-            child_effect = BattleAnimation(self.unit, image, script, self.palette_name, self.item)
-            child_effect.awake(self.owner, self.partner, self.right, self.at_range, parent=self)
-            if len(line) > 2:
-                child_effect.effect_offset = tuple(int(num) for num in line[2].split(','))
-            child_effect.start_anim(self.current_pose)
-            self.children.append(child_effect)
-        elif line[0] == 'under_effect':
-            image, script = GC.ANIMDICT.get_effect(line[1], self.palette_name)
-            # print('Effect', script)
-            child_effect = BattleAnimation(self.unit, image, script, self.palette_name, self.item)
-            child_effect.awake(self.owner, self.partner, self.right, self.at_range, parent=self)
-            if len(line) > 2:
-                child_effect.effect_offset = tuple(int(num) for num in line[2].split(','))
-            child_effect.start_anim(self.current_pose)
-            self.under_children.append(child_effect)
-        elif line[0] == 'enemy_effect':
-            image, script = GC.ANIMDICT.get_effect(line[1], self.palette_name)
-            child_effect = BattleAnimation(self.partner.unit, image, script, self.palette_name, self.item)
-            # Opposite effects
-            child_effect.awake(self.owner, self.parent, not self.right,
-                               self.at_range, parent=self.parent.partner)
-            if len(line) > 2:
-                child_effect.effect_offset = tuple(int(num) for num in line[2].split(','))
-            child_effect.start_anim(self.current_pose)
-            self.partner.children.append(child_effect)
-        elif line[0] == 'enemy_under_effect':
-            image, script = GC.ANIMDICT.get_effect(line[1], self.palette_name)
-            child_effect = BattleAnimation(self.partner.unit, image, script, self.palette_name, self.item)
-            # Opposite effects
-            child_effect.awake(self.owner, self.parent, not self.right,
-                               self.at_range, parent=self.parent.partner)
-            if len(line) > 2:
-                child_effect.effect_offset = tuple(int(num) for num in line[2].split(','))
-            child_effect.start_anim(self.current_pose)
-            self.partner.under_children.append(child_effect)
-        elif line[0] == 'clear_all_effects':
-            self.clear_all_effects()
-        elif line[0] == 'blend':
-            if self.blend:
-                self.blend = None
-            else:
-                self.blend = Engine.BLEND_RGB_ADD
-        elif line[0] == 'spell':
-            if len(line) > 1:
-                item_id = line[1]
-            else:
-                item_id = self.item.id
-            image, script = GC.ANIMDICT.get_effect(item_id, self.palette_name)
-            child_effect = BattleAnimation(self.unit, image, script, self.palette_name, self.item)
-            child_effect.awake(self.owner, self.partner, self.right, self.at_range, parent=self)
-            child_effect.start_anim(self.current_pose)
-            self.children.append(child_effect)
-        elif line[0] == 'static':
-            self.static = not self.static
-        elif line[0] == 'over_static':
-            self.over_static = not self.over_static
-        elif line[0] == 'under_static':
-            self.under_static = not self.under_static
-        elif line[0] == 'ignore_pan':
-            self.ignore_pan = not self.ignore_pan
-        elif line[0] == 'opacity':
-            self.opacity = int(line[1])
-        elif line[0] == 'set_parent_opacity':
-            self.parent.opacity = int(line[1])
-        # === LOOPING ===
-        elif line[0] == 'start_loop':
-            if self.end_next_loop > 0:
-                self.end_next_loop -= 1
-            else:
-                self.loop = Loop(self.script_index)
-        elif line[0] == 'end_loop':
-            if self.loop:
-                self.loop.end_index = self.script_index
-                self.script_index = self.loop.start_index  # re-loop
-        elif line[0] == 'end_parent_loop':
-            self.parent.end_loop()
-        elif line[0] == 'end_child_loop':
-            for child in self.children:
-                child.end_loop()
-            for child in self.under_children:
-                child.end_loop()
-        elif line[0] == 'defer':
-            num_frames = int(line[1])
-            rest_of_line = line[2:]
-            self.deferred_commands.append((num_frames, rest_of_line))
-        # === CONDITIONALS ===
-        elif line[0] == 'if_range':
-            if not self.at_range:
-                self.script_index += int(line[1])
-        elif line[0] == 'nif_range':
-            if self.at_range:
-                self.script_index += int(line[1])
-        # === MOVEMENT ===
-        elif line[0] == 'pan':
-            self.pan_away = not self.pan_away
-            if self.pan_away:
-                self.owner.pan_away()
-            else:
-                self.owner.pan_back()
+        else:  # No Damage
+            self.no_damage()
+
+    def command_crit_spark(self):
+        if self.owner.def_damage() > 0:
+            image = GC.IMAGESDICT['CritSpark']
+            if not self.right:
+                image = Engine.flip_horiz(image)  # If on the left, then need to swap so enemy can have it
+            anim = CustomObjects.Animation(image, (-40, -30), (3, 5), 15, ignore_map=True, 
+                                           set_timing=(-1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1))
+            self.animations.append(anim)
+        else:  # No Damage
+            self.no_damage()
+
+    # === EFFECTS ===
+    def command_effect(self, effect, offset):
+        image, script = GC.ANIMDICT.get_effect(effect, self.palette_name)
+        # print('Effect', script)
+        child_effect = BattleAnimation(self.unit, image, script, self.palette_name, self.item)
+        child_effect.awake(self.owner, self.partner, self.right, self.at_range, parent=self)
+        if offset:
+            child_effect.effect_offset = offset
+        child_effect.start_anim(self.current_pose)
+        self.children.append(child_effect)
+
+    def command_under_effect(self, effect, offset):
+        image, script = GC.ANIMDICT.get_effect(effect, self.palette_name)
+        # print('Effect', script)
+        child_effect = BattleAnimation(self.unit, image, script, self.palette_name, self.item)
+        child_effect.awake(self.owner, self.partner, self.right, self.at_range, parent=self)
+        if offset:
+            child_effect.effect_offset = offset
+        child_effect.start_anim(self.current_pose)
+        self.under_children.append(child_effect)
+
+    def command_enemy_effect(self, effect, offset):
+        image, script = GC.ANIMDICT.get_effect(effect, self.palette_name)
+        child_effect = BattleAnimation(self.partner.unit, image, script, self.palette_name, self.item)
+        # Opposite effects
+        child_effect.awake(self.owner, self.parent, not self.right,
+                           self.at_range, parent=self.parent.partner)
+        if offset:
+            child_effect.effect_offset = offset
+        child_effect.start_anim(self.current_pose)
+        self.partner.children.append(child_effect)
+
+    def command_enemy_under_effect(self, effect, offset):
+        image, script = GC.ANIMDICT.get_effect(effect, self.palette_name)
+        child_effect = BattleAnimation(self.partner.unit, image, script, self.palette_name, self.item)
+        # Opposite effects
+        child_effect.awake(self.owner, self.parent, not self.right,
+                           self.at_range, parent=self.parent.partner)
+        if offset:
+            child_effect.effect_offset = offset
+        child_effect.start_anim(self.current_pose)
+        self.partner.under_children.append(child_effect)
+
+    def command_clear_all_effects(self):
+        self.clear_all_effects()
+
+    def command_blend(self):
+        if self.blend:
+            self.blend = None
+        else:
+            self.blend = Engine.BLEND_RGB_ADD
+
+    def command_spell(self, item_id):
+        if item_id is None:
+            item_id = self.item.id
+        image, script = GC.ANIMDICT.get_effect(item_id, self.palette_name)
+        child_effect = BattleAnimation(self.unit, image, script, self.palette_name, self.item)
+        child_effect.awake(self.owner, self.partner, self.right, self.at_range, parent=self)
+        child_effect.start_anim(self.current_pose)
+        self.children.append(child_effect)
+
+    def command_static(self):
+        self.static = not self.static
+
+    def command_over_static(self):
+        self.over_static = not self.over_static
+
+    def command_under_static(self):
+        self.under_static = not self.under_static
+
+    def command_ignore_pan(self):
+        self.ignore_pan = not self.ignore_pan
+
+    def command_opacity(self, opacity):
+        self.opacity = opacity
+
+    def command_set_parent_opacity(self, opacity):
+        self.parent.opacity = opacity
+
+    # === LOOPING ===
+    def command_start_loop(self):
+        if self.end_next_loop > 0:
+            self.end_next_loop -= 1
+        else:
+            self.loop = Loop(self.script_index)
+
+    def command_end_loop(self):
+        if self.loop:
+            self.loop.end_index = self.script_index
+            self.script_index = self.loop.start_index  # re-loop
+
+    def command_end_parent_loop(self):
+        self.parent.end_loop()
+
+    def command_end_child_loop(self):
+        for child in self.children:
+            child.end_loop()
+        for child in self.under_children:
+            child.end_loop()
+
+    def command_defer(self, num_frames, op):
+        self.deferred_commands.append((num_frames, op))
+
+    # === CONDITIONALS ===
+    def command_if_range(self, num_lines):
+        if not self.at_range:
+            self.script_index += num_lines
+
+    def command_nif_range(self, num_lines):
+        if self.at_range:
+            self.script_index += num_lines
+
+    # === MOVEMENT ===
+    def command_pan(self):
+        self.pan_away = not self.pan_away
+        if self.pan_away:
+            self.owner.pan_away()
         else:
-            print('%s is not supported command'%(line[0]))
+            self.owner.pan_back()
 
     def end_loop(self):
         if self.loop:
@@ -549,9 +609,12 @@ class BattleAnimation(object):
             self.num_frames = int(42 * speed)
 
     def get_image(self, frame, shake, range_offset, pan_offset, static):
-        image = frame[0].copy()
-        if not self.right:
-            image = Engine.flip_horiz(image)
+        if CACHE_VARIANTS:
+            image = frame[0] if self.right else VARIANTS.get((frame[0], False), Engine.flip_horiz, frame[0])
+        else:
+            image = frame[0].copy()
+            if not self.right:
+                image = Engine.flip_horiz(image)
         offset = frame[1]
         # Handle own offset
         if self.lr_offset:
@@ -592,13 +655,17 @@ class BattleAnimation(object):
 
             if self.current_frame is not None:
                 image, offset = self.get_image(self.current_frame, shake, range_offset, pan_offset, self.static)
+                # What the image is made from, while it can still be shared with other draws of the same frame
+                key = (self.current_frame[0], self.right) if CACHE_VARIANTS else None
                 # Move the animations in at the beginning and out at the end
                 if self.entrance:
                     progress = (self.init_speed - self.entrance) / float(self.init_speed)
                     new_size = (int(progress * image.get_width()), int(progress * image.get_height()))
                     image = Engine.transform_scale(image, new_size)
+                    key = None
                     if self.flash_color and self.flash_image:  # Make sure that flash image uses resized image
                         self.flash_image = image
+                        self.flash_key = None
                     diff_x = offset[0] - self.init_position[0]
                     diff_y = offset[1] - self.init_position[1]
                     offset = int(self.init_position[0] + progress * diff_x), \
@@ -608,24 +675,39 @@ class BattleAnimation(object):
                 if self.flash_color:
                     if not self.flash_image or isinstance(self.flash_color, list):
                         if self.flash_color == 'gray':
-                            self.flash_image = Image_Modification.gray_image(image.convert_alpha())
+                            color = 'gray'
                         elif isinstance(self.flash_color, list):
-                            self.flash_image = Image_Modification.flicker_image(image.convert_alpha(), self.flash_color[self.flash_frames%len(self.flash_color)])
+                            color = tuple(self.flash_color[self.flash_frames%len(self.flash_color)])
+                        else:
+                            color = tuple(self.flash_color)
+                        if key:
+                            self.flash_key = key + (color,)
+                            if color == 'gray':
+                                self.flash_image = VARIANTS.get(self.flash_key, gray_variant, image)
+                            else:
+                                self.flash_image = VARIANTS.get(self.flash_key, flash_variant, image, color)
                         else:
-                            self.flash_image = Image_Modification.flicker_image(image.convert_alpha(), self.flash_color)
+                            self.flash_key = None
+                            if color == 'gray':
+                                self.flash_image = gray_variant(image)
+                            else:
+                                self.flash_image = flash_variant(image, color)
                     self.flash_frames -= 1
                     image = self.flash_image
+                    key = self.flash_key
                     # If done
                     if self.flash_frames <= 0:
                         self.flash_color = None
                         self.flash_frames = 0
                         self.flash_image = None
+                        self.flash_key = None
 
                 if self.opacity != 255:
-                    if self.blend:
-                        image = Image_Modification.flickerImageTranslucentBlend(image, self.opacity)
+                    if key:
+                        opacity = min(255, int(round(self.opacity/float(OPACITY_STEP)))*OPACITY_STEP)
+                        image = VARIANTS.get(key + (opacity, bool(self.blend)), opacity_variant, image, opacity, self.blend)
                     else:
-                        image = Image_Modification.flickerImageTranslucent255(image.convert_alpha(), self.opacity)
+                        image = opacity_variant(image, self.opacity, self.blend)
 
                 if self.background and self.blend:
                     old_bg = self.background.copy()
@@ -670,3 +752,95 @@ class BattleAnimation(object):
             image, offset = self.get_image(self.over_frame, shake, range_offset, pan_offset, self.over_static)
             # Actually draw
             Engine.blit(surf, image, offset, None, self.blend)
+
+# Every script command, by the name it has in the script files
+COMMANDS = {name[len('command_'):]: func for name, func in vars(BattleAnimation).items() if name.startswith('command_')}
+
+# Commands whose only argument is a number of frames
+FRAMES_COMMANDS = {'wait', 'enemy_gray', 'enemy_flash_white', 'self_flash_white'}
+# Commands that take a number of frames and a color
+COLOR_COMMANDS = {'parent_tint', 'enemy_tint', 'screen_blend', 'foreground_blend', 'background_blend'}
+EFFECT_COMMANDS = {'effect', 'under_effect', 'enemy_effect', 'enemy_under_effect'}
+NUMBER_COMMANDS = {'opacity', 'set_parent_opacity', 'if_range', 'nif_range'}
+# Commands that can be told not to shake the screen or play a sound
+HIT_COMMANDS = {'start_hit', 'spell_hit', 'miss'}
+
+def parse_tuple(text):
+    return tuple(int(num) for num in text.split(','))
+
+def compile_line(line):
+    """
+    Turns one split script line into the tuple that run_command takes: the command name, then its arguments
+    already parsed. Numbers of frames are not scaled by speed yet, since speed changes while skipping.
+    Raises ValueError or IndexError if the line is malformed
+    """
+    command = line[0]
+    if command == 'f':
+        under_frame = line[3] if len(line) > 3 and line[3] else None
+        offset = parse_tuple(line[4]) if len(line) > 4 and line[4] else None
+        return (command, int(line[1]), line[2], under_frame, offset, line[2] == 'Stand')
+    elif command == 'of':
+        return (command, int(line[1]), line[2], line[3] if len(line) > 3 else None)
+    elif command == 'uf':
+        return (command, int(line[1]), line[2], parse_tuple(line[3]) if len(line) > 3 else None)
+    elif command == 'wait_for_hit':
+        return (command, line[1] if len(line) > 1 else None, line[2] if len(line) > 2 else None)
+    elif command in FRAMES_COMMANDS:
+        return (command, int(line[1]))
+    elif command in COLOR_COMMANDS:
+        return (command, int(line[1]), parse_tuple(line[2]))
+    elif command == 'parent_tint_loop':
+        return (command, int(line[1]), tuple(parse_tuple(color) for color in line[2:]))
+    elif command == 'screen_flash_white':
+        return (command, int(line[1]), int(line[2]) if len(line) > 2 else None)
+    elif command in ('sound', 'stop_sound'):
+        return (command, tuple(line[1:]))
+    elif command in HIT_COMMANDS:
+        return (command, 'no_shake' not in line, 'no_sound' not in line)
+    elif command in EFFECT_COMMANDS:
+        return (command, line[1], parse_tuple(line[2]) if len(line) > 2 else None)
+    elif command == 'spell':
+        return (command, line[1] if len(line) > 1 else None)
+    elif command in NUMBER_COMMANDS:
+        return (command, int(line[1]))
+    elif command == 'defer':
+        return (command, int(line[1]), compile_line(line[2:]))
+    else:
+        return (command,)
+
+def compile_pose(lines, pose, name=''):
+    """
+    Compiles the split lines of one pose. Lines that cannot be compiled are reported now,
+    and become commands that are reported as unsupported if they are ever run
+    """
+    ops = []
+    for line in lines:
+        try:
+            op = compile_line(line)
+        except (ValueError, IndexError) as e:
+            print('Warning! Could not read line %s in pose %s of %s: %s' % (';'.join(line), pose, name, e))
+            op = (';'.join(line),)
+        if op[0] not in COMMANDS:
+            print('Warning! %s in pose %s of %s is not supported command' % (op[0], pose, name))
+        ops.append(op)
+    return ops
+
+def get_frame_names(op):
+    """Names of the frames that a compiled command draws"""
+    if op[0] in ('f', 'of'):
+        return [name for name in op[2:4] if name]
+    elif op[0] == 'uf':
+        return [op[2]]
+    elif op[0] == 'wait_for_hit':
+        return [name for name in op[1:3] if name is not None]
+    elif op[0] == 'defer':
+        return get_frame_names(op[2])
+    return []
+
+def validate_script(poses, frame_directory):
+    """Names of frames used by the compiled script that are missing from the frame directory"""
+    missing = set()
+    for lines in poses.values():
+        for op in lines:
+            missing.update(name for name in get_frame_names(op) if name not in frame_directory)
+    return sorted(missing)
@@ -1,4 +1,4 @@
-import os, pickle, re, math
+import os, copy, pickle, re, math
 
 try:
     import GlobalConstants as GC
@@ -140,11 +140,18 @@ class BoundaryManager(object):
                              'spell': {},
                              'movement': {}}
         self.order = ['all_spell', 'all_attack', 'spell', 'attack']
+        # The 16 edge pieces of each boundary type, indexed by which neighbours are also in the boundary
+        self.atlas = {name: [Engine.subsurface(image, (index*GC.TILEWIDTH, 0, GC.TILEWIDTH, GC.TILEHEIGHT)) for index in range(16)]
+                      for name, image in self.types.items()}
 
         self.draw_flag = False
         self.all_on_flag = False
 
         self.displaying_units = set()
+        # Units whose ranges need to be recomputed at the next update
+        self.dirty_units = set()
+        # Cells whose boundary images need to be repainted at the next draw
+        self.dirty_cells = set()
 
         self.surf = None
 
@@ -167,13 +174,18 @@ class BoundaryManager(object):
         else:
             self.displaying_units.add(unit.id)
             unit.flickerRed = True
-        self.surf = None
+        self._dirty_unit_cells(unit.id)
 
     def reset_unit(self, unit):
         if unit.id in self.displaying_units:
             self.displaying_units.discard(unit.id)
             unit.flickerRed = False
-            self.surf = None
+            self._dirty_unit_cells(unit.id)
+
+    def _dirty_unit_cells(self, u_id):
+        for kind in ('attack', 'spell'):
+            if u_id in self.dictionaries[kind]:
+                self.dirty_cells |= self.dictionaries[kind][u_id]
 
     def _set(self, positions, kind, u_id):
         this_grid = self.grids[kind]
@@ -181,6 +193,8 @@ class BoundaryManager(object):
         for pos in positions:
             this_grid[pos[0] * self.gridHeight + pos[1]].add(u_id)
             self.dictionaries[kind][u_id].add(pos)
+        if kind != 'movement':
+            self.dirty_cells |= self.dictionaries[kind][u_id]
         # self.print_grid(kind)
 
     def clear(self, kind=False):
@@ -195,6 +209,7 @@ class BoundaryManager(object):
         self.surf = None
 
     def _add_unit(self, unit, gameStateObj):
+        self.dirty_units.discard(unit.id)
         ValidMoves = unit.getValidMoves(gameStateObj, force=True)
         ValidAttacks, ValidSpells = [], []
         if unit.getMainWeapon():
@@ -203,64 +218,66 @@ class BoundaryManager(object):
             ValidSpells = unit.getExcessSpellAttacks(gameStateObj, ValidMoves, boundary=True)
         self._set(ValidAttacks, 'attack', unit.id)
         self._set(ValidSpells, 'spell', unit.id)
-        # self._set(ValidMoves, 'movement', unit.id)
-        area_of_influence = Utility.find_manhattan_spheres(range(1, unit.stats['MOV'] + 1), unit.position)
-        area_of_influence = {pos for pos in area_of_influence if gameStateObj.map.check_bounds(pos)}
-        self._set(area_of_influence, 'movement', unit.id)
+        # The movement grid records which tiles this unit's Djikstra frontier depended on:
+        # every tile it reached plus every tile it looked at from there.
+        # Only a change in occupancy of one of these tiles can change its ranges
+        frontier = set(ValidMoves)
+        for (x, y) in ValidMoves:
+            frontier.update(((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)))
+        frontier = {pos for pos in frontier if gameStateObj.map.check_bounds(pos)}
+        self._set(frontier, 'movement', unit.id)
         # print(unit.name, unit.position, unit.klass, unit.event_id)
-        self.surf = None
 
     def _remove_unit(self, unit, gameStateObj):
+        self.dirty_units.discard(unit.id)
         for kind, grid in self.grids.items():
             if unit.id in self.dictionaries[kind]:
                 for (x, y) in self.dictionaries[kind][unit.id]:
                     grid[x * self.gridHeight + y].discard(unit.id)
-        self.surf = None
+                if kind != 'movement':
+                    self.dirty_cells |= self.dictionaries[kind][unit.id]
+                del self.dictionaries[kind][unit.id]
+
+    def _mark_dirty(self, unit, gameStateObj):
+        # Only enemies of the unit that moved can be blocked by it
+        x, y = unit.position
+        other_units = gameStateObj.get_unit_from_id(self.grids['movement'][x * self.gridHeight + y])
+        self.dirty_units |= {other_unit.id for other_unit in other_units if not gameStateObj.compare_teams(unit.team, other_unit.team)}
 
     def leave(self, unit, gameStateObj):
         if unit.team.startswith('enemy'):
             self._remove_unit(unit, gameStateObj)
         # Update ranges of other units that might be affected by my leaving
         if unit.position:
-            x, y = unit.position
-            other_units = gameStateObj.get_unit_from_id(self.grids['movement'][x * self.gridHeight + y])
-            # other_units = set()
-            # for key, grid in self.grids.items():
-            # What other units were affecting that position -- only enemies can affect position
-            #    other_units |= gameStateObj.get_unit_from_id(grid[x * self.gridHeight + y])
-            other_units = {other_unit for other_unit in other_units if not gameStateObj.compare_teams(unit.team, other_unit.team)} 
-            for other_unit in other_units:
-                self._remove_unit(other_unit, gameStateObj)
-            for other_unit in other_units:
-                if other_unit.position:
-                    self._add_unit(other_unit, gameStateObj)
+            self._mark_dirty(unit, gameStateObj)
 
     def arrive(self, unit, gameStateObj):
         if unit.position:
             if unit.team.startswith('enemy'):
                 self._add_unit(unit, gameStateObj)
-
             # Update ranges of other units that might be affected by my arrival
-            x, y = unit.position
-            other_units = gameStateObj.get_unit_from_id(self.grids['movement'][x * self.gridHeight + y])
-            # other_units = set()
-            # for key, grid in self.grids.items():
-            # What other units were affecting that position -- only enemies can affect position
-            #    other_units |= gameStateObj.get_unit_from_id(grid[x * self.gridHeight + y])
-            other_units = {other_unit for other_unit in other_units if not gameStateObj.compare_teams(unit.team, other_unit.team)} 
-            # print([(other_unit.name, other_unit.position, other_unit.event_id, other_unit.klass, x, y) for other_unit in other_units])
-            for other_unit in other_units:
-                self._remove_unit(other_unit, gameStateObj)
-            for other_unit in other_units:
-                if other_unit.position:
-                    self._add_unit(other_unit, gameStateObj)
+            self._mark_dirty(unit, gameStateObj)
+
+    # Called once a frame, before anything reads the grids
+    # Recomputes every unit whose frontier was touched since the last update in one batch
+    def update(self, gameStateObj):
+        if not self.dirty_units:
+            return
+        dirty_units = gameStateObj.get_unit_from_id(self.dirty_units)
+        logger.debug('Boundary Manager recomputing %s units', len(dirty_units))
+        for unit in dirty_units:
+            self._remove_unit(unit, gameStateObj)
+        for unit in dirty_units:
+            if unit.position and unit.team.startswith('enemy'):
+                self._add_unit(unit, gameStateObj)
+        self.dirty_units.clear()
 
     # Called when map changes
     def reset(self, gameStateObj):
         self.clear()
-        for unit in gameStateObj.allunits:
-            if unit.position and unit.team.startswith('enemy'):
-                self._add_unit(unit, gameStateObj)
+        for kind in self.dictionaries:
+            self.dictionaries[kind].clear()
+        self.dirty_units = {unit.id for unit in gameStateObj.allunits if unit.position and unit.team.startswith('enemy')}
 
     """
     # Deprecated
@@ -291,45 +308,58 @@ class BoundaryManager(object):
         self.all_on_flag = False
         self.surf = None
 
-    def draw(self, surf, size):
+    def draw(self, surf, size, camera=None):
         if self.draw_flag:
             if not self.surf:
                 self.surf = Engine.create_surface(size, transparent=True)
-                for grid_name in self.order:
-                    if grid_name == 'attack' and not self.displaying_units:
-                        continue
-                    elif grid_name == 'spell' and not self.displaying_units:
-                        continue
-                    elif grid_name == 'all_attack' and not self.all_on_flag:
-                        continue
-                    elif grid_name == 'all_spell' and not self.all_on_flag:
-                        continue
-                    if grid_name == 'all_attack' or grid_name == 'attack':
-                        grid = self.grids['attack']
-                    else:
-                        grid = self.grids['spell']
-                    for y in range(self.gridHeight):
-                        for x in range(self.gridWidth):
-                            cell = grid[x * self.gridHeight + y]
-                            if cell:
-                                display = any(u_id in self.displaying_units for u_id in cell) if self.displaying_units else False
-                                # print(x, y, cell, display)
-                                # If there's one above this
-                                if grid_name == 'all_attack' and display:
-                                    continue
-                                if grid_name == 'all_spell' and display:
-                                    continue
-                                if grid_name == 'attack' and not display:
-                                    continue
-                                if grid_name == 'spell' and not display:
-                                    continue
-                                image = self.get_image(grid, x, y, grid_name)
-                                topleft = x * GC.TILEWIDTH, y * GC.TILEHEIGHT
-                                self.surf.blit(image, topleft)
-                            # else:
-                            #    print('- '),
-                        # print('\n'),
-            surf.blit(self.surf, (0, 0))
+                need_repaint = {(x, y) for x in range(self.gridWidth) for y in range(self.gridHeight)}
+            else:
+                # A cell's edge pieces depend on its neighbours, so those need to be repainted too
+                need_repaint = set()
+                for (x, y) in self.dirty_cells:
+                    need_repaint.update(((x, y), (x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)))
+            for (x, y) in need_repaint:
+                if self.check_bounds((x, y)):
+                    self.draw_cell(x, y)
+            self.dirty_cells = set()
+            # Only blit the part of the boundary the camera can see
+            if camera:
+                left = max(0, int(camera.get_x()) * GC.TILEWIDTH)
+                top = max(0, int(camera.get_y()) * GC.TILEHEIGHT)
+                area = (left, top, (GC.TILEX + 1) * GC.TILEWIDTH, (GC.TILEY + 1) * GC.TILEHEIGHT)
+                surf.blit(self.surf, (left, top), area)
+            else:
+                surf.blit(self.surf, (0, 0))
+
+    def draw_cell(self, x, y):
+        topleft = x * GC.TILEWIDTH, y * GC.TILEHEIGHT
+        self.surf.fill((0, 0, 0, 0), (topleft[0], topleft[1], GC.TILEWIDTH, GC.TILEHEIGHT))
+        for grid_name in self.order:
+            if grid_name == 'attack' and not self.displaying_units:
+                continue
+            elif grid_name == 'spell' and not self.displaying_units:
+                continue
+            elif grid_name == 'all_attack' and not self.all_on_flag:
+                continue
+            elif grid_name == 'all_spell' and not self.all_on_flag:
+                continue
+            if grid_name == 'all_attack' or grid_name == 'attack':
+                grid = self.grids['attack']
+            else:
+                grid = self.grids['spell']
+            cell = grid[x * self.gridHeight + y]
+            if cell:
+                display = any(u_id in self.displaying_units for u_id in cell) if self.displaying_units else False
+                # If there's one above this
+                if grid_name == 'all_attack' and display:
+                    continue
+                if grid_name == 'all_spell' and display:
+                    continue
+                if grid_name == 'attack' and not display:
+                    continue
+                if grid_name == 'spell' and not display:
+                    continue
+                self.surf.blit(self.get_image(grid, x, y, grid_name), topleft)
 
     def get_image(self, grid, x, y, grid_name):
         top_pos = (x, y - 1)
@@ -348,7 +378,7 @@ class BoundaryManager(object):
             bottom = any(u_id in self.displaying_units for u_id in grid[x * self.gridHeight + y + 1]) if self.check_bounds(bottom_pos) else False
         index = top*8 + left*4 + right*2 + bottom # Binary logic to get correct index
         # print(str(index) + ' '),
-        return Engine.subsurface(self.types[grid_name], (index*GC.TILEWIDTH, 0, GC.TILEWIDTH, GC.TILEHEIGHT))
+        return self.atlas[grid_name][index]
 
     def print_grid(self, grid_name):
         for y in range(self.gridHeight):
@@ -360,6 +390,74 @@ class BoundaryManager(object):
                     print('- '),
             print('\n'),
 
+# === UNIT INDEX ================================================
+class UnitIndex(object):
+    """
+    Finds units in gameStateObj.allunits by id, name or position without scanning the list.
+    Units are added and removed through gameStateObj.add_unit and gameStateObj.remove_unit,
+    and UnitObject.position reports every move here
+    """
+    def __init__(self):
+        self.ids = {}
+        self.names = {} # Key: name, Value: list of units with that name
+        self.positions = {} # Key: position, Value: list of units at that position
+        # Support graph to tell when units move, so it can keep its bonuses current
+        self.support = None
+
+    def rebuild(self, units):
+        for unit in self.ids.values():
+            unit.unit_index = None
+        self.ids.clear()
+        self.names.clear()
+        self.positions.clear()
+        for unit in units:
+            self.add(unit)
+
+    def add(self, unit):
+        unit.unit_index = self
+        self.ids[unit.id] = unit
+        self.names.setdefault(unit.name, []).append(unit)
+        if unit.position:
+            self.positions.setdefault(unit.position, []).append(unit)
+        if self.support:
+            self.support.invalidate_bonuses(unit.id)
+
+    def remove(self, unit):
+        unit.unit_index = None
+        del self.ids[unit.id]
+        self._discard(self.names, unit.name, unit)
+        if unit.position:
+            self._discard(self.positions, unit.position, unit)
+        if self.support:
+            self.support.invalidate_bonuses(unit.id)
+
+    def move(self, unit, old_pos, new_pos):
+        if old_pos:
+            self._discard(self.positions, old_pos, unit)
+        if new_pos:
+            self.positions.setdefault(new_pos, []).append(unit)
+        if self.support:
+            self.support.invalidate_bonuses(unit.id)
+
+    def _discard(self, index, key, unit):
+        units = index[key]
+        units.remove(unit)
+        if not units:
+            del index[key]
+
+    def check(self, allunits):
+        # Debug consistency checker -- compares the index against the list it indexes
+        assert len(self.ids) == len(allunits), 'Unit index has %s units, allunits has %s' % (len(self.ids), len(allunits))
+        for unit in allunits:
+            assert unit.unit_index is self, '%s %s is not attached to the unit index' % (unit.id, unit.name)
+            assert self.ids.get(unit.id) is unit, '%s %s is not indexed by id' % (unit.id, unit.name)
+            assert unit in self.names.get(unit.name, []), '%s %s is not indexed by name' % (unit.id, unit.name)
+            if unit.position:
+                assert unit in self.positions.get(unit.position, []), '%s %s is not indexed at %s' % (unit.id, unit.name, unit.position)
+        assert sum(len(units) for units in self.names.values()) == len(allunits), 'Unit index has stale names'
+        assert sum(len(units) for units in self.positions.values()) == len([unit for unit in allunits if unit.position]), \
+            'Unit index has stale positions'
+
 # === GENERIC ANIMATION OBJECT ===================================
 # for miss and no damage animations
 class Animation(object):
@@ -922,7 +1020,7 @@ class Objective(object):
         to_evaluate = re.findall(r'\{[^}]*\}', text)
         evaluated = []
         for evaluate in to_evaluate:
-            evaluated.append(str(eval(evaluate[1:-1])))
+            evaluated.append(str(Utility.evaluate(evaluate[1:-1], globals(), locals())))
         for index in range(len(to_evaluate)):
             text = text.replace(to_evaluate[index], evaluated[index])
         return text
@@ -1025,6 +1123,12 @@ class LevelStatistic(object):
                 records[unit.name] = unit.records
         return records
 
+    def snapshot(self):
+        # Copy that does not share the units' live records
+        stat = copy.copy(self)
+        stat.stats = {name: dict(record) for name, record in self.stats.items()}
+        return stat
+
     @staticmethod
     def formula(record):
         return record['kills']*cf.CONSTANTS['kill_worth'] + record['damage'] + record['healing']
@@ -141,7 +141,7 @@ class Dialogue_Scene(object):
         # === CONDITIONALS PARSING
         if line[0] == 'if':
             if not self.if_stack or self.if_stack[-1]:
-                truth = eval(line[1])
+                truth = Utility.evaluate(line[1], globals(), locals())
                 self.if_stack.append(truth)
                 self.parse_stack.append(truth) # Whether we've encountered a truth this level
             else:
@@ -154,7 +154,7 @@ class Dialogue_Scene(object):
                 return # Impossible. Must have at least parsed an if before hitting an elif
             # If we haven't encountered a truth yet
             if not self.parse_stack[-1]: # if not self.if_stack[-1] and (len(self.if_stack) == 1 or all(t_value for t_value in self.if_stack[:-1])):
-                truth = eval(line[1])
+                truth = Utility.evaluate(line[1], globals(), locals())
                 self.if_stack[-1] = truth
                 self.parse_stack[-1] = truth
             else:
@@ -493,7 +493,7 @@ class Dialogue_Scene(object):
         elif line[0] == 'create_unit':
             # Read input
             which_unit = line[1]
-            level = str(eval(line[2]))
+            level = str(Utility.evaluate(line[2], globals(), locals()))
             to_which_position = line[3] if len(line) > 3 else None
             transition = line[4] if (len(line) > 4 and line[4]) else 'fade'
             placement = line[5] if (len(line) > 5 and line[5]) else 'give_up'
@@ -749,11 +749,11 @@ class Dialogue_Scene(object):
         # Clear command list
         elif line[0] == 'clear_command_list':
             if len(line) > 1:
-                gameStateObj.map.command_list = [command for command in gameStateObj.map.command_list if command[0] != line[1]]
+                gameStateObj.map.filter_commands(lambda command: command[0] != line[1])
             else:
-                gameStateObj.map.command_list = []
+                gameStateObj.map.filter_commands(lambda command: False)
         elif line[0] == 'clear_command_list_except':
-            gameStateObj.map.command_list = [command for command in gameStateObj.map.command_list if command[0] == line[1]]
+            gameStateObj.map.filter_commands(lambda command: command[0] == line[1])
 
         # === CLEANUP
         elif line[0] == 'arrange_formation':
@@ -805,23 +805,23 @@ class Dialogue_Scene(object):
         # should be remembered for map
         elif line[0] == 'set_level_constant':
             if len(line) > 2:
-                gameStateObj.level_constants[line[1]] = int(eval(line[2]))
+                gameStateObj.level_constants[line[1]] = int(Utility.evaluate(line[2], globals(), locals()))
             else:
                 gameStateObj.level_constants[line[1]] = 1
         elif line[0] == 'inc_level_constant':
             if len(line) > 2:
-                gameStateObj.level_constants[line[1]] += int(eval(line[2]))
+                gameStateObj.level_constants[line[1]] += int(Utility.evaluate(line[2], globals(), locals()))
             else:
                 gameStateObj.level_constants[line[1]] += 1
         # should be remembered for all game
         elif line[0] == 'set_game_constant':
             if len(line) > 2:
-                gameStateObj.game_constants[line[1]] = int(eval(line[2]))
+                gameStateObj.game_constants[line[1]] = int(Utility.evaluate(line[2], globals(), locals()))
             else:
                 gameStateObj.game_constants[line[1]] = 1
         elif line[0] == 'inc_game_constant':
             if len(line) > 2:
-                gameStateObj.game_constants[line[1]] += int(eval(line[2]))
+                gameStateObj.game_constants[line[1]] += int(Utility.evaluate(line[2], globals(), locals()))
             else:
                 gameStateObj.game_constants[line[1]] += 1
         elif line[0] == 'unlock_lore':
@@ -894,6 +894,7 @@ class Dialogue_Scene(object):
             edge = gameStateObj.support.get_edge(self.unit.id, self.unit2.id)
             if edge and gameStateObj.support.can_support(self.unit.id, self.unit2.id) and edge.support_level == self.name:  # Only increment if we haven't read this before (IE we can support)
                 edge.increment_support_level()
+                gameStateObj.support.invalidate_bonuses(self.unit.id)
         elif line[0] == 'choice':
             name = line[1]
             header = line[2]
@@ -950,7 +951,7 @@ class Dialogue_Scene(object):
                     command = ''.join(command)
                     if command.startswith('eval:'):
                         to_eval = command[5:]
-                        result = str(eval(to_eval))
+                        result = str(Utility.evaluate(to_eval, globals(), locals()))
                         line[2] = line[2][:i] + result + line[2][last_index+1:]
                     add = False
                     command = []
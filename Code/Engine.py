@@ -24,6 +24,7 @@ BLEND_RGB_SUB = pygame.BLEND_RGB_SUB
 BLEND_RGB_MULT = pygame.BLEND_RGB_MULT
 BLEND_RGBA_ADD = pygame.BLEND_RGBA_ADD
 BLEND_RGBA_MULT = pygame.BLEND_RGBA_MULT
+SRCALPHA = pygame.SRCALPHA
 
 # === INITIALIZING FUNCTIONS =================================================
 def init():
@@ -119,6 +120,9 @@ def get_delta():
 # === DRAW STUFF =============================================================
 def blit(dest, source, pos=(0, 0), mask=None, blend=0):
     dest.blit(source, pos, mask, blend)
+
+def set_clip(surf, rect=None):
+    surf.set_clip(rect)
         
 def create_surface(size, transparent=False, convert=False):
     if transparent:
@@ -138,6 +142,9 @@ def copy_surface(surf):
 def save_surface(surf, fn):
     pygame.image.save(surf, fn)
 
+def image_tostring(surf, fmt):
+    return pygame.image.tostring(surf, fmt)
+
 # assumes pygame surface
 def subsurface(surf, rect):
     x, y, width, height = rect
@@ -151,6 +158,22 @@ def image_load(fp, convert=False, convert_alpha=False):
         image = image.convert_alpha()
     return image
 
+def get_display_format():
+    surf = pygame.display.get_surface()
+    return (surf.get_bitsize(), surf.get_masks()) if surf else None
+
+def surface_to_buffer(surf):
+    # Everything needed to rebuild surf exactly, pixels in its own format
+    return surf.get_size(), surf.get_flags() & pygame.SRCALPHA, surf.get_bitsize(), surf.get_masks(), \
+        surf.get_pitch(), surf.get_buffer().raw
+
+def surface_from_buffer(size, flags, bitsize, masks, pitch, raw):
+    surf = pygame.Surface(size, flags, bitsize, masks)
+    if surf.get_pitch() != pitch:  # Rows are laid out differently than when the buffer was made
+        return None
+    surf.get_buffer().write(raw, 0)
+    return surf
+
 def fill(surf, color, mask=None, blend=0):
     surf.fill(color, mask, blend)
 
@@ -235,6 +258,15 @@ class BaseSound():
 def create_sound(fp):
     return pygame.mixer.Sound(fp)
 
+def get_mixer_format():
+    return pygame.mixer.get_init()
+
+def sound_to_buffer(sound):
+    return sound.get_raw()
+
+def sound_from_buffer(raw):
+    return pygame.mixer.Sound(buffer=raw)
+
 # === MUSIC STUFF =====================================================
 class Song(object):
     def __init__(self, song, num_plays=-1, time=0):
@@ -7,16 +7,19 @@ try:
     import GlobalConstants as GC
     import configuration as cf
     import CustomObjects, StateMachine, AStar, Support, Engine, Dialogue, Cursor
-    import StatusObject, UnitObject, SaveLoad, InputManager, ItemMethods
+    import StatusObject, UnitObject, SaveLoad, InputManager, ItemMethods, Utility, bmpfont, BattleAnimation
 except ImportError:
     from . import GlobalConstants as GC
     from . import configuration as cf
     from . import CustomObjects, StateMachine, AStar, Support, Engine, Dialogue, Cursor
-    from . import StatusObject, UnitObject, SaveLoad, InputManager, ItemMethods
+    from . import StatusObject, UnitObject, SaveLoad, InputManager, ItemMethods, Utility, bmpfont, BattleAnimation
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Whether every unit lookup first checks the unit index against allunits. Slow, for tests
+CHECK_UNIT_INDEX = False
+
 class GameStateObj(object):
     # needed for main menu
     def __init__(self):
@@ -64,6 +67,7 @@ class GameStateObj(object):
     def build_new(self):
         logger.info("Build New")
         self.allunits = []
+        self.unit_index = CustomObjects.UnitIndex()
         self.factions = {}
         self.allreinforcements = {}
         self.prefabs = []
@@ -76,6 +80,7 @@ class GameStateObj(object):
         self.convoy = []
         self.play_time = 0
         self.support = Support.Support_Graph('Data/support_nodes.txt', 'Data/support_edges.txt') if cf.CONSTANTS['support'] else None
+        self.unit_index.support = self.support
         self.unlocked_lore = []
         self.statistics = []
         self.market_items = set()
@@ -120,6 +125,8 @@ class GameStateObj(object):
         logger.info("Load")
         # Rebuild gameStateObj
         self.allunits = [UnitObject.UnitObject(info) for info in load_info['allunits']]
+        self.unit_index = CustomObjects.UnitIndex()
+        self.unit_index.rebuild(self.allunits)
         self.factions = load_info['factions'] if 'factions' in load_info else (load_info['groups'] if 'groups' in load_info else {})
         self.allreinforcements = load_info['allreinforcements'] 
         self.prefabs = load_info['prefabs']
@@ -147,10 +154,7 @@ class GameStateObj(object):
         # Map
         self.map = SaveLoad.create_map('Data/Level' + str(self.game_constants['level']))
         if map_info:
-            self.map.replay_commands(map_info['command_list'], self.game_constants['level'])
-            self.map.command_list = map_info['command_list']
-            for position, current_hp in map_info['HP']:
-                self.map.tiles[position].set_hp(current_hp)
+            self.map.deserialize(map_info, self.game_constants['level'])
 
         # Statuses
         for index, info in enumerate(load_info['allunits']):
@@ -166,6 +170,7 @@ class GameStateObj(object):
             self.support.deserialize(support_dict)
         else:
             self.support = None
+        self.unit_index.support = self.support
 
         # Set up blitting surface
         if self.map:
@@ -256,26 +261,47 @@ class GameStateObj(object):
     def check_alive(self, name):
         return any(unit.name == name and not unit.dead for unit in self.allunits)
 
+    def add_unit(self, unit):
+        self.allunits.append(unit)
+        self.unit_index.add(unit)
+
+    def remove_unit(self, unit):
+        self.allunits.remove(unit)
+        self.unit_index.remove(unit)
+
     def get_unit_from_id(self, u_id):
+        if CHECK_UNIT_INDEX:
+            self.unit_index.check(self.allunits)
         if isinstance(u_id, set):
-            return {unit for unit in self.allunits if unit.id in u_id}
+            return {self.unit_index.ids[i] for i in u_id if i in self.unit_index.ids}
         else:
-            for unit in self.allunits:
-                if unit.id == u_id:
-                    return unit
+            return self.unit_index.ids.get(u_id)
 
     def get_unit_from_pos(self, pos):
+        if CHECK_UNIT_INDEX:
+            self.unit_index.check(self.allunits)
         if isinstance(pos, set):
-            return {unit for unit in self.allunits if unit.position in pos}
-        else:
+            return {unit for p in pos if p for unit in self.unit_index.positions.get(p, [])} | \
+                ({unit for unit in self.allunits if not unit.position} if None in pos else set())
+        units = self.unit_index.positions.get(pos) if pos else None
+        if units and len(units) == 1:
+            return units[0]
+        elif units or not pos:
+            # Several units stacked on one spot, or asking for units off the map -- first in allunits wins
             for unit in self.allunits:
                 if unit.position == pos:
                     return unit
 
     def get_unit_from_name(self, name):
+        if CHECK_UNIT_INDEX:
+            self.unit_index.check(self.allunits)
         if isinstance(name, set):
-            return {unit for unit in self.allunits if unit.name in name}
-        else:
+            return {unit for n in name for unit in self.unit_index.names.get(n, [])}
+        units = self.unit_index.names.get(name)
+        if units and len(units) == 1:
+            return units[0]
+        elif units:
+            # Several units share this name -- first in allunits wins
             for unit in self.allunits:
                 if unit.name == name:
                     return unit
@@ -340,9 +366,12 @@ class GameStateObj(object):
         for unit in self.allunits:
             unit.arrive(self, serializing=True)
             unit.place_on_map(self)
+        # Everything in to_save must be detached from the live game state,
+        # since it is pickled on the saving thread while the game keeps running
+        # Prefabs and triggers are never changed after the level is loaded, so they can be shared
         to_save = {'allunits': ser_units,
-                   'factions': self.factions,
-                   'allreinforcements': self.allreinforcements,
+                   'factions': dict(self.factions),
+                   'allreinforcements': dict(self.allreinforcements),
                    'prefabs': self.prefabs,
                    'triggers': self.triggers,
                    'map': self.map.serialize() if self.map else None,
@@ -352,15 +381,15 @@ class GameStateObj(object):
                    'objective': self.objective.serialize() if self.objective else None,
                    'phase_music': self.phase_music.serialize() if self.phase_music else None,
                    'support': self.support.serialize() if self.support else None,
-                   'game_constants': self.game_constants,
-                   'level_constants': self.level_constants,
-                   'unlocked_lore': self.unlocked_lore,
-                   'talk_options': self.talk_options,
-                   'base_conversations': self.base_conversations,
+                   'game_constants': Counter(self.game_constants),
+                   'level_constants': Counter(self.level_constants),
+                   'unlocked_lore': list(self.unlocked_lore),
+                   'talk_options': list(self.talk_options),
+                   'base_conversations': OrderedDict(self.base_conversations),
                    'state_list': self.stateMachine.serialize(),
-                   'statistics': self.statistics,
-                   'market_items': self.market_items,
-                   'mode': self.mode,
+                   'statistics': [stat.snapshot() for stat in self.statistics],
+                   'market_items': set(self.market_items),
+                   'mode': dict(self.mode),
                    'message': [message.serialize() for message in self.message],
                    'phase_info': (self.phase.current, self.phase.previous)}
         import time
@@ -386,6 +415,14 @@ class GameStateObj(object):
             item.loadSprites()
 
     def clean_up(self):
+        if self.map:
+            logger.debug('Movement range cache: %s', self.grid_manager.get_move_cache_stats())
+            logger.debug('Map pixels redrawn: %s', self.map.get_draw_stats())
+        logger.debug('Most expensive expressions: %s', Utility.get_expression_report())
+        logger.debug('Prototypes: %s', [ItemMethods.PROTOTYPES.get_stats(), StatusObject.PROTOTYPES.get_stats()])
+        logger.debug('Font string cache: %s', bmpfont.get_cache_stats())
+        logger.debug('Battle animations: %s', GC.ANIMDICT.get_stats())
+        logger.debug('Battle animation frames: %s', BattleAnimation.get_stats())
         # Units should leave (first, because clean_up removes position)
         for unit in self.allunits:
             unit.leave(self)
@@ -395,6 +432,7 @@ class GameStateObj(object):
 
         # Remove non player team units
         self.allunits = [unit for unit in self.allunits if unit.team == 'player' and not unit.generic_flag]
+        self.unit_index.rebuild(self.allunits)
 
         # Handle player death
         for unit in self.allunits:
@@ -134,7 +134,7 @@ class Solver(object):
                     result.def_movement = self.item.movement
         else:
             result.outcome = 1
-            result.def_damage = -int(eval(self.item.heal)) if self.item.heal else 0
+            result.def_damage = -int(Utility.evaluate(self.item.heal, globals(), locals())) if self.item.heal else 0
             if self.attacker is not defender and self.item.heal:
                 result.def_damage -= sum(status.caretaker for status in self.attacker.status_effects if status.caretaker)
             if self.item.movement:
@@ -161,7 +161,7 @@ class Solver(object):
             for status in self.attacker.status_effects:
                 if status.vampire and defender.currenthp - result.def_damage <= 0 and \
                    not any(status.miracle and (not status.count or status.count.count > 0) for status in defender.status_effects):
-                    result.atk_damage -= eval(status.vampire)
+                    result.atk_damage -= Utility.evaluate(status.vampire, globals(), locals())
         
         return result
 
@@ -204,7 +204,7 @@ class Solver(object):
             for status in self.defender.status_effects:
                 if status.vampire and self.attacker.currenthp - result.def_damage <= 0 and \
                         not any(status.miracle and (not status.count or status.count.count > 0) for status in self.attacker.status_effects):
-                    result.atk_damage -= eval(status.vampire)
+                    result.atk_damage -= Utility.evaluate(status.vampire, globals(), locals())
 
         return result
 
@@ -1766,7 +1766,7 @@ class MapCombat(Combat):
         # Summoning
         if result.summoning:
             result.summoning.sprite.set_transition('warp_in')
-            gameStateObj.allunits.append(result.summoning)
+            gameStateObj.add_unit(result.summoning)
 
     def begin_phase(self, gameStateObj):
         players = set()
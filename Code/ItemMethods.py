@@ -343,6 +343,136 @@ class SummonComponent(object):
         self.s_id = s_id
 
 # === ITEM PARSER ======================================================
+class ItemTemplate(object):
+    def __init__(self, i_id, item, components, aoe, weapontype, status, status_on_hold, status_on_equip, locked):
+        self.id = i_id
+        self.item = item # The item's entry in GC.ITEMDATA
+        # List of (component name, factory, args)
+        # If factory is None, args is the component's value itself
+        self.components = components
+        self.aoe = aoe # (mode, number)
+        self.weapontype = weapontype
+        self.status = status
+        self.status_on_hold = status_on_hold
+        self.status_on_equip = status_on_equip
+        self.locked = locked
+
+    def create(self, droppable=False, event_combat=False):
+        my_components = {}
+        for component, factory, args in self.components:
+            if factory:
+                # Lists are copied so that no two items share one
+                my_components[component] = factory(*[list(arg) if isinstance(arg, list) else arg for arg in args])
+            else:
+                my_components[component] = args
+        item = self.item
+        return ItemObject(self.id, item['name'], item['spritetype'], item['spriteid'], my_components,
+                          item['value'], item['RNG'], item['desc'],
+                          AOEComponent(*self.aoe), self.weapontype,
+                          list(self.status), list(self.status_on_hold), list(self.status_on_equip),
+                          droppable=droppable, locked=self.locked, event_combat=event_combat)
+
+def create_extra_select(extra_select):
+    return [ExtraSelectComponent(*c) for c in extra_select]
+
+def parse_item_template(itemid):
+    try:
+        item = GC.ITEMDATA[itemid]
+    except KeyError as e:
+        print("Key Error %s. %s cannot be found in items.xml"%(e, itemid))
+        return None
+
+    components = item['components']
+    if components:
+        components = components.split(',')
+    else:
+        components = []
+
+    aoe = ('Normal', 0)
+    if 'weapon' in components or 'spell' in components:
+        weapontype = item['weapontype']
+        if weapontype == 'None':
+            weapontype = None
+    else:
+        weapontype = None
+
+    if 'locked' in components:
+        locked = True
+    else:
+        locked = False
+    status = []
+    status_on_hold = []
+    status_on_equip = []
+
+    my_components = []
+    for component in components:
+        if component == 'uses':
+            my_components.append((component, UsesComponent, (int(item['uses']),)))
+        elif component == 'c_uses':
+            my_components.append((component, CUsesComponent, (int(item['c_uses']),)))
+        elif component == 'weapon':
+            stats = [item['MT'], item['HIT'], item['LVL']]
+            my_components.append((component, WeaponComponent, (stats,)))
+        elif component == 'usable':
+            my_components.append((component, UsableComponent, ()))
+        elif component == 'spell':
+            my_components.append((component, SpellComponent, (item['LVL'], item['targets'])))
+        elif component == 'extra_select':
+            extra_select = tuple(tuple(c.split(',')) for c in item['extra_select'].split(';'))
+            my_components.append((component, create_extra_select, (extra_select,)))
+            my_components.append(('extra_select_index', None, 0))
+            my_components.append(('extra_select_targets', list, ([],)))
+        elif component == 'status':
+            status.extend(item['status'].split(','))
+        elif component == 'status_on_hold':
+            status_on_hold.extend(item['status_on_hold'].split(','))
+        elif component == 'status_on_equip':
+            status_on_equip.extend(item['status_on_equip'].split(','))
+        elif component == 'effective':
+            try:
+                effective_against, bonus = item['effective'].split(';')
+                effective_against = effective_against.split(',')
+                my_components.append((component, EffectiveComponent, (effective_against, int(bonus))))
+            except:
+                continue
+        elif component == 'permanent_stat_increase':
+            stat_increase = SaveLoad.intify_comma_list(item['stat_increase'])
+            my_components.append((component, PermanentStatIncreaseComponent, (stat_increase,)))
+        elif component == 'promotion':
+            legal_classes = item['promotion'].split(',')
+            my_components.append((component, list, (legal_classes,)))
+        elif component == 'aoe':
+            info_line = item['aoe'].split(',')
+            aoe = (info_line[0], int(info_line[1]))
+        # Affects map animation
+        elif component == 'map_hit_color':
+            map_hit_color = tuple(int(c) for c in item['map_hit_color'].split(','))
+            assert len(map_hit_color) == 3 # No translucency allowed right now
+            my_components.append((component, None, map_hit_color))
+        elif component in ('damage', 'hit', 'weight', 'exp', 'crit', 'wexp_increase', 'wexp', 'extra_tile_damage'):
+            if component in item:
+                my_components.append((component, None, int(item[component])))
+        elif component in ('movement', 'self_movement'):
+            mode, magnitude = item[component].split(',')
+            my_components.append((component, MovementComponent, (mode, magnitude)))
+        elif component == 'summon':
+            klass = item['summon_klass']
+            items = item['summon_items']
+            name = item['summon_name']
+            desc = item['summon_desc']
+            ai = item['summon_ai']
+            s_id = item['summon_s_id']
+            my_components.append((component, SummonComponent, (klass, items, name, desc, ai, s_id)))
+        elif component in item:
+            my_components.append((component, None, item[component]))
+        else:
+            my_components.append((component, None, True))
+
+    return ItemTemplate(itemid, item, my_components, aoe, weapontype, status, status_on_hold, status_on_equip, locked)
+
+# Each item in items.xml is only parsed the first time it is needed
+PROTOTYPES = Utility.PrototypeRegistry('item', parse_item_template)
+
 # Takes a string of item ids, as well as the database of item data, and outputs a list of items.
 def itemparser(itemstring):
     Items = []
@@ -357,107 +487,9 @@ def itemparser(itemstring):
             elif itemid.startswith('e'):
                 itemid = itemid[1:]
                 event_combat = True
-            try:
-                item = GC.ITEMDATA[itemid]
-            except KeyError as e:
-                print("Key Error %s. %s cannot be found in items.xml"%(e, itemid))
-                continue
-
-            components = item['components']
-            if components:
-                components = components.split(',')
-            else:
-                components = []
-
-            aoe = AOEComponent('Normal', 0)
-            if 'weapon' in components or 'spell' in components:
-                weapontype = item['weapontype']
-                if weapontype == 'None':
-                    weapontype = None
-            else:
-                weapontype = None
-
-            if 'locked' in components:
-                locked = True
-            else:
-                locked = False
-            status = []
-            status_on_hold = []
-            status_on_equip = []
-
-            my_components = {}
-            for component in components:
-                if component == 'uses':
-                    my_components['uses'] = UsesComponent(int(item['uses']))
-                elif component == 'c_uses':
-                    my_components['c_uses'] = CUsesComponent(int(item['c_uses']))
-                elif component == 'weapon':
-                    stats = [item['MT'], item['HIT'], item['LVL']]
-                    my_components['weapon'] = WeaponComponent(stats)
-                elif component == 'usable':
-                    my_components['usable'] = UsableComponent()
-                elif component == 'spell':
-                    my_components['spell'] = SpellComponent(item['LVL'], item['targets'])
-                elif component == 'extra_select':
-                    my_components['extra_select'] = [ExtraSelectComponent(*c.split(',')) for c in item['extra_select'].split(';')]
-                    my_components['extra_select_index'] = 0
-                    my_components['extra_select_targets'] = []
-                elif component == 'status':
-                    statusid = item['status'].split(',')
-                    for s_id in statusid:
-                        status.append(s_id)
-                elif component == 'status_on_hold':
-                    statusid = item['status_on_hold'].split(',')
-                    for s_id in statusid:
-                        status_on_hold.append(s_id)
-                elif component == 'status_on_equip':
-                    statusid = item['status_on_equip'].split(',')
-                    for s_id in statusid:
-                        status_on_equip.append(s_id)
-                elif component == 'effective':
-                    try:
-                        effective_against, bonus = item['effective'].split(';')
-                        effective_against = effective_against.split(',')
-                        my_components['effective'] = EffectiveComponent(effective_against, int(bonus))
-                    except:
-                        continue
-                elif component == 'permanent_stat_increase':
-                    stat_increase = SaveLoad.intify_comma_list(item['stat_increase'])
-                    my_components['permanent_stat_increase'] = PermanentStatIncreaseComponent(stat_increase)
-                elif component == 'promotion':
-                    legal_classes = item['promotion'].split(',')
-                    my_components['promotion'] = legal_classes
-                elif component == 'aoe':
-                    info_line = item['aoe'].split(',')
-                    aoe = AOEComponent(info_line[0], int(info_line[1]))
-                # Affects map animation
-                elif component == 'map_hit_color':
-                    my_components['map_hit_color'] = tuple(int(c) for c in item['map_hit_color'].split(','))
-                    assert len(my_components['map_hit_color']) == 3 # No translucency allowed right now
-                elif component in ('damage', 'hit', 'weight', 'exp', 'crit', 'wexp_increase', 'wexp', 'extra_tile_damage'):
-                    if component in item:
-                        my_components[component] = int(item[component])
-                elif component in ('movement', 'self_movement'):
-                    mode, magnitude = item[component].split(',')
-                    my_components[component] = MovementComponent(mode, magnitude)
-                elif component == 'summon':
-                    klass = item['summon_klass']
-                    items = item['summon_items']
-                    name = item['summon_name']
-                    desc = item['summon_desc']
-                    ai = item['summon_ai']
-                    s_id = item['summon_s_id']
-                    my_components['summon'] = SummonComponent(klass, items, name, desc, ai, s_id)
-                elif component in item:
-                    my_components[component] = item[component]
-                else:
-                    my_components[component] = True
-            currentItem = ItemObject(itemid, item['name'], item['spritetype'], item['spriteid'], my_components,
-                                     item['value'], item['RNG'], item['desc'],
-                                     aoe, weapontype, status, status_on_hold, status_on_equip,
-                                     droppable=droppable, locked=locked, event_combat=event_combat)
-
-            Items.append(currentItem)          
+            item = PROTOTYPES.create(itemid, droppable, event_combat)
+            if item is not None:
+                Items.append(item)
     return Items
 
 def deserialize(item_dict):
@@ -1,6 +1,6 @@
 # Saving and Loading Functions
 # === IMPORT MODULES =============================================
-import copy, threading, shutil
+import threading, shutil, timeit
 try:
     import cPickle as pickle
 except ImportError:
@@ -346,7 +346,7 @@ def add_unit_from_legend(legend, allunits, reinforceUnits, metaDataObj, gameStat
             # handle having a status that gives stats['HP']
             cur_unit.set_hp(int(cur_unit.stats['HP']))
 
-            allunits.append(cur_unit)
+            gameStateObj.add_unit(cur_unit)
             return cur_unit
 
 def create_unit(unitLine, allunits, factions, reinforceUnits, metaDataObj, gameStateObj):
@@ -409,7 +409,7 @@ def create_unit(unitLine, allunits, factions, reinforceUnits, metaDataObj, gameS
         for status in statuses:
             StatusObject.HandleStatusAddition(status, cur_unit, gameStateObj)
 
-    allunits.append(cur_unit)
+    gameStateObj.add_unit(cur_unit)
     return cur_unit
 
 def create_summon(summon_info, summoner, position, metaDataObj, gameStateObj):
@@ -456,15 +456,15 @@ def get_unit_info(class_dict, team, klass, level, item_line, mode, game_constant
     if team == 'player' or team == 'other': # Modify stats
         mode_bases = mode['player_bases']
         mode_growths = mode['player_growths']
-        hidden_levels = int(eval(mode['autolevel_players']))
+        hidden_levels = int(Utility.evaluate(mode['autolevel_players'], globals(), locals()))
         explicit_levels = 0
     else:
         mode_bases = mode['enemy_bases']
         mode_growths = mode['enemy_growths']
         if 'extra_enemy_growths' in game_constants:
             mode_growths = [g + int(game_constants['extra_enemy_growths']) for g in mode_growths]
-        hidden_levels = int(eval(mode['autolevel_enemies']))
-        explicit_levels = int(eval(mode['truelevel_enemies']))
+        hidden_levels = int(Utility.evaluate(mode['autolevel_enemies'], globals(), locals()))
+        explicit_levels = int(Utility.evaluate(mode['truelevel_enemies'], globals(), locals()))
 
     level += explicit_levels
 
@@ -661,10 +661,16 @@ def save_io(to_save, to_save_meta, old_slot, slot=None, hard_loc=None):
     
     logger.info('Saving to %s', save_loc)
 
+    time1 = timeit.default_timer()
+    save_data = pickle.dumps(to_save)
+    meta_data = pickle.dumps(to_save_meta)
+    time2 = timeit.default_timer()
     with open(save_loc, 'wb') as suspendFile:
-        pickle.dump(to_save, suspendFile)
+        suspendFile.write(save_data)
     with open(meta_loc, 'wb') as metaFile:
-        pickle.dump(to_save_meta, metaFile)
+        metaFile.write(meta_data)
+    time3 = timeit.default_timer()
+    logger.debug('Save encode: %.1f ms (%d bytes), write: %.1f ms', (time2 - time1)*1000, len(save_data), (time3 - time2)*1000)
 
     # For restart
     if not hard_loc: # Hard loc is used for suspend, which doesn't need a restart
@@ -697,11 +703,15 @@ def suspendGame(gameStateObj, kind, slot=None, hard_loc=None):
         gameStateObj.save_slot = slot
 
     # gameStateObj.removeSprites()
+    # gameStateObj.save() returns data already detached from the game state,
+    # so it can be handed straight to the saving thread without a deep copy
+    time1 = timeit.default_timer()
     to_save, to_save_meta = gameStateObj.save()
     to_save_meta['kind'] = kind
     to_save_meta['name'] = read_overview_file('Data/Level' + str(gameStateObj.game_constants['level']) + '/overview.txt')['name']
+    logger.debug('Save snapshot: %.1f ms', (timeit.default_timer() - time1)*1000)
 
-    gameStateObj.saving_thread = threading.Thread(target=save_io, args=(copy.deepcopy(to_save), copy.deepcopy(to_save_meta), old_slot, slot, hard_loc))
+    gameStateObj.saving_thread = threading.Thread(target=save_io, args=(to_save, to_save_meta, old_slot, slot, hard_loc))
     gameStateObj.saving_thread.start()
 
     # gameStateObj.loadSprites()
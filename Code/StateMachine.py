@@ -223,7 +223,7 @@ class StateMachine(object):
         self.state[-1].begin(gameStateObj, metaDataObj)
 
     def serialize(self):
-        return [state.name for state in self.state], self.temp_state
+        return [state.name for state in self.state], list(self.temp_state)
 
 # State
 class State(object):
@@ -266,8 +266,8 @@ class State(object):
 
     def draw(self, gameStateObj, metaDataObj):
         if self.show_map:
+            gameStateObj.set_camera_limits()  # Before drawing, since the map only draws what the camera can see
             mapSurf = drawMap(gameStateObj)  # Creates mapSurf
-            gameStateObj.set_camera_limits()
             rect = (gameStateObj.cameraOffset.get_x()*GC.TILEWIDTH, gameStateObj.cameraOffset.get_y()*GC.TILEHEIGHT, GC.WINWIDTH, GC.WINHEIGHT)
             mapSurf = Engine.subsurface(mapSurf, rect)
             # Draw animations
@@ -284,6 +284,11 @@ class State(object):
                 gameStateObj.childMenu.draw(mapSurf, gameStateObj)
         return mapSurf
 
+def plan_next_ai(gameStateObj):
+    # While the AI phase waits on a unit moving, fighting or dying, plan ahead for the next unit
+    if gameStateObj.ai_unit_list and gameStateObj.ai_unit_list[-1].position and gameStateObj.stateMachine.inList('ai'):
+        gameStateObj.ai_unit_list[-1].ai.think(gameStateObj, speculative=True)
+
 def wizard_mode(eventList, gameStateObj):
     for event in eventList:
         if event.type == Engine.KEYUP:
@@ -1892,6 +1897,9 @@ class AIState(State):
                 gameStateObj.stateMachine.changeState('turn_change')
                 return 'repeat'
 
+        else:
+            plan_next_ai(gameStateObj)
+
 class DialogueState(State):
     def __init__(self, name='dialogue'):
         State.__init__(self, name)
@@ -2125,11 +2133,13 @@ class CombatState(State):
         if combatisover: # State changing is handled in combat's clean_up function
             gameStateObj.combatInstance = None
             # gameStateObj.stateMachine.back() NOT NECESSARY! DONE BY the COMBAT INSTANCES CLEANUP!
+        else:
+            plan_next_ai(gameStateObj)
 
     def draw(self, gameStateObj, metaDataObj):
         if gameStateObj.combatInstance and self.animation_combat:
-            mapSurf = self.drawCombat(gameStateObj) # Creates mapSurf
             gameStateObj.set_camera_limits()
+            mapSurf = self.drawCombat(gameStateObj) # Creates mapSurf
             rect = (gameStateObj.cameraOffset.get_x()*GC.TILEWIDTH, gameStateObj.cameraOffset.get_y()*GC.TILEHEIGHT, GC.WINWIDTH, GC.WINHEIGHT)
             mapSurf = Engine.subsurface(mapSurf, rect)
             gameStateObj.combatInstance.draw(mapSurf, gameStateObj)
@@ -2150,7 +2160,8 @@ class CombatState(State):
         # Draw the tile sprites onto this surface
         gameStateObj.map.draw(mapSurf, gameStateObj)
         # Draw the boundary manager so it doesn't flicker on and off during animation
-        gameStateObj.boundary_manager.draw(mapSurf, (mapSurf.get_width(), mapSurf.get_height()))
+        gameStateObj.boundary_manager.update(gameStateObj)
+        gameStateObj.boundary_manager.draw(mapSurf, (mapSurf.get_width(), mapSurf.get_height()), gameStateObj.cameraOffset)
 
         # Reorder units so they are drawn in correct order, from top to bottom, so that units on bottom are blit over top
         # Only draw units that will be in the camera's field of view
@@ -2210,6 +2221,7 @@ class MovementState(State):
             if gameStateObj.stateMachine.getPreviousState() == 'dialogue' or gameStateObj.message: # The back should move us out of 'movement' state
                 gameStateObj.message[-1].current_state = "Processing" # Make sure that we can go back to processing
             return 'repeat'
+        plan_next_ai(gameStateObj)
 
 class PhaseChangeState(State):
     def begin(self, gameStateObj, metaDataObj):
@@ -3297,7 +3309,8 @@ def drawMap(gameStateObj):
     # mapSurf.fill(GC.COLORDICT['bg_color']) # Start with a blank color on the surface
     # Draw the tile sprites onto this surface
     gameStateObj.map.draw(mapSurf, gameStateObj)
-    gameStateObj.boundary_manager.draw(mapSurf, (mapSurf.get_width(), mapSurf.get_height()))
+    gameStateObj.boundary_manager.update(gameStateObj)
+    gameStateObj.boundary_manager.draw(mapSurf, (mapSurf.get_width(), mapSurf.get_height()), gameStateObj.cameraOffset)
     gameStateObj.highlight_manager.draw(mapSurf)
     for arrow in gameStateObj.allarrows:
         arrow.draw(mapSurf)
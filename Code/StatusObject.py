@@ -62,7 +62,7 @@ class StatusObject(object):
         serial_dict['upkeep_sc_count'] = self.upkeep_stat_change.count if self.upkeep_stat_change else None
         serial_dict['rhythm_sc_count'] = self.rhythm_stat_change.count if self.rhythm_stat_change else None
         serial_dict['charge'] = self.active.current_charge if self.active else None
-        serial_dict['children'] = self.children
+        serial_dict['children'] = list(self.children)
         serial_dict['parent_id'] = self.parent_id
         serial_dict['count'] = self.count.count if self.count else None
         if self.rescue:
@@ -591,118 +591,117 @@ def HandleStatusRemoval(status, unit, gameStateObj=None, clean_up=False):
 
 # === STATUS PARSER ======================================================
 # Takes one status id, as well as the database of status data, and outputs a status object.
-def statusparser(s_id):
-    for status in GC.STATUSDATA.getroot().findall('status'):
-        if status.find('id').text == s_id:
-            components = status.find('components').text
-            if components:
-                components = components.split(',')
-            else:
-                components = []
-            name = status.get('name')
-            desc = status.find('desc').text
-            image_index = status.find('image_index').text if status.find('image_index') is not None else None
-            if image_index:
-                image_index = tuple(int(num) for num in image_index.split(','))
+class StatusTemplate(object):
+    def __init__(self, s_id, name, desc, image_index, components):
+        self.id = s_id
+        self.name = name
+        self.desc = desc
+        self.image_index = image_index
+        # List of (component name, factory, args)
+        # If factory is None, args is the component's value itself
+        self.components = components
+
+    def create(self):
+        my_components = {}
+        for component, factory, args in self.components:
+            if factory:
+                # Lists are copied so that no two statuses share one
+                my_components[component] = factory(*[list(arg) if isinstance(arg, list) else arg for arg in args])
             else:
-                image_index = (0, 0)
-
-            my_components = {}
-            for component in components:
-                if component == 'time':
-                    time = status.find('time').text
-                    my_components['time'] = TimeComponent(time)
-                elif component == 'stat_change':
-                    my_components['stat_change'] = SaveLoad.intify_comma_list(status.find('stat_change').text)
-                    my_components['stat_change'].extend([0] * (cf.CONSTANTS['num_stats'] - len(my_components['stat_change'])))
-                elif component == 'growth_mod':
-                    my_components['growth_mod'] = SaveLoad.intify_comma_list(status.find('growth_mod').text)
-                    my_components['growth_mod'].extend([0] * (cf.CONSTANTS['num_stats'] - len(my_components['growth_mod'])))
-                elif component == 'upkeep_stat_change':
-                    stat_change = SaveLoad.intify_comma_list(status.find('upkeep_stat_change').text)
-                    stat_change.extend([0] * (cf.CONSTANTS['num_stats'] - len(stat_change)))
-                    my_components['upkeep_stat_change'] = UpkeepStatChangeComponent(stat_change)
-                elif component == 'endstep_stat_change':
-                    stat_change = SaveLoad.intify_comma_list(status.find('endstep_stat_change').text)
-                    stat_change.extend([0] * (cf.CONSTANTS['num_stats'] - len(stat_change)))
-                    my_components['endstep_stat_change'] = UpkeepStatChangeComponent(stat_change)
-                elif component == 'rhythm_stat_change':
-                    change, reset, init_count, limit = status.find('rhythm_stat_change').text.split(';')
-                    change = SaveLoad.intify_comma_list(change)
-                    change.extend([0] * (cf.CONSTANTS['num_stats'] - len(change)))
-                    reset = SaveLoad.intify_comma_list(reset)
-                    init_count = int(init_count)
-                    limit = int(limit)
-                    my_components['rhythm_stat_change'] = RhythmStatChangeComponent(change, reset, init_count, limit)
-                elif component == 'endstep_rhythm_stat_change':
-                    change, reset, init_count, limit = status.find('endstep_rhythm_stat_change').text.split(';')
-                    change = SaveLoad.intify_comma_list(change)
-                    change.extend([0] * (cf.CONSTANTS['num_stats'] - len(change)))
-                    reset = SaveLoad.intify_comma_list(reset)
-                    init_count = int(init_count)
-                    limit = int(limit)
-                    my_components['endstep_rhythm_stat_change'] = RhythmStatChangeComponent(change, reset, init_count, limit)
-                # Combat changes
-                elif component == 'conditional_avoid':
-                    avoid, conditional = status.find('conditional_avoid').text.split(';')
-                    my_components['conditional_avoid'] = ConditionalComponent('conditional_avoid', avoid, conditional)
-                elif component == 'conditional_hit':
-                    hit, conditional = status.find('conditional_hit').text.split(';')
-                    my_components['conditional_hit'] = ConditionalComponent('conditional_hit', hit, conditional)
-                elif component == 'conditional_mt':
-                    mt, conditional = status.find('conditional_mt').text.split(';')
-                    my_components['conditional_mt'] = ConditionalComponent('conditional_mt', mt, conditional)
-                elif component == 'conditional_resist':
-                    mt, conditional = status.find('conditional_resist').text.split(';')
-                    my_components['conditional_resist'] = ConditionalComponent('conditional_resist', mt, conditional)
-                elif component == 'weakness':
-                    damage_type, num = status.find('weakness').text.split(',')
-                    my_components['weakness'] = WeaknessComponent(damage_type, num)
-                # Others...
-                elif component == 'rescue':
-                    my_components['rescue'] = RescueComponent()
-                elif component == 'count':
-                    my_components['count'] = CountComponent(int(status.find('count').text))
-                elif component == 'caretaker':
-                    my_components['caretaker'] = int(status.find('caretaker').text)
-                elif component == 'remove_range':
-                    my_components['remove_range'] = int(status.find('remove_range').text)
-                elif component == 'hp_percentage':
-                    percentage = status.find('hp_percentage').text
-                    my_components['hp_percentage'] = HPPercentageComponent(percentage)
-                elif component == 'upkeep_animation':
-                    info_line = status.find('upkeep_animation').text
-                    split_line = info_line.split(',')
-                    my_components['upkeep_animation'] = UpkeepAnimationComponent(split_line[0], split_line[1], split_line[2], split_line[3])
-                elif component == 'always_animation':
-                    info_line = status.find('always_animation').text
-                    split_line = info_line.split(',')
-                    my_components['always_animation'] = AlwaysAnimationComponent(split_line[0], split_line[1], split_line[2], split_line[3])
-                elif component == 'unit_tint':
-                    info_line = status.find('unit_tint').text
-                    my_components['unit_tint'] = UnitTintComponent(info_line)
-                elif component == 'active':
-                    charge = int(status.find('active').text)
-                    my_components['active'] = getattr(ActiveSkill, s_id)(name, charge)
-                elif component == 'automatic':
-                    charge = int(status.find('automatic').text)
-                    status_id = status.find('status').text
-                    my_components['automatic'] = ActiveSkill.AutomaticSkill(name, charge, status_id)
-                elif component == 'passive':
-                    my_components['passive'] = getattr(ActiveSkill, s_id)(name)
-                elif component == 'aura':
-                    aura_range = int(status.find('range').text)
-                    child = status.find('child').text
-                    target = status.find('target').text
-                    my_components['aura'] = ActiveSkill.Aura(aura_range, target, child)
-                elif status.find(component) is not None and status.find(component).text:
-                    my_components[component] = status.find(component).text
-                else:
-                    my_components[component] = True
+                my_components[component] = args
+        return StatusObject(self.id, self.name, my_components, self.desc, self.image_index)
+
+status_elements = {} # Key: status id, Value: its element in status.xml
+
+def parse_stat_change(text):
+    stat_change = SaveLoad.intify_comma_list(text)
+    stat_change.extend([0] * (cf.CONSTANTS['num_stats'] - len(stat_change)))
+    return stat_change
+
+def parse_rhythm_stat_change(text):
+    change, reset, init_count, limit = text.split(';')
+    return parse_stat_change(change), SaveLoad.intify_comma_list(reset), int(init_count), int(limit)
+
+def parse_status_template(s_id):
+    if not status_elements:
+        for status in GC.STATUSDATA.getroot().findall('status'):
+            status_elements.setdefault(status.find('id').text, status)
+    status = status_elements.get(s_id)
+    if status is None:
+        return None
 
-            currentStatus = StatusObject(s_id, name, my_components, desc, image_index)
+    components = status.find('components').text
+    if components:
+        components = components.split(',')
+    else:
+        components = []
+    name = status.get('name')
+    desc = status.find('desc').text
+    image_index = status.find('image_index').text if status.find('image_index') is not None else None
+    if image_index:
+        image_index = tuple(int(num) for num in image_index.split(','))
+    else:
+        image_index = (0, 0)
+
+    my_components = []
+    for component in components:
+        if component == 'time':
+            my_components.append((component, TimeComponent, (status.find('time').text,)))
+        elif component in ('stat_change', 'growth_mod'):
+            my_components.append((component, list, (parse_stat_change(status.find(component).text),)))
+        elif component in ('upkeep_stat_change', 'endstep_stat_change'):
+            my_components.append((component, UpkeepStatChangeComponent, (parse_stat_change(status.find(component).text),)))
+        elif component in ('rhythm_stat_change', 'endstep_rhythm_stat_change'):
+            my_components.append((component, RhythmStatChangeComponent, parse_rhythm_stat_change(status.find(component).text)))
+        # Combat changes
+        elif component in ('conditional_avoid', 'conditional_hit', 'conditional_mt', 'conditional_resist'):
+            value, conditional = status.find(component).text.split(';')
+            my_components.append((component, ConditionalComponent, (component, value, conditional)))
+        elif component == 'weakness':
+            my_components.append((component, WeaknessComponent, tuple(status.find('weakness').text.split(','))))
+        # Others...
+        elif component == 'rescue':
+            my_components.append((component, RescueComponent, ()))
+        elif component == 'count':
+            my_components.append((component, CountComponent, (int(status.find('count').text),)))
+        elif component in ('caretaker', 'remove_range'):
+            my_components.append((component, None, int(status.find(component).text)))
+        elif component == 'hp_percentage':
+            my_components.append((component, HPPercentageComponent, (status.find('hp_percentage').text,)))
+        elif component == 'upkeep_animation':
+            split_line = status.find('upkeep_animation').text.split(',')
+            my_components.append((component, UpkeepAnimationComponent, tuple(split_line[:4])))
+        elif component == 'always_animation':
+            split_line = status.find('always_animation').text.split(',')
+            my_components.append((component, AlwaysAnimationComponent, tuple(split_line[:4])))
+        elif component == 'unit_tint':
+            my_components.append((component, UnitTintComponent, (status.find('unit_tint').text,)))
+        elif component == 'active':
+            charge = int(status.find('active').text)
+            my_components.append((component, getattr(ActiveSkill, s_id), (name, charge)))
+        elif component == 'automatic':
+            charge = int(status.find('automatic').text)
+            status_id = status.find('status').text
+            my_components.append((component, ActiveSkill.AutomaticSkill, (name, charge, status_id)))
+        elif component == 'passive':
+            my_components.append((component, getattr(ActiveSkill, s_id), (name,)))
+        elif component == 'aura':
+            aura_range = int(status.find('range').text)
+            child = status.find('child').text
+            target = status.find('target').text
+            my_components.append((component, ActiveSkill.Aura, (aura_range, target, child)))
+        elif status.find(component) is not None and status.find(component).text:
+            my_components.append((component, None, status.find(component).text))
+        else:
+            my_components.append((component, None, True))
 
-            return currentStatus
+    return StatusTemplate(s_id, name, desc, image_index, my_components)
+
+# Each status in status.xml is only parsed the first time it is needed
+PROTOTYPES = Utility.PrototypeRegistry('status', parse_status_template)
+
+def statusparser(s_id):
+    return PROTOTYPES.create(s_id)
 
 def deserialize(s_dict, unit, gameStateObj):
     status = statusparser(s_dict['id'])
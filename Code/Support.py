@@ -111,6 +111,8 @@ class Support_Edge(object):
 class Support_Graph(object):
     def __init__(self, node_fp, edge_fp):
         self.node_dict = {}
+        # Key: unit id, Value: tuple of that unit's total support bonuses where it stands now
+        self.bonus_cache = {}
         self.read_fp(node_fp, edge_fp)
 
     def read_fp(self, node_fp, edge_fp):
@@ -209,6 +211,29 @@ class Support_Graph(object):
         else:
             return [0] * 7
 
+    def get_support_bonuses(self, unit, gameStateObj):
+        # attack, defense, accuracy, avoid, crit, dodge, attackspeed
+        bonuses = self.bonus_cache.get(unit.id)
+        if bonuses is None:
+            bonuses = [0] * 7
+            if unit.position and unit.id in self.node_dict:
+                for other_id in self.node_dict[unit.id].adjacent:
+                    other = gameStateObj.get_unit_from_id(other_id)
+                    if other and other.position and unit.checkIfAlly(other):
+                        cur_bonus = self.get_affinity_bonuses(unit, other)
+                        bonuses = [a + b for a, b in zip(bonuses, cur_bonus)]
+            bonuses = tuple(bonuses)
+            self.bonus_cache[unit.id] = bonuses
+        return bonuses
+
+    def invalidate_bonuses(self, unit_id):
+        # Called whenever this unit moves, changes team, or one of its support levels changes
+        # Its partners' bonuses depend on where it is too
+        if unit_id in self.node_dict:
+            self.bonus_cache.pop(unit_id, None)
+            for other_id in self.node_dict[unit_id].adjacent:
+                self.bonus_cache.pop(other_id, None)
+
     def _end_general(self, unit, gameStateObj, gain):
         if unit.id not in self.node_dict:
             return
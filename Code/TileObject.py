@@ -1,4 +1,4 @@
-import os, math
+import os, math, array, struct
 from collections import OrderedDict
 
 # Custom imports
@@ -18,6 +18,77 @@ logger = logging.getLogger(__name__)
 
 DESTRUCTION_ANIM_TIME = 500
 
+# Whether tile data images are decoded from their whole pixel buffer at once instead of one get_at per pixel
+FAST_DECODE = True
+# Whether the map is drawn from a cached composite, redrawing only the parts that changed and can be seen
+CACHED_DRAW = True
+
+# === RECTS (x, y, width, height)
+def clip_rect(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    if x2 > x1 and y2 > y1:
+        return (x1, y1, x2 - x1, y2 - y1)
+    return None
+
+def union_rect(rects):
+    x1, y1 = min(r[0] for r in rects), min(r[1] for r in rects)
+    x2, y2 = max(r[0] + r[2] for r in rects), max(r[1] + r[3] for r in rects)
+    return (x1, y1, x2 - x1, y2 - y1)
+
+def subtract_rect(a, b):
+    # The parts of a outside of b, as up to four rects
+    overlap = clip_rect(a, b)
+    if not overlap:
+        return [a]
+    rects = []
+    if overlap[1] > a[1]: # Above
+        rects.append((a[0], a[1], a[2], overlap[1] - a[1]))
+    if overlap[1] + overlap[3] < a[1] + a[3]: # Below
+        rects.append((a[0], overlap[1] + overlap[3], a[2], a[1] + a[3] - overlap[1] - overlap[3]))
+    if overlap[0] > a[0]: # Left
+        rects.append((a[0], overlap[1], overlap[0] - a[0], overlap[3]))
+    if overlap[0] + overlap[2] < a[0] + a[2]: # Right
+        rects.append((overlap[0] + overlap[2], overlap[1], a[0] + a[2] - overlap[0] - overlap[2], overlap[3]))
+    return rects
+
+# === TERRAIN COLOR TABLE
+# Pixels are read as 'RGBX' and packed into native unsigned ints, so an (r, g, b) color
+# always packs to the same int as pack_color((r, g, b)) no matter the byte order
+def pack_color(color):
+    return struct.unpack('=I', struct.pack('BBBB', color[0], color[1], color[2], 0))[0]
+
+def unpack_color(key):
+    return struct.unpack('BBBB', struct.pack('=I', key))[:3]
+
+COLOR_MASK = pack_color((255, 255, 255))
+terrain_table = {} # Key: packed color, Value: TileObject arguments for the first terrain with that color
+
+def get_terrain_table():
+    if not terrain_table:
+        for terrain in GC.TERRAINDATA.getroot().findall('terrain'):
+            color = tuple(int(c) for c in terrain.find('color').text.split(','))
+            terrain_table.setdefault(pack_color(color), (terrain.get('name'), terrain.find('minimap').text, terrain.find('platform').text,
+                                                         terrain.find('mtype').text, [terrain.find('DEF').text, terrain.find('AVO').text]))
+    return terrain_table
+
+def create_tiles(color_key_obj, offset, map_ref):
+    # color_key_obj is a list of columns of packed colors, from build_color_key
+    # The X byte of each packed color is masked off here
+    table = get_terrain_table()
+    tiles = {}
+    for x, column in enumerate(color_key_obj):
+        for y, key in enumerate(column):
+            key &= COLOR_MASK
+            terrain = table.get(key)
+            pos = (offset[0] + x, offset[1] + y)
+            if terrain:
+                name, minimap, platform, mcost, stats = terrain
+                tiles[pos] = TileObject(name, minimap, platform, pos, mcost, stats, map_ref)
+            else: # Never found terrain...
+                logger.error('Terrain matching colorkey %s never found.', unpack_color(key))
+    return tiles
+
 # === GENERIC MAP OBJECT
 class MapObject(object):
     def __init__(self, mapfilename, tilefilename, levelfolder, weather=None):
@@ -25,7 +96,11 @@ class MapObject(object):
 
         self._tiles = {} # The mechanical information about the tile organized by position
         self.tile_sprites = {} # The sprite information about the tile organized by position
+        # (image name, position in image) for each changed tile sprite, kept after the sprite is drawn onto the map image
+        self.sprite_changes = {}
         self.command_list = [] # The commands that have been acted upon the map by scripts
+        self.snapshot = None # (number of commands, map state after those commands) -- saved so loading need not replay them
+        self.replay_matches = True # Whether the map is in the same state replaying the command list would leave it in
         self.escape_highlights = {}
         self.formation_highlights = {}
         self.origin = None
@@ -46,10 +121,20 @@ class MapObject(object):
         self.terrain_layers = []
         self.true_tiles = None # Tiles with layers
         self.true_opacity_map = None
+        self.los = Utility.LineOfSight(self) # Cached line of sight checks, reset along with the opacity map
 
         # Populate tiles
         self.populate_tiles(colorkey)
 
+        # Composite of the autotiles, map image, tile sprites and layers, in map pixels
+        self.composite = None
+        self.stale_rects = [] # Parts of the composite that must be redrawn before they are next seen
+        self.composite_autotile_frame = None
+        self.layer_states = [] # (layer, show, fade, number of sprites, sprite rects) as of the last composite draw
+        self.pixels_redrawn = 0 # Composite pixels redrawn in the last frame
+        self.total_pixels_redrawn = 0
+        self.frames_drawn = 0
+
         self.sprites_loaded_flag = False
         self.loadSprites()
 
@@ -59,6 +144,10 @@ class MapObject(object):
     def build_color_key(self, tiledata):
         width = tiledata.get_width()
         height = tiledata.get_height()
+        if FAST_DECODE:
+            # One packed color per pixel, row by row
+            pixels = array.array('I', Engine.image_tostring(tiledata, 'RGBX'))
+            return [pixels[x::width] for x in range(width)], width, height
         mapObj = [] # Array of map data
     
         # Convert to a mapObj
@@ -71,6 +160,11 @@ class MapObject(object):
         return mapObj, width, height
 
     def populate_tiles(self, colorKeyObj, offset=(0, 0)):
+        if FAST_DECODE:
+            self._tiles.update(create_tiles(colorKeyObj, offset, self))
+            self.true_tiles = None  # Reset tiles
+            self.true_opacity_map = None
+            return
         end_x = offset[0] + len(colorKeyObj)
         for x in range(offset[0], end_x):
             end_y = offset[1] + len(colorKeyObj[x - offset[0]])
@@ -108,6 +202,7 @@ class MapObject(object):
         for x in range(coord[0], coord[0] + size[0]):
             for y in range(coord[1], coord[1] + size[1]):
                 pos = (x - coord[0], y - coord[1])
+                self.sprite_changes[(x, y)] = (image_filename, pos)
                 self.tile_sprites[(x, y)] = TileSprite(None, (x, y), self)
                 if transition:
                     self.tile_sprites[(x, y)].new_image_name = image_filename
@@ -127,11 +222,36 @@ class MapObject(object):
         for position, tile_sprite in self.tile_sprites.items():
             tile_sprite.position = position
             tile_sprite.image_name = None
+        for position in self.sprite_changes:
+            self.sprite_changes[position] = (None, position)
 
     def draw(self, surf, gameStateObj):
-        if self.autotiles:
-            surf.blit(self.autotiles[self.autotile_frame], (0, 0))
-        surf.blit(self.map_image, (0, 0))
+        if CACHED_DRAW:
+            window = (int(gameStateObj.cameraOffset.get_x()*GC.TILEWIDTH), int(gameStateObj.cameraOffset.get_y()*GC.TILEHEIGHT),
+                      GC.WINWIDTH, GC.WINHEIGHT)
+            self.draw_composite(window)
+            surf.blit(self.composite, window[:2], window)
+        else:
+            self.draw_sprites(surf, (0, 0) + self.map_image.get_size())
+            self.pixels_redrawn = self.map_image.get_width() * self.map_image.get_height()
+            self.total_pixels_redrawn += self.pixels_redrawn
+            self.frames_drawn += 1
+
+        for pos, highlight in self.escape_highlights.items():
+            highlight.draw(surf, pos, gameStateObj.highlight_manager.updateIndex, 0)
+
+        if gameStateObj.stateMachine.getState() in ['prep_formation', 'prep_formation_select']:
+            for pos, highlight in self.formation_highlights.items():
+                highlight.draw(surf, pos, gameStateObj.highlight_manager.updateIndex, 0)
+
+    def draw_sprites(self, surf, clip):
+        # Tile sprites and layers are drawn every frame, since drawing is what moves their transitions along
+        # Only the part of surf within clip is actually drawn on
+        Engine.set_clip(surf, clip)
+        if clip[2] and clip[3]:
+            if self.autotiles:
+                surf.blit(self.autotiles[self.autotile_frame], (0, 0))
+            surf.blit(self.map_image, (0, 0))
         for position, tile in self.tile_sprites.items():
             tile.draw(surf, position)
             
@@ -144,13 +264,54 @@ class MapObject(object):
         for layer in self.layers:
             if layer.show or layer.fade > 0:
                 layer.draw(surf)
-
-        for pos, highlight in self.escape_highlights.items():
-            highlight.draw(surf, pos, gameStateObj.highlight_manager.updateIndex, 0)
-
-        if gameStateObj.stateMachine.getState() in ['prep_formation', 'prep_formation_select']:
-            for pos, highlight in self.formation_highlights.items():
-                highlight.draw(surf, pos, gameStateObj.highlight_manager.updateIndex, 0)
+        Engine.set_clip(surf, None)
+
+    def draw_composite(self, window):
+        size = self.map_image.get_size()
+        if not self.composite or self.composite.get_size() != size:
+            self.composite = Engine.create_surface(size)
+            self.stale_rects = [(0, 0) + size]
+            self.layer_states = []
+        if self.autotiles and self.autotile_frame != self.composite_autotile_frame:
+            self.composite_autotile_frame = self.autotile_frame
+            self.stale_rects = [(0, 0) + size]
+
+        # Tile sprites are only around while they are changing
+        for x, y in self.tile_sprites:
+            self.stale_rects.append((x*GC.TILEWIDTH, y*GC.TILEHEIGHT, GC.TILEWIDTH, GC.TILEHEIGHT))
+        # Layers that were changed since the last draw, or are fading
+        for index, layer in enumerate(self.layers):
+            old_state = self.layer_states[index] if index < len(self.layer_states) else None
+            fading = layer.fade < 100 if layer.show else layer.fade > 0
+            if fading or not old_state or old_state[:4] != (layer, layer.show, layer.fade, len(layer.sprites)):
+                self.stale_rects.extend(self.get_layer_rects(layer))
+                if old_state:
+                    self.stale_rects.extend(old_state[4])
+        for old_state in self.layer_states[len(self.layers):]:
+            self.stale_rects.extend(old_state[4])
+
+        # Only redraw what can be seen -- the rest stays stale until the camera gets to it
+        visible = [clip_rect(rect, window) for rect in self.stale_rects]
+        visible = [rect for rect in visible if rect]
+        clip = union_rect(visible) if visible else (0, 0, 0, 0)
+        self.stale_rects = [part for rect in self.stale_rects for part in subtract_rect(rect, clip)]
+        # Where both the autotiles and the map image are transparent, show the background color rather than an old frame
+        self.composite.fill(GC.COLORDICT['bg_color'], clip)
+        self.draw_sprites(self.composite, clip)
+        self.layer_states = [(layer, layer.show, layer.fade, len(layer.sprites), self.get_layer_rects(layer)) for layer in self.layers]
+
+        self.pixels_redrawn = clip[2] * clip[3]
+        self.total_pixels_redrawn += self.pixels_redrawn
+        self.frames_drawn += 1
+
+    def get_layer_rects(self, layer):
+        return [(sprite.position[0]*GC.TILEWIDTH, sprite.position[1]*GC.TILEHEIGHT) + sprite.true_image.get_size() for sprite in layer.sprites]
+
+    def get_draw_stats(self):
+        full = self.map_image.get_width() * self.map_image.get_height()
+        per_frame = self.total_pixels_redrawn//self.frames_drawn if self.frames_drawn else 0
+        return {'frames': self.frames_drawn, 'pixels_redrawn': self.total_pixels_redrawn,
+                'per_frame': per_frame, 'full_map': full}
 
     def loadSprites(self):
         if not self.sprites_loaded_flag:
@@ -158,6 +319,7 @@ class MapObject(object):
             # Handle grabbing normal sprites
             self.map_image = Engine.image_load(self.mapfilename, convert=True)
             Engine.set_colorkey(self.map_image, COLORKEY, rleaccel=True)
+            self.composite = None
             # Auto-tiles
             auto_loc = self.levelfolder + '/Autotiles/'
             self.autotile_frame = 0
@@ -318,10 +480,120 @@ class MapObject(object):
 
     def serialize(self):
         serial_dict = {}
-        serial_dict['command_list'] = self.command_list
+        serial_dict['command_list'] = list(self.command_list)
         serial_dict['HP'] = [(pos, hp.currenthp) for pos, hp in self.hp.items()]
+        if self.replay_matches:
+            index = self.snapshot[0] if self.snapshot else 0
+            if len(self.command_list) - index >= cf.CONSTANTS['map_snapshot_interval']:
+                self.snapshot = (len(self.command_list), self.get_snapshot())
+        serial_dict['snapshot'] = self.snapshot
         return serial_dict
 
+    def deserialize(self, serial_dict, currentLevelIndex):
+        command_list = serial_dict['command_list']
+        self.snapshot = serial_dict.get('snapshot')
+        if self.snapshot:
+            index, state = self.snapshot
+            self.restore_snapshot(state)
+        else:
+            index = 0
+        logger.debug('Replaying %s of %s map commands', len(command_list) - index, len(command_list))
+        self.replay_commands(command_list[index:], currentLevelIndex)
+        self.command_list = command_list
+        self.replay_matches = True
+        for position, current_hp in serial_dict['HP']:
+            self.tiles[position].set_hp(current_hp)
+
+    def filter_commands(self, keep):
+        self.command_list = [command for command in self.command_list if keep(command)]
+        # Scripts only remove commands whose effects they are about to undo or restate,
+        # so until the next load the map should not be snapshotted
+        self.snapshot = None
+        self.replay_matches = False
+
+    # === SNAPSHOTS ===
+    # Everything the script commands can change about the map, in plain data
+    def get_snapshot(self):
+        palette = {} # Key: terrain, Value: index into terrain list
+        tiles = {}
+        for position, tile in self._tiles.items():
+            terrain = (tile.name, tile.minimap, tile.platform, tile.mcost, tile.stats['DEF'], tile.AVO)
+            tiles[position] = palette.setdefault(terrain, len(palette))
+        terrain_list = [terrain for terrain, index in sorted(palette.items(), key=lambda x: x[1])]
+
+        tile_info = {}
+        for position, properties in self.tile_info_dict.items():
+            tile_info[position] = dict(properties)
+            if 'Status' in properties:
+                tile_info[position]['Status'] = [status.id for status in properties['Status'] if status]
+
+        return {'size': (self.width, self.height),
+                'mapfilename': self.mapfilename,
+                'origin': self.origin,
+                'terrain': terrain_list,
+                'tiles': tiles,
+                'tile_sprites': dict(self.sprite_changes),
+                'layers': [(layer.show, [(sprite.image_name, sprite.position) for sprite in layer.sprites]) for layer in self.layers],
+                'terrain_layers': [(layer.show, list(layer.added)) for layer in self.terrain_layers],
+                'tile_info': tile_info,
+                'hp': [(position, hp.stats['HP']) for position, hp in self.hp.items()],
+                'escape_highlights': list(self.escape_highlights),
+                'formation_highlights': list(self.formation_highlights),
+                'weather': [weather.name for weather in self.weather if weather.name != 'Warp_Flower'],
+                'status_effects': [status.id for status in self.status_effects]}
+
+    def restore_snapshot(self, state):
+        self.width, self.height = state['size']
+        if state['mapfilename'] != self.mapfilename:
+            self.mapfilename = state['mapfilename']
+            self.reset_all_tile_sprites()
+            self.loadSprites()
+        self.origin = state['origin']
+
+        terrain_list = state['terrain']
+        self._tiles = {}
+        for position, index in state['tiles'].items():
+            name, minimap, platform, mcost, DEF, AVO = terrain_list[index]
+            self._tiles[position] = TileObject(name, minimap, platform, position, mcost, [DEF, AVO], self)
+        self.sprite_changes = dict(state['tile_sprites'])
+        self.tile_sprites = {position: TileSprite(image_name, sprite_pos, self) for position, (image_name, sprite_pos) in self.sprite_changes.items()}
+
+        self.layers = []
+        for show, sprites in state['layers']:
+            layer = Layer()
+            for image_name, position in sprites:
+                layer.append(LayerSprite(image_name, position, self))
+            layer.show = show
+            layer.fade = 100 if show else 0
+            self.layers.append(layer)
+        self.terrain_layers = []
+        for show, added in state['terrain_layers']:
+            terrain_layer = TerrainLayer(self)
+            for image_name, position in added:
+                terrain_layer.add(image_name, position)
+            terrain_layer.show = show
+            self.terrain_layers.append(terrain_layer)
+
+        self.tile_info_dict = {}
+        for position, properties in state['tile_info'].items():
+            self.tile_info_dict[position] = dict(properties)
+            if 'Status' in properties:
+                self.tile_info_dict[position]['Status'] = [StatusObject.statusparser(s_id) for s_id in properties['Status']]
+        self.hp = {position: TileHP(hp) for position, hp in state['hp']}
+        self.escape_highlights = {position: CustomObjects.Highlight(GC.IMAGESDICT["YellowHighlight"]) for position in state['escape_highlights']}
+        self.formation_highlights = {position: CustomObjects.Highlight(GC.IMAGESDICT["BlueHighlight"]) for position in state['formation_highlights']}
+
+        self.weather = []
+        for name in state['weather']:
+            self.add_weather(name)
+        self.status_effects = set()
+        for s_id in state['status_effects']:
+            self.add_global_status(s_id)
+
+        self.true_tiles = None
+        self.true_opacity_map = None
+        self.composite = None
+
     # === SCRIPT COMMANDS ===
     def replay_commands(self, command_list, currentLevelIndex):
         for line in command_list:
@@ -745,6 +1017,7 @@ class TerrainLayer(object):
     def __init__(self, parent_map):
         self.map_reference = parent_map
         self._tiles = {}
+        self.added = [] # (image_name, position) for each call to add
         self.show = False
 
     def overwrite(self, tiles):
@@ -753,11 +1026,15 @@ class TerrainLayer(object):
         return tiles
 
     def add(self, image_name, position):
+        self.added.append((image_name, position))
         image = self.map_reference.loose_tile_sprites[image_name]
         color_key_obj, width, height = self.map_reference.build_color_key(image)
         self.populate_tiles(color_key_obj, position)
 
     def populate_tiles(self, color_key_obj, offset):
+        if FAST_DECODE:
+            self._tiles.update(create_tiles(color_key_obj, offset, self.map_reference))
+            return
         for x in range(len(color_key_obj)):
             for y in range(len(color_key_obj[x])):
                 cur = color_key_obj[x][y]
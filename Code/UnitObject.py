@@ -1,4 +1,4 @@
-import os
+import os, copy
 from collections import Counter
 try:
     import GlobalConstants as GC
@@ -28,6 +28,19 @@ class Multiset(Counter):
 class UnitObject(object):
     x_positions = [0, 0, 0, 0, 1, 2, 3, 4, 5, 6, 6, 6, 6, 5, 4, 3, 2, 1]
     y_positions = [0, 1, 2, 3, 3, 3, 3, 3, 3, 3, 2, 1, 0, 0, 0, 0, 0, 0]
+    # The gameStateObj's unit index, while this unit is in gameStateObj.allunits
+    unit_index = None
+
+    # Every change of position goes through here, so the unit index always knows where units are
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, new_position):
+        if self.unit_index:
+            self.unit_index.move(self, self._position, new_position)
+        self._position = new_position
 
 # === INITIALIZATION ==========================================================    
     def __init__(self, info):
@@ -633,7 +646,7 @@ class UnitObject(object):
     # Pathfinding algorithm
     def getPath(self, gameStateObj, goalPosition, ally_block=False):
         my_grid = gameStateObj.grid_manager.get_grid(self)
-        pathfinder = AStar.AStar(self.position, goalPosition, my_grid, gameStateObj.map.width,
+        pathfinder = AStar.get_astar(self.position, goalPosition, my_grid, gameStateObj.map.width,
                                  gameStateObj.map.height, self.team, 'pass_through' in self.status_bundle)
         # Run the pathfinder
         pathfinder.process(gameStateObj, ally_block=ally_block)
@@ -771,7 +784,7 @@ class UnitObject(object):
     def handle_forced_movement(self, other_pos, movement, gameStateObj, def_pos=None):
         # Remove tile statuses
         self.leave(gameStateObj)
-        move_mag = int(eval(movement.magnitude))
+        move_mag = int(Utility.evaluate(movement.magnitude, globals(), locals()))
         
         if movement.mode == 'Push':
             # Get all positions on infinite raytraced vector from other_pos to self.position
@@ -906,18 +919,49 @@ class UnitObject(object):
 # === TILE ALGORITHMS ===
     # Kind of a wrapper around the recursive algorithm for finding movement
     def getValidMoves(self, gameStateObj, force=False):
+        for ValidMoves in self.searchValidMoves(gameStateObj, force, step=None):
+            pass
+        return ValidMoves
+
+    def searchValidMoves(self, gameStateObj, force=False, step=64):
+        """
+        Generator version of getValidMoves. Yields None every step tiles the pathfinder closes,
+        so the search can be spread over several frames, and yields the valid moves last.
+        If step is None, runs the pathfinder without stopping
+        """
         if not force and self.hasMoved and (not self.has_canto() or self.finished): # No Valid moves once moved
-            return set()
+            yield set()
+            return
         if not self.position:  # Not sure how this is possible...
-            return set()
-        my_grid = gameStateObj.grid_manager.get_grid(self)
-        pathfinder = AStar.Djikstra(self.position, my_grid, gameStateObj.map.width, gameStateObj.map.height, self.team, 'pass_through' in self.status_bundle)
-        # Run the pathfinder
+            yield set()
+            return
+        grid_manager = gameStateObj.grid_manager
         movement_left = self.movement_left if not force else int(self.stats['MOV'])
-        ValidMoves = pathfinder.process(gameStateObj.grid_manager.team_map, movement_left)
+        pass_through = 'pass_through' in self.status_bundle
+        # Same unit in the same spot on an unchanged board always gets the same moves
+        key = (self.id, self.position, movement_left, grid_manager.get_mcost_column(self), pass_through, self.team)
+        while True:
+            ValidMoves = grid_manager.get_cached_moves(key)
+            if ValidMoves is not None:
+                yield set(ValidMoves)
+                return
+            my_grid = grid_manager.get_grid(self)
+            pathfinder = AStar.get_djikstra(self.position, my_grid, gameStateObj.map.width, gameStateObj.map.height, self.team, pass_through)
+            # Run the pathfinder
+            if step is None:
+                ValidMoves = pathfinder.process(grid_manager.team_map, movement_left)
+                break
+            version = grid_manager.version
+            for _ in pathfinder.process_steps(grid_manager.team_map, movement_left, step):
+                yield None
+            if version == grid_manager.version:
+                ValidMoves = pathfinder.get_valid_moves()
+                break
+            # Units moved or terrain changed in between, so search the new board
         # Own position is always a valid move
         ValidMoves.add(self.position)
-        return ValidMoves
+        grid_manager.set_cached_moves(key, ValidMoves)
+        yield ValidMoves
         
     def displayMoves(self, gameStateObj, ValidMoves, light=False):
         kind = 'possible_move' if light else 'move'
@@ -953,10 +997,13 @@ class UnitObject(object):
     def getExcessAttacks(self, gameStateObj, ValidMoves, both=False, boundary=False):
         potentialRange = self.findPotentialRange(both=both)
 
-        ValidAttacks = Utility.get_shell(ValidMoves, potentialRange, gameStateObj.map)
+        ValidAttacks = Utility.get_shell_columns(ValidMoves, potentialRange, gameStateObj.map)
         # Can't attack own team -- maybe not necessary?
         if not boundary:
-            ValidAttacks = [pos for pos in ValidAttacks if not gameStateObj.compare_teams(self.team, gameStateObj.grid_manager.get_team_node(pos))]
+            for team, team_columns in gameStateObj.grid_manager.team_columns.items():
+                if gameStateObj.compare_teams(self.team, team):
+                    ValidAttacks = Utility.remove_columns(ValidAttacks, team_columns)
+        ValidAttacks = Utility.columns_to_positions(ValidAttacks)
 
         if cf.CONSTANTS['line_of_sight'] and potentialRange:
             ValidAttacks = Utility.line_of_sight(ValidMoves, ValidAttacks, max(potentialRange), gameStateObj)
@@ -973,7 +1020,7 @@ class UnitObject(object):
     def getExcessSpellAttacks(self, gameStateObj, ValidMoves, boundary=False):
         potentialRange = self.findPotentialRange(spell=True, boundary=boundary)
 
-        ValidAttacks = Utility.get_shell(ValidMoves, potentialRange, gameStateObj.map)
+        ValidAttacks = Utility.get_shell_columns(ValidMoves, potentialRange, gameStateObj.map)
 
         # Now filter based on types of spells I've used
         # There are three types of spells, ALLY, ENEMY, TILE
@@ -982,10 +1029,11 @@ class UnitObject(object):
             # If can only hit allies, ignore enemies
             if all(["Ally" == spell.spell.targets for spell in my_spells]):
                 enemy_unit_positions = [unit.position for unit in gameStateObj.allunits if unit.position and self.checkIfEnemy(unit)]
-                ValidAttacks = [pos for pos in ValidAttacks if pos not in enemy_unit_positions]
+                ValidAttacks = Utility.remove_columns(ValidAttacks, Utility.positions_to_columns(enemy_unit_positions, gameStateObj.map.width))
             elif all(["Enemy" == spell.spell.targets for spell in my_spells]):
                 ally_unit_positions = [unit.position for unit in gameStateObj.allunits if unit.position and self.checkIfAlly(unit)]
-                ValidAttacks = [pos for pos in ValidAttacks if pos not in ally_unit_positions]
+                ValidAttacks = Utility.remove_columns(ValidAttacks, Utility.positions_to_columns(ally_unit_positions, gameStateObj.map.width))
+        ValidAttacks = Utility.columns_to_positions(ValidAttacks)
 
         if cf.CONSTANTS['spell_line_of_sight'] and potentialRange:
             ValidAttacks = Utility.line_of_sight(ValidMoves, ValidAttacks, max(potentialRange), gameStateObj)
@@ -1021,9 +1069,9 @@ class UnitObject(object):
             if item.spell.targets == 'Tile':
                 targets = Utility.get_shell(valid_moves, item.RNG, gameStateObj.map)
             elif item.spell.targets == 'TileNoUnit':
-                targets = set(Utility.get_shell(valid_moves, item.RNG, gameStateObj.map))
-                unit_positions = {unit.position for unit in gameStateObj.allunits if unit.position}
-                targets -= unit_positions
+                targets = Utility.get_shell_columns(valid_moves, item.RNG, gameStateObj.map)
+                unit_positions = [unit.position for unit in gameStateObj.allunits if unit.position]
+                targets = Utility.columns_to_positions(Utility.remove_columns(targets, Utility.positions_to_columns(unit_positions, gameStateObj.map.width)))
             elif item.beneficial:
                 ally_units = [unit.position for unit in gameStateObj.allunits if unit.position and self.checkIfAlly(unit) and
                               unit.team not in team_ignore and unit.name not in name_ignore]
@@ -1191,14 +1239,14 @@ class UnitObject(object):
             elif my_spell.target_restrict:
                 targetable_position = [target.position for target in gameStateObj.allunits if target.position and
                                        self.checkIfAlly(target) and Utility.calculate_distance(target.position, self.position) in my_spell.RNG and 
-                                       eval(my_spell.target_restrict)]
+                                       Utility.evaluate(my_spell.target_restrict, globals(), locals())]
             else:
                 targetable_position = [unit.position for unit in gameStateObj.allunits if unit.position and self.checkIfAlly(unit) and
                                        Utility.calculate_distance(unit.position, self.position) in my_spell.RNG]
         elif my_spell.spell.targets == 'Enemy':
             targetable_position = [target.position for target in gameStateObj.allunits if target.position and self.checkIfEnemy(target) and
                                    Utility.calculate_distance(target.position, self.position) in my_spell.RNG and
-                                   (not my_spell.target_restrict or eval(my_spell.target_restrict))]
+                                   (not my_spell.target_restrict or Utility.evaluate(my_spell.target_restrict, globals(), locals()))]
         elif my_spell.spell.targets == 'Unit':
             targetable_position = [unit.position for unit in gameStateObj.allunits if unit.position and
                                    Utility.calculate_distance(unit.position, self.position) in my_spell.RNG]
@@ -1449,21 +1497,12 @@ class UnitObject(object):
 
 # === COMBAT CALCULATIONS ====================================================
     # Gets bonuses from supports
-    # Right now this is just recalled every time it is needed!!!
-    # If that turns out to be SLOW, then I need to set it up like the aura system
+    # The support graph keeps these up to date as units move
     def get_support_bonuses(self, gameStateObj):
         # attack, defense, accuracy, avoid, crit, dodge, attackspeed
-        bonuses = [0] * 7
-
-        if gameStateObj.support and self.position and self.id in gameStateObj.support.node_dict:
-            for other_unit in gameStateObj.support.get_adjacent(self.id):
-                for unit in gameStateObj.allunits:
-                    if unit.id == other_unit and unit.position and self.checkIfAlly(unit):
-                        cur_bonus = gameStateObj.support.get_affinity_bonuses(self, unit)
-                        bonuses = [a + b for a, b in zip(bonuses, cur_bonus)]
-                        break
-
-        return bonuses
+        if gameStateObj.support:
+            return gameStateObj.support.get_support_bonuses(self, gameStateObj)
+        return (0,) * 7
 
     def outspeed(self, target, item):
         """
@@ -1532,12 +1571,12 @@ class UnitObject(object):
                 damage -= target.defense(gameStateObj, stat)
 
             for status in self.status_effects:
-                if status.conditional_mt and eval(status.conditional_mt.conditional, globals(), locals()):
-                    new_damage = int(eval(status.conditional_mt.value, globals(), locals()))
+                if status.conditional_mt and Utility.evaluate(status.conditional_mt.conditional, globals(), locals()):
+                    new_damage = int(Utility.evaluate(status.conditional_mt.value, globals(), locals()))
                     damage += new_damage
             for status in target.status_effects:
-                if status.conditional_resist and eval(status.conditional_resist.conditional, globals(), locals()):
-                    new_damage = int(eval(status.conditional_resist.value, globals(), locals()))
+                if status.conditional_resist and Utility.evaluate(status.conditional_resist.conditional, globals(), locals()):
+                    new_damage = int(Utility.evaluate(status.conditional_resist.value, globals(), locals()))
                     damage -= new_damage
             # Determine weakness
             for status in target.status_effects:
@@ -1559,7 +1598,7 @@ class UnitObject(object):
         return max(cf.CONSTANTS['minimum_damage'], damage)
 
     def compute_heal(self, target, gameStateObj, item, mode=None):
-        heal = int(eval(item.heal)) + self.stats['MAG']
+        heal = int(Utility.evaluate(item.heal, globals(), locals())) + self.stats['MAG']
         if self is not target:
             heal += sum(status.caretaker for status in self.status_effects if status.caretaker)
 
@@ -1593,12 +1632,12 @@ class UnitObject(object):
 
             hitrate = self.accuracy(gameStateObj, my_item) + bonus - target.avoid(gameStateObj)
             for status in self.status_effects:
-                if status.conditional_hit and eval(status.conditional_hit.conditional, globals(), locals()):
-                    new_hit = int(eval(status.conditional_hit.value, globals(), locals()))
+                if status.conditional_hit and Utility.evaluate(status.conditional_hit.conditional, globals(), locals()):
+                    new_hit = int(Utility.evaluate(status.conditional_hit.value, globals(), locals()))
                     hitrate += new_hit
             for status in target.status_effects:
-                if status.conditional_avoid and eval(status.conditional_avoid.conditional, globals(), locals()):
-                    new_avoid = int(eval(status.conditional_avoid.value, globals(), locals()))
+                if status.conditional_avoid and Utility.evaluate(status.conditional_avoid.conditional, globals(), locals()):
+                    new_avoid = int(Utility.evaluate(status.conditional_avoid.value, globals(), locals()))
                     hitrate -= new_avoid
             return Utility.clamp(hitrate, 0, 100)
         else:
@@ -1630,12 +1669,12 @@ class UnitObject(object):
                 bonus += advantage[1] * Weapons.ADVANTAGE.get_disadvantage(target.getMainWeapon(), target.wexp).dodge
             critrate = self.crit_accuracy(gameStateObj, my_item) + bonus - target.crit_avoid(gameStateObj)
             for status in self.status_effects:
-                if status.conditional_crit_hit and eval(status.conditional_crit_hit.conditional, globals(), locals()):
-                    new_hit = int(eval(status.conditional_crit_hit.value, globals(), locals()))
+                if status.conditional_crit_hit and Utility.evaluate(status.conditional_crit_hit.conditional, globals(), locals()):
+                    new_hit = int(Utility.evaluate(status.conditional_crit_hit.value, globals(), locals()))
                     critrate += new_hit
             for status in target.status_effects:
-                if status.conditional_crit_avoid and eval(status.conditional_crit_avoid.conditional, globals(), locals()):
-                    new_avoid = int(eval(status.conditional_crit_avoid.value, globals(), locals()))
+                if status.conditional_crit_avoid and Utility.evaluate(status.conditional_crit_avoid.conditional, globals(), locals()):
+                    new_avoid = int(Utility.evaluate(status.conditional_crit_avoid.value, globals(), locals()))
                     critrate -= new_avoid
             return Utility.clamp(critrate, 0, 100)
         else:
@@ -1656,7 +1695,7 @@ class UnitObject(object):
         # Cannot convert the following into a list comprehension, since the scoping ruins globals and locals
         for status in self.status_effects:
             if status.hit:
-                accuracy += int(eval(status.hit, globals(), locals()))
+                accuracy += int(Utility.evaluate(status.hit, globals(), locals()))
         if not item:
             if self.getMainWeapon():
                 item = self.getMainWeapon()
@@ -1680,7 +1719,7 @@ class UnitObject(object):
         base += self.get_support_bonuses(gameStateObj)[3]
         for status in self.status_effects:
             if status.avoid:
-                base += int(eval(status.avoid, globals(), locals()))
+                base += int(Utility.evaluate(status.avoid, globals(), locals()))
         if self.position:
             base += (0 if 'flying' in self.status_bundle else gameStateObj.map.tiles[self.position].AVO)
         return base
@@ -1694,7 +1733,7 @@ class UnitObject(object):
         damage = self.get_support_bonuses(gameStateObj)[0]
         for status in self.status_effects:
             if status.mt:
-                damage += int(eval(status.mt, globals(), locals()))
+                damage += int(Utility.evaluate(status.mt, globals(), locals()))
         if item.weapon:
             damage += item.weapon.MT
             if Weapons.TRIANGLE.isMagic(item):
@@ -1725,7 +1764,7 @@ class UnitObject(object):
                 return None
         if item.crit is not None and (item.weapon or item.spell):
             accuracy = item.crit + int(self.stats['SKL'] * cf.CONSTANTS['crit_accuracy_skill_coef'])
-            accuracy += sum(int(eval(status.crit_hit, globals(), locals())) for status in self.status_effects if status.crit_hit)
+            accuracy += sum(int(Utility.evaluate(status.crit_hit, globals(), locals())) for status in self.status_effects if status.crit_hit)
             accuracy += self.get_support_bonuses(gameStateObj)[4]
             return accuracy
         else:
@@ -1733,7 +1772,7 @@ class UnitObject(object):
 
     def crit_avoid(self, gameStateObj, item=None):
         base = int(self.stats['LCK'] * cf.CONSTANTS['crit_avoid_luck_coef'])
-        base += sum(int(eval(status.crit_avoid, globals(), locals())) for status in self.status_effects if status.crit_avoid)
+        base += sum(int(Utility.evaluate(status.crit_avoid, globals(), locals())) for status in self.status_effects if status.crit_avoid)
         base += self.get_support_bonuses(gameStateObj)[5]
         return base
 
@@ -1786,6 +1825,8 @@ class UnitObject(object):
         self.hasRunMoveAI = False
         self.hasRunAttackAI = False
         self.hasRunGeneralAI = False
+        if self.ai:
+            self.ai.abandon_plan()
         
     def reset(self):
         self.hasMoved = False # Controls whether unit has moved already. Unit can still move back.
@@ -1880,16 +1921,16 @@ class UnitObject(object):
                        'gender': self.gender,
                        'level': self.level,
                        'exp': self.exp,
-                       'tags': self.tags,
+                       'tags': copy.copy(self.tags),
                        'status_effects': [status.serialize() for status in self.status_effects],
                        'desc': self.desc,
-                       'growths': self.growths,
-                       'growth_points': self.growth_points,
+                       'growths': list(self.growths),
+                       'growth_points': list(self.growth_points),
                        'currenthp': self.currenthp,
-                       'wexp': self.wexp,
+                       'wexp': list(self.wexp),
                        'items': [item.serialize() for item in self.items],
                        'ai': self.ai_descriptor,
-                       'records': self.records,
+                       'records': dict(self.records),
                        'dead': self.dead,
                        'finished': self.finished,
                        'TRV': self.TRV,
@@ -2152,6 +2193,8 @@ class UnitObject(object):
     def changeTeams(self, new_team, gameStateObj):
         self.leave(gameStateObj)
         self.team = new_team
+        if gameStateObj.support:
+            gameStateObj.support.invalidate_bonuses(self.id)
         gameStateObj.boundary_manager.reset_unit(self)
         # new sprite to reflect this
         self.sprite = UnitSprite.UnitSprite(self)
@@ -2180,7 +2223,7 @@ class UnitObject(object):
         # Remove summons permanently. Don't need to keep their data, since they would eventually fill all 
         # memory if player kept creating them.
         if self.isSummon() and self in gameStateObj.allunits:
-            gameStateObj.allunits.remove(self)
+            gameStateObj.remove_unit(self)
         # Other things to clean
         self.clean_up(gameStateObj, event)
         self.isDying = False
@@ -2229,7 +2272,9 @@ class UnitObject(object):
                                 
     # This obviously has some important purpose. Should write that purpose when I remember why i did this.
     def __getstate__(self):
-        return self.__dict__
+        state = self.__dict__.copy()
+        state.pop('unit_index', None)
+        return state
 
     def __setstate__(self, d):
         self.__dict__.update(d)
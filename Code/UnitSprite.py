@@ -214,7 +214,7 @@ class UnitSprite(object):
             surf.blit(Engine.subsurface(GC.IMAGESDICT['DangerMarker'], (frame*8, 0, 8, 16)), topleft)
         # Killer Weapons and Master Weapons
         for item in items:
-            if (item.warning and eval(item.warning)) or \
+            if (item.warning and Utility.evaluate(item.warning, globals(), locals())) or \
                     (item.reverse and cur_unit.getMainWeapon() and Weapons.TRIANGLE.compute_advantage(item, cur_unit.getMainWeapon())[0]):
                 frame = (Engine.get_time()//125)%8
                 topleft = (left + 5, top - 12)
@@ -10,17 +10,9 @@ try:
 except:
     FAST_SPHERE = False
     print('Fast manhattan sphere generation not available. Falling back on default Python implementation.')
-try:
-    # When I have python 3 CYTHON modules
-    # try:
-    #     import LOS
-    # except ImportError:
-    #     from . import LOS
-    import LOS
-    FAST_LOS = True
-except:
-    FAST_LOS = False
-    print('Fast line of sight calculation not available. Falling back on default Python implementation.')
+
+import timeit
+from collections import OrderedDict
 # === TAXICAB DISTANCE =================================================
 def calculate_distance(position1, position2):
     return (abs(position1[0] - position2[0]) + abs(position1[1] - position2[1]))
@@ -160,6 +152,131 @@ def process_terms(terms):
     #    print('Processed Terms: ', [term[0] for term in terms])
     return sum([float(term[0]*term[1]) for term in terms])/weight_sum 
 
+# === EVALUATE EXPRESSIONS =============================================
+# Every distinct expression string from the data files is only compiled once
+expression_cache = {} # Key: expression string, Value: [code object, number of calls, cumulative seconds]
+
+def evaluate(expression, global_vars, local_vars):
+    """
+    Same as eval(expression, global_vars, local_vars), but the compiled expression is kept
+    Call with globals(), locals() so the expression sees the same names it would with a bare eval
+    """
+    entry = expression_cache.get(expression)
+    if entry is None:
+        # eval ignores leading spaces and tabs, compile does not
+        entry = expression_cache[expression] = [compile(expression.lstrip(' \t'), '<expression>', 'eval'), 0, 0.]
+    time1 = timeit.default_timer()
+    try:
+        return eval(entry[0], global_vars, local_vars)
+    finally:
+        entry[1] += 1
+        entry[2] += timeit.default_timer() - time1
+
+def get_expression_report(num=10):
+    # The num expressions that have taken the most total time, as (cumulative seconds, number of calls, expression)
+    report = sorted(((entry[2], entry[1], expression) for expression, entry in expression_cache.items()), reverse=True)
+    return report[:num]
+
+# === PROTOTYPES =======================================================
+class PrototypeRegistry(object):
+    """
+    Parses the data file entry for each id only once into a template
+    New objects are then built from the template instead of from the data file
+    """
+    def __init__(self, name, parse):
+        self.name = name
+        self.parse = parse # Function that takes an id and returns its template, or None if there is no such id
+        self.templates = {}
+        self.parse_time = 0. # Cumulative seconds spent parsing templates
+        self.num_created = 0
+
+    def get(self, key):
+        if key not in self.templates:
+            time1 = timeit.default_timer()
+            self.templates[key] = self.parse(key)
+            self.parse_time += timeit.default_timer() - time1
+        return self.templates[key]
+
+    def create(self, key, *args, **kwargs):
+        template = self.get(key)
+        if template is None:
+            return None
+        self.num_created += 1
+        return template.create(*args, **kwargs)
+
+    def get_stats(self):
+        num_parsed = len(self.templates)
+        # Every object created past the first for its id would have needed its own parse
+        time_saved = self.parse_time/num_parsed*(self.num_created - num_parsed) if num_parsed else 0.
+        return {'name': self.name, 'parsed': num_parsed, 'created': self.num_created,
+                'parse_time': self.parse_time, 'time_saved': max(time_saved, 0.)}
+
+# === MEMORY BUDGETED CACHE ============================================
+def get_image_memory(image):
+    # Bytes of pixel data in a surface
+    width, height = image.get_size()
+    return width * height * image.get_bytesize()
+
+class LRUCache(object):
+    """
+    Keeps values until they take up more than max_memory bytes, then drops the least recently used first
+    The most recently added value is always kept, even if it is over budget on its own
+    """
+    def __init__(self, max_memory, on_evict=None):
+        self.max_memory = max_memory
+        self.on_evict = on_evict # Called with (key, value) for each value dropped to stay within budget
+        self.entries = OrderedDict() # Key: key, Value: (value, bytes), least recently used first
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def keys(self):
+        return list(self.entries)
+
+    def get(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries[key] = entry
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, memory=None):
+        # Memory defaults to that of value as an image
+        self.discard(key, evicted=False)
+        if memory is None:
+            memory = get_image_memory(value)
+        self.entries[key] = (value, memory)
+        self.memory += memory
+        while self.memory > self.max_memory and len(self.entries) > 1:
+            old_key, (old_value, old_memory) = self.entries.popitem(last=False)
+            self.memory -= old_memory
+            self.evictions += 1
+            if self.on_evict:
+                self.on_evict(old_key, old_value)
+
+    def discard(self, key, evicted=True):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.memory -= entry[1]
+            if evicted:
+                self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.memory = 0
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        hit_rate = '%.1f%%' % (100. * self.hits / total) if total else 'n/a'
+        return {'entries': len(self.entries), 'memory': self.memory, 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': hit_rate, 'evictions': self.evictions}
+
 def get_adjacent_positions(c_pos, rng=1):
     if FAST_SPHERE:
         return manhattan_sphere.find_manhattan_spheres(list(range(1, rng+1)), c_pos[0], c_pos[1])
@@ -188,14 +305,62 @@ def find_manhattan_spheres(rng, c_pos):
                     main_set.add((c_pos[0] + x, c_pos[1] + y))
         return main_set
 
+# === RANGE SHELLS =====================================================
+# Sets of map positions are stored as a list of columns,
+# where bit y of columns[x] is set if (x, y) is in the set
+diamond_kernels = {} # Key: frozenset of ranges, Value: list of (dx, tuple of dy)
+
+def get_diamond_kernel(rng):
+    key = frozenset(rng)
+    if key not in diamond_kernels:
+        offsets = {}
+        for r in key:
+            for dx in range(-r, r + 1):
+                abs_dx = dx if dx >= 0 else -dx
+                offsets.setdefault(dx, set()).update((r - abs_dx, -(r - abs_dx)))
+        diamond_kernels[key] = sorted((dx, tuple(sorted(dys))) for dx, dys in offsets.items())
+    return diamond_kernels[key]
+
+def positions_to_columns(positions, width):
+    columns = [0] * width
+    for x, y in positions:
+        columns[x] |= 1 << y
+    return columns
+
+def columns_to_positions(columns):
+    positions = []
+    for x, column in enumerate(columns):
+        while column:
+            low_bit = column & -column
+            positions.append((x, low_bit.bit_length() - 1))
+            column ^= low_bit
+    return positions
+
+def remove_columns(columns, other_columns):
+    return [column & ~other for column, other in zip(columns, other_columns)]
+
+def dilate_columns(columns, rng, height):
+    # Every position within any of the ranges in rng of a position in columns
+    width = len(columns)
+    kernel = get_diamond_kernel(rng)
+    result = [0] * width
+    for x, column in enumerate(columns):
+        if column:
+            for dx, dys in kernel:
+                new_x = x + dx
+                if 0 <= new_x < width:
+                    new_column = result[new_x]
+                    for dy in dys:
+                        new_column |= column << dy if dy >= 0 else column >> -dy
+                    result[new_x] = new_column
+    full = (1 << height) - 1
+    return [column & full for column in result]
+
+def get_shell_columns(ValidMoves, potentialRange, tile_map):
+    return dilate_columns(positions_to_columns(ValidMoves, tile_map.width), potentialRange, tile_map.height)
+
 def get_shell(ValidMoves, potentialRange, tile_map):
-    if FAST_SPHERE:
-        return manhattan_sphere.get_shell(ValidMoves, potentialRange, tile_map.width, tile_map.height)
-    else:
-        ValidAttacks = set()
-        for validmove in ValidMoves:
-            ValidAttacks |= find_manhattan_spheres(potentialRange, validmove)
-        return [pos for pos in ValidAttacks if tile_map.check_bounds(pos)]
+    return columns_to_positions(get_shell_columns(ValidMoves, potentialRange, tile_map))
 
 def farthest_away_pos(unit, valid_moves, all_units):
     # get farthest away position from general direction of enemy units
@@ -214,104 +379,29 @@ def farthest_away_pos(unit, valid_moves, all_units):
     else:
         return None
 
-def line_of_sight(source_pos, dest_pos, max_range, gameStateObj):
-    if FAST_LOS:
-        return LOS.line_of_sight(source_pos, dest_pos, max_range, gameStateObj.map.opacity_map, gameStateObj.map.height)
-
-    UNKNOWN, DARK, LIT = 0, 1, 2
-
-    # This is important so we can change the values of this while we iterate over it.
-    class SimpleTile(object):
-        def __init__(self):
-            self.visibility = UNKNOWN
-
+# === LINE OF SIGHT ====================================================
+class LineOfSight(object):
     """
-    def get_line3(start, end):
-        # This one is to try and get more free results by tripling distance and checking 4 times instead of one, from each corner to middle
-        # still gets weird results
-        if start == end:
-            return True
-        #SuperCover Line Algorithm http://eugen.dedu.free.fr/projects/bresenham/
-        # Setup initial conditions
-        x1, y1 = start
-        x2, y2 = end
-        dx = x2 - x1
-        dy = y2 - y1
-        x, y = x1, y1
-
-        xstep, ystep = 1, 1
-        if dy < 0:
-            ystep = -1
-            dy = -dy
-        if dx < 0:
-            xstep = -1
-            dx = -dx
-        ddy, ddx = 2*dy, 2*dx
-
-        if ddx >= ddy:
-            errorprev = error = dx
-            for i in range(dx):
-                x += xstep
-                error += ddy
-                # How far off the straight line to the right are you
-                if error > ddx:
-                    y += ystep
-                    error -= ddx
-                    if error + errorprev < ddx: # bottom square
-                        pos = x/3, (y - ystep)/3
-                        if gameStateObj.map.tiles[pos].opaque:
-                            return False
-                    elif error + errorprev > ddx: # left square
-                        pos = (x - xstep)/3, y/3
-                        if gameStateObj.map.tiles[pos].opaque:
-                            return False
-                    else:
-                        pos1, pos2 = (x/3, (y - ystep)/3), ((x - xstep)/3, y/3)
-                        if gameStateObj.map.tiles[pos1].opaque and gameStateObj.map.tiles[pos2].opaque:
-                            return False
-                pos = x/3, y/3
-                if (x, y) != end and gameStateObj.map.tiles[pos].opaque:
-                    return False
-                errorprev = error
-        else:
-            errorprev = error = dy
-            for i in range(dy):
-                y += ystep
-                error += ddx
-                if error > ddy:
-                    x += xstep
-                    error -= ddy
-                    if error + errorprev < ddy: # bottom square
-                        pos = (x - xstep)/3, y/3
-                        if gameStateObj.map.tiles[pos].opaque:
-                            return False
-                    elif error + errorprev > ddy: # left square
-                        pos = x/3, (y - ystep)/3
-                        if gameStateObj.map.tiles[pos].opaque:
-                            return False
-                    else:
-                        pos1, pos2 = (x/3, (y - ystep)/3), ((x - xstep)/3, y/3)
-                        if gameStateObj.map.tiles[pos1].opaque and gameStateObj.map.tiles[pos2].opaque:
-                            return False
-                pos = x/3, y/3
-                if (x, y) != end and gameStateObj.map.tiles[pos].opaque:
-                    return False
-                errorprev = error
-        assert x == x2 and y == y2
-        return True
+    Line of sight for one map. Every ray from a source to a destination offset
+    is walked once with the SuperCover Line Algorithm (http://eugen.dedu.free.fr/projects/bresenham/)
+    and stored as the tiles it has to check, relative to the source.
+    The opacity map is packed into a single int, so checking a ray is one shift and mask.
+    Results are cached until the map's opacity map is rebuilt
     """
+    def __init__(self, tilemap):
+        self.tilemap = tilemap
+        self.grid_height = tilemap.height
+        self.rays = {} # Key: (dx, dy), Value: (base, mask, pairs)
+        self.ray_range = -1
+        self.opacity_map = None
+        self.opacity_bits = 0
+        self.cache = {} # Key: (source, dest), Value: whether dest can be seen from source
 
-    def get_line2(start, end):
-        # This one is ~3-6 times faster than get_line1
-        if start == end:
-            return True
-        # SuperCover Line Algorithm http://eugen.dedu.free.fr/projects/bresenham/
-        # Setup initial conditions
-        x1, y1 = start
-        x2, y2 = end
-        dx = x2 - x1
-        dy = y2 - y1
-        x, y = x1, y1
+    def build_ray(self, dx, dy):
+        # Walks the line from (0, 0) to (dx, dy), remembering which tiles would need checking
+        singles, pairs = [], []
+        end = dx, dy
+        x, y = 0, 0
 
         xstep, ystep = 1, 1
         if dy < 0:
@@ -332,20 +422,12 @@ def line_of_sight(source_pos, dest_pos, max_range, gameStateObj):
                     y += ystep
                     error -= ddx
                     if error + errorprev < ddx: # bottom square
-                        pos = x, y - ystep
-                        if pos != end and gameStateObj.map.tiles[pos].opaque:
-                            return False
+                        singles.append((x, y - ystep))
                     elif error + errorprev > ddx: # left square
-                        pos = x - xstep, y
-                        if pos != end and gameStateObj.map.tiles[pos].opaque:
-                            return False
+                        singles.append((x - xstep, y))
                     else:  # through the middle
-                        pos1, pos2 = (x, y - ystep), (x - xstep, y)
-                        if gameStateObj.map.tiles[pos1].opaque and gameStateObj.map.tiles[pos2].opaque:
-                            return False
-                pos = x, y
-                if pos != end and gameStateObj.map.tiles[pos].opaque:
-                    return False
+                        pairs.append(((x, y - ystep), (x - xstep, y)))
+                singles.append((x, y))
                 errorprev = error
         else:
             errorprev = error = dy
@@ -356,83 +438,78 @@ def line_of_sight(source_pos, dest_pos, max_range, gameStateObj):
                     x += xstep
                     error -= ddy
                     if error + errorprev < ddy: # bottom square
-                        pos = x - xstep, y
-                        if pos != end and gameStateObj.map.tiles[pos].opaque:
-                            return False
+                        singles.append((x - xstep, y))
                     elif error + errorprev > ddy: # left square
-                        pos = x, y - ystep
-                        if pos != end and gameStateObj.map.tiles[pos].opaque:
-                            return False
+                        singles.append((x, y - ystep))
                     else:  # through the middle
-                        pos1, pos2 = (x, y - ystep), (x - xstep, y)
-                        if gameStateObj.map.tiles[pos1].opaque and gameStateObj.map.tiles[pos2].opaque:
-                            return False
-                pos = x, y
-                if pos != end and gameStateObj.map.tiles[pos].opaque:
-                    return False
+                        pairs.append(((x, y - ystep), (x - xstep, y)))
+                singles.append((x, y))
                 errorprev = error
-        assert x == x2 and y == y2
+
+        # The destination itself never blocks sight
+        offsets = {pos[0] * self.grid_height + pos[1] for pos in singles if pos != end}
+        base = min(offsets) if offsets else 0
+        mask = 0
+        for offset in offsets:
+            mask |= 1 << (offset - base)
+        pairs = [(a[0] * self.grid_height + a[1], b[0] * self.grid_height + b[1]) for a, b in pairs]
+        return base, mask, pairs
+
+    def build_rays(self, max_range):
+        # Only ever extends the table, since rays don't depend on the range they were built for
+        for r in range(self.ray_range + 1, max_range + 1):
+            for dx in range(-r, r + 1):
+                abs_dx = dx if dx >= 0 else -dx
+                for dy in {r - abs_dx, -(r - abs_dx)}:
+                    self.rays[(dx, dy)] = self.build_ray(dx, dy)
+        self.ray_range = max(self.ray_range, max_range)
+
+    def update(self):
+        # The map throws away its opacity map whenever a tile or layer changes
+        opacity_map = self.tilemap.opacity_map
+        if opacity_map is not self.opacity_map:
+            self.opacity_map = opacity_map
+            self.opacity_bits = 0
+            for idx, opaque in enumerate(opacity_map):
+                if opaque:
+                    self.opacity_bits |= 1 << idx
+            self.cache.clear()
+
+    def check(self, source, dest):
+        base, mask, pairs = self.rays[(dest[0] - source[0], dest[1] - source[1])]
+        start = source[0] * self.grid_height + source[1]
+        if mask and (self.opacity_bits >> (start + base)) & mask:
+            return False
+        opacity_map = self.opacity_map
+        for a, b in pairs:
+            if opacity_map[start + a] and opacity_map[start + b]:
+                return False
         return True
 
-    """
-    def get_line(start, end):
-        #print('Start:', start, "End:", end)
-        if start == end:
-            return True
-        _int = int
-        def rise_over_run((c_x, c_y), (e_x, e_y), end, d_x, d_y, d):
-            #print(c_x, c_y)
-            while (_int(c_x), _int(c_y)) != end:
-                c_x += d_x * d
-                c_y += d_y * d
-                #print(c_x, c_y)
-                c_pos = (_int(c_x), _int(c_y))
-                if (c_x, c_y) == c_pos: # Don't need to check opacity if its on a corner
-                    continue
-                if gameStateObj.map.tiles[c_pos].opaque:
-                    return False
-                #elif c_pos in all_tiles and all_tiles[c_pos].visibility == 'unknown':
-                #    all_tiles[c_pos].visibility = 'lit'
-            return True
-        x1, y1 = start
-        x2, y2 = end
-        d = 1/float(calculate_distance(start, end))/2 # Divide by 2 to get more accurate
-        e_x, e_y = x2 + 0.5, y2 + 0.5
-        # Go from each of the four corners
-        for (x, y) in [(x1, y1), (x1 + 1, y1), (x1, y1 + 1), (x1 + 1, y1 + 1)]:
-            # Determine which tiles are on the line
-            #slope = (y - e_y)/(e_x - x) # difference because y goes down.
-            d_x = (e_x - x)
-            d_y = (e_y - y)
-            if rise_over_run((x, y), (e_x, e_y), end, d_x, d_y, d):
-                return True
-    # End Func
-    """
-    all_tiles = {}
-    for pos in dest_pos:
-        all_tiles[pos] = SimpleTile()
-        if pos in source_pos:
-            all_tiles[pos].visibility = LIT
-
-    # Any tile that can't be moved over at all is dark
-    # for pos, tile in all_tiles.items():
-    #     if gameStateObj.map.tiles[pos].opaque:
-    #         tile.visibility = DARK
-
-    # Iterate over remaining tiles
-    for pos, tile in all_tiles.items():
-        if tile.visibility == UNKNOWN:
+    def get_visible(self, source_pos, dest_pos, max_range):
+        """Returns the destinations that can be seen from at least one source within max_range"""
+        self.update()
+        if max_range > self.ray_range:
+            self.build_rays(max_range)
+        cache = self.cache
+        lit_tiles = []
+        for pos in dest_pos:
+            if pos in source_pos:
+                lit_tiles.append(pos)
+                continue
             for s_pos in source_pos:
-                if calculate_distance(pos, s_pos) <= max_range and get_line2(s_pos, pos):
-                    tile.visibility = LIT
-                    break
-            else:
-                tile.visibility = DARK
+                if calculate_distance(pos, s_pos) <= max_range:
+                    key = (s_pos, pos)
+                    visible = cache.get(key)
+                    if visible is None:
+                        visible = cache[key] = self.check(s_pos, pos)
+                    if visible:
+                        lit_tiles.append(pos)
+                        break
+        return lit_tiles
 
-    lit_tiles = [pos for pos in dest_pos if all_tiles[pos].visibility != DARK]
-
-    # print(time.clock() - time1)
-    return lit_tiles
+def line_of_sight(source_pos, dest_pos, max_range, gameStateObj):
+    return gameStateObj.map.los.get_visible(source_pos, dest_pos, max_range)
 
 if __name__ == '__main__':
     for _ in range(100000):
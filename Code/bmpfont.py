@@ -54,10 +54,52 @@ alllowercase
 
 __all__ = ["BmpFont"]
 
+from collections import OrderedDict
+
 try:
-    import Engine
+    import Engine, Utility
 except ImportError:
-    from . import Engine
+    from . import Engine, Utility
+
+# Whether strings drawn more than once are rendered into their own surface, so drawing them again is one blit
+CACHE_STRINGS = True
+CACHE_MEMORY = 1024*1024 # Bytes of rendered strings kept around
+CACHE_SEEN = 256 # Strings drawn once that are remembered, so a second draw gets cached
+MAX_WIDTHS = 1024 # Memoized string widths per font
+
+class StringCache(object):
+    """Rendered strings of every font, least recently used are dropped first."""
+    def __init__(self, max_memory):
+        self.surfaces = Utility.LRUCache(max_memory)
+        # Strings like dialogue that is still being typed out are only drawn once, so they are not worth rendering
+        self.seen = OrderedDict()
+
+    def get(self, key):
+        return self.surfaces.get(key)
+
+    def admit(self, key):
+        # Only the second draw of a string renders it
+        if self.seen.pop(key, None):
+            return True
+        self.seen[key] = True
+        if len(self.seen) > CACHE_SEEN:
+            self.seen.popitem(last=False)
+        return False
+
+    def add(self, key, surf):
+        self.surfaces.put(key, surf)
+
+    def clear(self):
+        self.surfaces.clear()
+        self.seen.clear()
+
+    def get_stats(self):
+        return self.surfaces.get_stats()
+
+STRING_CACHE = StringCache(CACHE_MEMORY)
+
+def get_cache_stats():
+    return STRING_CACHE.get_stats()
 
 class BmpFont:
     """Provides an object for treating a bitmap as a font."""
@@ -69,6 +111,7 @@ class BmpFont:
         self.alluppercase = False
         self.alllowercase = False
         self.chartable = {}
+        self.name = name
         self.idxfile = Engine.engine_constants['home'] + "Sprites/Fonts/" + name.split('_')[0] + '.idx'
         self.bmpfile = Engine.engine_constants['home'] + "Sprites/Fonts/" + name + '.png'
         self.width = 8
@@ -110,6 +153,10 @@ class BmpFont:
         # Setup the actual bitmap that holds the font graphics.
         self.surface = Engine.image_load(self.bmpfile)
         Engine.set_colorkey(self.surface, self.transrgb, rleaccel=True)
+        self.transparent = bool(self.surface.get_flags() & Engine.SRCALPHA)
+
+        self.glyphs = {} # Each character's cell of the bitmap, cut out the first time it is drawn
+        self.widths = {}
 
     # blit() - Copies a string to a surface using the bitmap font.
     # Parameters:  string    - The message to render.  All characters
@@ -133,7 +180,6 @@ class BmpFont:
         if usetextxy:
             x *= self.width
             y *= self.height
-        surfwidth, surfheight = surf.get_size()
 
         # The commented out line is INCREDIBLY slow.
         # NOT NECESSARY IF WE USE RGBA 
@@ -145,37 +191,64 @@ class BmpFont:
         if self.alllowercase:
             string = string.lower()
 
+        if CACHE_STRINGS and string and space_offset >= 0:
+            key = (self.name, string, space_offset)
+            rendered = STRING_CACHE.get(key)
+            if not rendered and STRING_CACHE.admit(key):
+                rendered = self.render(string, space_offset)
+                STRING_CACHE.add(key, rendered)
+            if rendered:
+                Engine.blit(surf, rendered, (x, y))
+                return
+
+        self.draw_glyphs(string, surf, x, y, space_offset)
+
+    def get_char(self, c, string):
+        try:
+            char_pos_x, char_pos_y, char_width = self.chartable[c]
+        except KeyError as e:
+            print(e)
+            print("%s is not chartable"%(c))
+            print('string', string)
+            return Engine.subsurface(self.surface, (0, 0, self.width, self.height)), 4
+        if c not in self.glyphs:
+            self.glyphs[c] = Engine.subsurface(self.surface, (char_pos_x, char_pos_y, self.width, self.height))
+        return self.glyphs[c], char_width
+
+    def draw_glyphs(self, string, surf, x, y, space_offset):
         # Render the font.
         for c in string:
-            try:
-                char_pos_x = self.chartable[c][0]
-                char_pos_y = self.chartable[c][1]
-                char_width = self.chartable[c][2]
-            except KeyError as e:
-                char_pos_x = 0
-                char_pos_y = 0
-                char_width = 4
-                print(e)
-                print("%s is not chartable"%(c))
-                print('string', string)
-
-            subsurf = Engine.subsurface(self.surface, (char_pos_x, char_pos_y, self.width, self.height))
-            Engine.blit(surf, subsurf, (x, y))
-            # surf.blit(self.surface, (x, y), ((char_pos_x, char_pos_y), (self.width, self.height))) # subsurface
+            glyph, char_width = self.get_char(c, string)
+            Engine.blit(surf, glyph, (x, y))
             x += char_width + space_offset
 
+    # render() - Returns a new surface with the string drawn on it, to be blit in one go
+    def render(self, string, space_offset=0):
+        width = self.size(string)[0] + space_offset*len(string) + self.width
+        if self.transparent:
+            rendered = Engine.create_surface((width, self.height), transparent=True)
+        else:
+            rendered = Engine.create_surface((width, self.height))
+            Engine.fill(rendered, self.transrgb)
+            Engine.set_colorkey(rendered, self.transrgb, rleaccel=True)
+        self.draw_glyphs(string, rendered, 0, 0, space_offset)
+        return rendered
+
     # size() - Returns the length and height of a string (height will always be self.height)
     # Parameters:  string     - the string that is to be measured. All characters must
     #                           have font index entries or a KeyError will occur.
     def size(self, string):
         """Returns the length and width of a bitmapped string"""
+        if string in self.widths:
+            return (self.widths[string], self.height)
         length = 0
         # height = self.height
+        measured = string
         if self.alluppercase:
-            string = string.upper()
+            measured = measured.upper()
         if self.alllowercase:
-            string = string.lower()
-        for c in string:
+            measured = measured.lower()
+        for c in measured:
             try:
                 char_width = self.chartable[c][2]
             except KeyError as e:
@@ -183,4 +256,7 @@ class BmpFont:
                 print("%s is not chartable"%(c))
                 char_width = 4
             length += char_width
+        if len(self.widths) >= MAX_WIDTHS:
+            self.widths.clear()
+        self.widths[string] = length
         return (length, self.height)
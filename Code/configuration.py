@@ -130,6 +130,10 @@ def read_constants_file():
              'support_interact': 1, # Points for interacting
              'support_limit': 5, # Limit to number of support level: 0 - No limit
              'support_s_limit': 0, # Limit to number of s support levels (>4): 0 - No limit
+             'flat_grids': 0, # Whether the pathfinding grids are stored as flat arrays instead of one Node per tile
+             'ai_frame_budget': 8000, # Microseconds the AI may spend thinking each frame
+             'map_snapshot_interval': 16, # Number of new map commands before a save stores a fresh map snapshot
+             'anim_memory_budget': 32, # Megabytes of decoded battle animation sheets kept around
              }
 
     if os.path.isfile('Data/constants.ini'):
@@ -192,6 +196,10 @@ def read_constants_file():
     lines['support_interact'] = int(lines['support_interact'])
     lines['support_limit'] = int(lines['support_limit'])
     lines['support_s_limit'] = int(lines['support_s_limit'])
+    lines['flat_grids'] = int(lines['flat_grids'])
+    lines['ai_frame_budget'] = int(lines['ai_frame_budget'])
+    lines['map_snapshot_interval'] = int(lines['map_snapshot_interval'])
+    lines['anim_memory_budget'] = int(lines['anim_memory_budget'])
 
     return lines
 
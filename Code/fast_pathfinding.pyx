@@ -1,9 +1,27 @@
 # fast_pathfinding.pyx
 # cython
 import heapq
+import array
+from cpython cimport array
 import GlobalConstants as GC
 import configuration as cf
 
+# Node search states. Only meaningful when the node's generation
+# matches the generation of the search that is looking at it
+DEF UNSEEN = 0
+DEF OPEN = 1
+DEF CLOSED = 2
+# Every search takes a new generation number, so nodes left over from
+# an old search are simply treated as unseen instead of being reset.
+# Searches share their grid's nodes and buffers, so a search paused by
+# process_steps has to start over once another one has begun
+cdef long last_generation = 0
+
+cdef long new_generation():
+    global last_generation
+    last_generation += 1
+    return last_generation
+
 cdef bint compare_teams(str team1, str team2):
     # Returns True if allies, false if enemies
     if team1 == team2:
@@ -21,6 +39,8 @@ cdef class Node:
     cdef public int g
     cdef public float h
     cdef public float f
+    cdef public long generation
+    cdef public int state
     def __init__(self, int x, int y, bint reachable, int cost):
         """
         Initialize new cell
@@ -33,31 +53,155 @@ cdef class Node:
         self.cost = cost
         self.x = x
         self.y = y
-        self.reset()
+        self.reset(0)
 
-    cpdef int reset(self):
+    cpdef reset(self, long generation):
         # Malleable properties
         self.parent = None
         self.g = 0
         self.h = 0
         self.f = 0
+        self.generation = generation
+        self.state = UNSEEN
+
+cdef class SearchBuffers:
+    """
+    Scratch arrays for flat grid searches, shared by every grid of a Grid_Manager.
+    Only the search that began last may use them, and the generation stamps mean they never need clearing.
+    Also holds the binary heap used as the open list, so the kernels never touch Python objects
+    """
+    cdef public array.array g
+    cdef public array.array f
+    cdef public array.array parent
+    cdef public array.array generation
+    cdef public array.array state
+    cdef array.array heap_key
+    cdef array.array heap_idx
+    cdef int heap_size
+
+    def __init__(self, int size):
+        self.g = array.array('i', [0]) * size
+        self.f = array.array('d', [0]) * size
+        self.parent = array.array('i', [-1]) * size
+        self.generation = array.array('l', [0]) * size
+        self.state = array.array('b', [UNSEEN]) * size
+        # Every tile can be pushed at most once per neighbour, plus the start
+        self.heap_key = array.array('d', [0]) * (4 * size + 1)
+        self.heap_idx = array.array('i', [0]) * (4 * size + 1)
+        self.heap_size = 0
+
+    cdef void heap_clear(self):
+        self.heap_size = 0
+
+    cdef void heap_push(self, double key, int idx):
+        cdef double *keys = self.heap_key.data.as_doubles
+        cdef int *idxs = self.heap_idx.data.as_ints
+        cdef int pos = self.heap_size
+        cdef int up
+        self.heap_size += 1
+        while pos > 0:
+            up = (pos - 1) >> 1
+            if keys[up] <= key:
+                break
+            keys[pos] = keys[up]
+            idxs[pos] = idxs[up]
+            pos = up
+        keys[pos] = key
+        idxs[pos] = idx
+
+    cdef int heap_pop(self, double *key):
+        cdef double *keys = self.heap_key.data.as_doubles
+        cdef int *idxs = self.heap_idx.data.as_ints
+        cdef int result = idxs[0]
+        cdef double last_key
+        cdef int last_idx, pos, child
+        key[0] = keys[0]
+        self.heap_size -= 1
+        last_key = keys[self.heap_size]
+        last_idx = idxs[self.heap_size]
+        pos = 0
+        while True:
+            child = 2 * pos + 1
+            if child >= self.heap_size:
+                break
+            if child + 1 < self.heap_size and keys[child + 1] < keys[child]:
+                child += 1
+            if keys[child] >= last_key:
+                break
+            keys[pos] = keys[child]
+            idxs[pos] = idxs[child]
+            pos = child
+        keys[pos] = last_key
+        idxs[pos] = last_idx
+        return result
+
+cdef class FlatGrid:
+    """
+    Movement costs of one mcost column, stored as contiguous arrays indexed by x * height + y.
+    Team occupancy and search buffers are shared with the other grids of the Grid_Manager
+    """
+    cdef public int gridWidth
+    cdef public int gridHeight
+    cdef public array.array cost
+    cdef public array.array reachable
+    cdef public array.array team_ids
+    cdef public list team_names
+    cdef public SearchBuffers buffers
+
+    def __init__(self, int grid_width, int grid_height, array.array team_ids, list team_names, SearchBuffers buffers):
+        self.gridWidth = grid_width
+        self.gridHeight = grid_height
+        self.cost = array.array('i', [0]) * (grid_width * grid_height)
+        self.reachable = array.array('b', [0]) * (grid_width * grid_height)
+        self.team_ids = team_ids
+        self.team_names = team_names
+        self.buffers = buffers
+
+    def set_cost(self, int idx, int cost):
+        self.cost.data.as_ints[idx] = cost
+        self.reachable.data.as_schars[idx] = cost != 99
+
+    def __len__(self):
+        return len(self.cost)
+
+    def __getitem__(self, int idx):
+        # For code that still expects a list of Nodes
+        return Node(idx // self.gridHeight, idx % self.gridHeight, self.reachable[idx], self.cost[idx])
 
 class Grid_Manager(object):
-    __slots__ = ['gridHeight', 'gridWidth', 'grids', 'team_map', 'unit_map', 'aura_map', 'known_auras']
+    __slots__ = ['gridHeight', 'gridWidth', 'grids', 'team_map', 'unit_map', 'aura_map', 'known_auras',
+                 'flat', 'team_ids', 'team_names', 'buffers',
+                 'version', 'move_cache', 'move_cache_version', 'move_cache_hits', 'move_cache_misses', 'team_columns']
     def __init__(self, tilemap):
         self.gridHeight = tilemap.height
         self.gridWidth = tilemap.width
         self.grids = {} # Dictionary
 
+        self.flat = cf.CONSTANTS['flat_grids']
+        if self.flat:
+            self.team_ids = array.array('b', [0]) * (self.gridWidth * self.gridHeight)
+            self.team_names = [None] # Team id 0 is an empty tile
+            self.buffers = SearchBuffers(self.gridWidth * self.gridHeight)
         cdef int num
         for num in range(len(GC.MCOSTDATA['Normal'])):
-            self.grids[num] = self.init_grid(num, tilemap) # For each movement type
+            if self.flat:
+                self.grids[num] = self.init_flat_grid(num, tilemap)
+            else:
+                self.grids[num] = self.init_grid(num, tilemap) # For each movement type
 
         self.team_map = self.init_unit_map()
+        self.team_columns = {} # Key: Team, Value: Occupied positions as one bitmask per column
         self.unit_map = self.init_unit_map()
         self.aura_map = self.init_aura_map()
         self.known_auras = {} # Key: Aura, Value: Set of positions
 
+        # Bumped whenever occupancy or terrain changes
+        self.version = 0
+        self.move_cache = {} # Key: (unit id, position, movement left, mcost column, pass through, team), Value: Set of positions
+        self.move_cache_version = 0
+        self.move_cache_hits = 0
+        self.move_cache_misses = 0
+
     def init_unit_map(self):
         cdef int x, y
         cdef list cells
@@ -80,10 +224,21 @@ class Grid_Manager(object):
         cdef int idx
         idx = pos[0] * self.gridHeight + pos[1]
         self.unit_map[idx] = unit
+        if self.team_map[idx]:
+            self.team_columns[self.team_map[idx]][pos[0]] &= ~(1 << pos[1])
         if unit:
             self.team_map[idx] = unit.team
+            self.get_team_columns(unit.team)[pos[0]] |= 1 << pos[1]
         else:
             self.team_map[idx] = None
+        self.version += 1
+        if self.flat:
+            self.team_ids[idx] = self.get_team_id(unit.team) if unit else 0
+
+    def get_team_id(self, team):
+        if team not in self.team_names:
+            self.team_names.append(team)
+        return self.team_names.index(team)
 
     def get_unit_node(self, pos):
         return self.unit_map[pos[0] * self.gridHeight + pos[1]]
@@ -91,6 +246,11 @@ class Grid_Manager(object):
     def get_team_node(self, pos):
         return self.team_map[pos[0] * self.gridHeight + pos[1]]
 
+    def get_team_columns(self, team):
+        if team not in self.team_columns:
+            self.team_columns[team] = [0] * self.gridWidth
+        return self.team_columns[team]
+
     # === For Auras ===
     def reset_aura(self, aura):
         self.known_auras[aura] = set()
@@ -109,13 +269,35 @@ class Grid_Manager(object):
         return self.aura_map[pos[0] * self.gridHeight + pos[1]]
 
     # === For Movement ===
-    def get_grid(self, unit):
+    def get_mcost_column(self, unit):
         if 'flying' in unit.status_bundle:
-            return self.grids[cf.CONSTANTS['flying_mcost_column']]
+            return cf.CONSTANTS['flying_mcost_column']
         elif 'fleet_of_foot' in unit.status_bundle:
-            return self.grids[cf.CONSTANTS['fleet_mcost_column']]
+            return cf.CONSTANTS['fleet_mcost_column']
         else:
-            return self.grids[unit.movement_group]
+            return unit.movement_group
+
+    def get_grid(self, unit):
+        return self.grids[self.get_mcost_column(unit)]
+
+    # === Movement Range Cache ===
+    def get_cached_moves(self, key):
+        if self.move_cache_version != self.version:
+            self.move_cache.clear()
+            self.move_cache_version = self.version
+        valid_moves = self.move_cache.get(key)
+        if valid_moves is None:
+            self.move_cache_misses += 1
+        else:
+            self.move_cache_hits += 1
+        return valid_moves
+
+    def set_cached_moves(self, key, valid_moves):
+        if self.move_cache_version == self.version:
+            self.move_cache[key] = frozenset(valid_moves)
+
+    def get_move_cache_stats(self):
+        return {'hits': self.move_cache_hits, 'misses': self.move_cache_misses, 'size': len(self.move_cache)}
 
     def init_grid(self, mode, tilemap):
         cdef int x, y, tile_cost
@@ -127,13 +309,26 @@ class Grid_Manager(object):
                 cells.append(Node(x, y, tile_cost != 99, tile_cost))
         return cells
 
+    def init_flat_grid(self, mode, tilemap):
+        cdef int x, y
+        cdef FlatGrid grid
+        grid = FlatGrid(self.gridWidth, self.gridHeight, self.team_ids, self.team_names, self.buffers)
+        for x in range(self.gridWidth):
+            for y in range(self.gridHeight):
+                grid.set_cost(x * self.gridHeight + y, tilemap.tiles[(x, y)].get_mcost(mode))
+        return grid
+
     def update_tile(self, tile):
         cdef int x, y, num, cost
+        self.version += 1
         x = tile.position[0]
         y = tile.position[1]
         for num in range(len(GC.MCOSTDATA['Normal'])):
             cost = tile.get_mcost(num)
-            self.grids[num][x * self.gridHeight + y] = Node(x, y, cost != 99, cost)
+            if self.flat:
+                self.grids[num].set_cost(x * self.gridHeight + y, cost)
+            else:
+                self.grids[num][x * self.gridHeight + y] = Node(x, y, cost != 99, cost)
 
     def draw_grid(self, str grid_name):
         cdef int x, y
@@ -160,17 +355,11 @@ class AStar(object):
         self.pass_through = pass_through
         self.reset()
 
-    def reset_grid(self):
-        cdef Node cell
-        for cell in self.cells:
-            cell.reset()
-
     def reset(self):
+        # No need to touch the grid, the next search just moves on to a new generation
         self.open = []
-        heapq.heapify(self.open)
-        self.closed = set()
+        self.generation = 0
         self.path = []
-        self.reset_grid()
 
     def set_goal_pos(self, goal_pos):
         self.goalposition = goal_pos
@@ -227,16 +416,51 @@ class AStar(object):
         return path
         
     def process(self, gameStateObj, bint adj_good_enough=False, bint ally_block=False, limit=None):
-        cdef float f
-        cdef Node cell
-        cdef list adj_cells
+        self.start_search()
+        self.search(gameStateObj, adj_good_enough, ally_block, limit)
+
+    def process_steps(self, gameStateObj, bint adj_good_enough=False, bint ally_block=False, limit=None, int step=64):
+        """
+        Generator version of process that yields every step tiles closed,
+        so the caller can spread the search over several frames.
+        If another search begins in between, this one starts over with bigger steps. Afterwards self.path has the result
+        """
+        self.start_search()
+        while not self.search(gameStateObj, adj_good_enough, ally_block, limit, step):
+            yield
+            if self.generation != last_generation:
+                # Take bigger steps each time, so it can't be kept from ever finishing
+                step *= 2
+                self.start_search()
+
+    def start_search(self):
+        self.open = []
+        self.path = []
+        self.generation = new_generation()
+        self.start.reset(self.generation)
+        self.start.state = OPEN
         # add starting cell to open heap queue
         heapq.heappush(self.open, (self.start.f, self.start))
+
+    def search(self, gameStateObj, bint adj_good_enough=False, bint ally_block=False, limit=None, int step=0):
+        """
+        Continues the search until it is done, or until step more tiles have been closed.
+        Returns whether it is done
+        """
+        cdef float f
+        cdef long generation
+        cdef Node cell, c
+        cdef list adj_cells
+        cdef int closed = 0
+        generation = self.generation
         while self.open:
             # pop cell from heap queue
             f, cell = heapq.heappop(self.open)
-            # add cell to closed set so we don't process it twice
-            self.closed.add(cell)
+            # Lazy deletion -- skip entries left behind by a decrease-key
+            if cell.state == CLOSED or f != cell.f:
+                continue
+            # close cell so we don't process it twice
+            cell.state = CLOSED
             # If this cell is past the limit, just return None. No valid path
             # Uses f, not g, because g will cut off if first greedy path fails
             # f only cuts off if all cells are bad
@@ -249,10 +473,14 @@ class AStar(object):
             # get adjacent cells for cell
             adj_cells = self.get_adjacent_cells(cell)
             for c in adj_cells:
-                if c.reachable and c not in self.closed:
+                if c.reachable:
+                    if c.generation != generation:
+                        c.reset(generation)
+                    elif c.state == CLOSED:
+                        continue
                     unit_team = gameStateObj.grid_manager.get_team_node((c.x, c.y))
                     if not unit_team or (not ally_block and compare_teams(self.unit_team, unit_team)) or self.pass_through:
-                        if (c.f, c) in self.open:
+                        if c.state == OPEN:
                             # if adj cell in open list, check if current path is
                             # better than the one previously found for this adj
                             # cell.
@@ -262,12 +490,19 @@ class AStar(object):
                         else:
                             self.update_cell(c, cell)
                             # Add adj cell to open list
+                            c.state = OPEN
                             heapq.heappush(self.open, (c.f, c))
+            closed += 1
+            if closed == step:
+                return False
+        self.open = []
+        return True
 
 # THIS ACTUALLY WORKS!!!
 cdef class Djikstra:
     cdef list open
-    cdef set closed
+    cdef list closed
+    cdef long generation
     cdef list cells
     cdef int gridWidth
     cdef int gridHeight
@@ -278,12 +513,11 @@ cdef class Djikstra:
 
     def __init__(self, tuple startposition, list grid, int grid_width, int grid_height, str unit_team, bint pass_through):
         self.open = []
-        heapq.heapify(self.open)
-        self.closed = set()
+        self.closed = []
+        self.generation = 0
         self.cells = grid # Must keep order.
         self.gridHeight = grid_height
         self.gridWidth = grid_width
-        self.reset_grid()
         self.startposition = startposition
         self.start = self.get_cell(self.startposition[0], self.startposition[1])
         self.unit_team = unit_team
@@ -292,11 +526,6 @@ cdef class Djikstra:
     cdef Node get_cell(self, int x, int y):
         return self.cells[x * self.gridHeight + y]
 
-    cdef void reset_grid(self):
-        cdef Node cell
-        for cell in self.cells:
-            cell.reset()
-
     cdef list get_adjacent_cells(self, Node cell):
         """
         Returns adjacent cells to a cell. Clockwise starting from the one on
@@ -318,25 +547,66 @@ cdef class Djikstra:
         adj.parent = cell
         
     cpdef set process(self, list team_map, int movement_left):
-        cdef int g
-        cdef Node cell
-        cdef list adj_cells
+        self.start_search()
+        self.search(team_map, movement_left)
+        return self.get_valid_moves()
+
+    def process_steps(self, list team_map, int movement_left, int step=64):
+        """
+        Generator version of process that yields every step tiles closed,
+        so the caller can spread the search over several frames.
+        If another search begins in between, this one starts over with bigger steps. Afterwards get_valid_moves has the result
+        """
+        self.start_search()
+        while not self.search(team_map, movement_left, step):
+            yield
+            if self.generation != last_generation:
+                # Take bigger steps each time, so it can't be kept from ever finishing
+                step *= 2
+                self.start_search()
+
+    cpdef start_search(self):
+        self.open = []
+        self.closed = []
+        self.generation = new_generation()
+        self.start.reset(self.generation)
+        self.start.state = OPEN
         # add starting cell to open heap queue
         heapq.heappush(self.open, (self.start.g, self.start))
+
+    cpdef bint search(self, list team_map, int movement_left, int step=0):
+        """
+        Continues the search until it is done, or until step more tiles have been closed.
+        Returns whether it is done
+        """
+        cdef int g
+        cdef long generation
+        cdef Node cell, c
+        cdef list adj_cells
+        cdef int closed = 0
+        generation = self.generation
         while self.open:
             # pop cell from heap queue
             g, cell = heapq.heappop(self.open)
             if g > movement_left:
-                return {(node.x, node.y) for node in self.closed}
-            # add cell to closed set so we don't process it twice
-            self.closed.add(cell)
+                break
+            # Lazy deletion -- skip entries left behind by a decrease-key
+            if cell.state == CLOSED or g != cell.g:
+                continue
+            # close cell so we don't process it twice
+            cell.state = CLOSED
+            self.closed.append(cell)
             # get adjacent cells for cell
             adj_cells = self.get_adjacent_cells(cell)
             for c in adj_cells:
-                if c.reachable and c not in self.closed:
+                if c.reachable:
+                    if c.generation != generation:
+                        c.reset(generation)
+                    elif c.state == CLOSED:
+                        continue
                     unit_team = team_map[c.x * self.gridHeight + c.y]
                     if not unit_team or compare_teams(self.unit_team, unit_team) or self.pass_through:
-                        if (c.g, c) in self.open:
+                        if c.state == OPEN:
                             # if adj cell in open list, check if current path is
                             # better than the one previously found for this adj
                             # cell.
@@ -346,6 +616,341 @@ cdef class Djikstra:
                         else:
                             self.update_cell(c, cell)
                             # Add adj cell to open list
+                            c.state = OPEN
                             heapq.heappush(self.open, (c.g, c))
-        # Sometimes gets here if unit is enclosed.
+            closed += 1
+            if closed == step:
+                return False
+        # Sometimes runs out of cells if unit is enclosed.
+        self.open = []
+        return True
+
+    cpdef set get_valid_moves(self):
         return {(node.x, node.y) for node in self.closed}
+
+cdef array.array get_allies(str unit_team, list team_names):
+    cdef array.array allies = array.array('b', [0]) * len(team_names)
+    cdef int i
+    for i in range(1, len(team_names)):
+        allies.data.as_schars[i] = compare_teams(unit_team, team_names[i])
+    return allies
+
+cdef class FlatAStar:
+    """
+    AStar over a FlatGrid. Works on tile indices instead of Nodes
+    """
+    cdef FlatGrid grid
+    cdef int gridWidth
+    cdef int gridHeight
+    cdef public tuple startposition
+    cdef public tuple goalposition
+    cdef int start
+    cdef int end
+    cdef list adj_end
+    cdef str unit_team
+    cdef bint pass_through
+    cdef long generation
+    cdef public list path
+
+    def __init__(self, tuple startposition, goalposition, FlatGrid grid, int grid_width, int grid_height, str unit_team, bint pass_through):
+        self.grid = grid
+        self.gridHeight = grid_height
+        self.gridWidth = grid_width
+        self.startposition = startposition
+        self.start = self.startposition[0] * self.gridHeight + self.startposition[1]
+        self.goalposition = None
+        self.end = -1
+        self.adj_end = []
+        if goalposition:
+            self.set_goal_pos(goalposition)
+        self.unit_team = unit_team
+        self.pass_through = pass_through
+        self.reset()
+
+    def reset(self):
+        self.generation = 0
+        self.path = []
+
+    def set_goal_pos(self, tuple goal_pos):
+        self.goalposition = goal_pos
+        self.end = self.goalposition[0] * self.gridHeight + self.goalposition[1]
+        self.adj_end = self.get_adjacent_cells(self.end)
+
+    cdef double get_heuristic(self, int idx):
+        """Compute the heuristic for this cell, h
+        h is approximate distance between this cell and the ending cell"""
+        cdef int gx = self.end // self.gridHeight
+        cdef int gy = self.end % self.gridHeight
+        cdef int dx1, dy1, h, dx2, dy2, cross
+        # Get main heuristic
+        dx1 = idx // self.gridHeight - gx
+        dy1 = idx % self.gridHeight - gy
+        h = abs(dx1) + abs(dy1)
+        # Are we going in direction of goal? -
+        # Slight nudge in direction that lies along path from start to end
+        dx2 = self.start // self.gridHeight - gx
+        dy2 = self.start % self.gridHeight - gy
+        cross = abs(dx1 * dy2 - dx2 * dy1)
+        return h + cross*.001
+
+    cdef list get_adjacent_cells(self, int idx):
+        """
+        Returns adjacent cells to a cell. Clockwise starting from the one on
+        the right"""
+        cdef int x = idx // self.gridHeight
+        cdef int y = idx % self.gridHeight
+        cells = []
+        if x < self.gridWidth-1:
+            cells.append(idx + self.gridHeight)
+        if y > 0:
+            cells.append(idx - 1)
+        if x > 0:
+            cells.append(idx - self.gridHeight)
+        if y < self.gridHeight-1:
+            cells.append(idx + 1)
+        return cells
+
+    cdef list return_path(self, int idx):
+        cdef int *parent = self.grid.buffers.parent.data.as_ints
+        path = []
+        while idx >= 0:
+            path.append((idx // self.gridHeight, idx % self.gridHeight))
+            idx = parent[idx]
+        return path
+
+    def process(self, gameStateObj, bint adj_good_enough=False, bint ally_block=False, limit=None):
+        self.start_search()
+        self.search(gameStateObj, adj_good_enough, ally_block, limit)
+
+    def process_steps(self, gameStateObj, bint adj_good_enough=False, bint ally_block=False, limit=None, int step=64):
+        """
+        Generator version of process that yields every step tiles closed,
+        so the caller can spread the search over several frames.
+        If another search begins in between, this one starts over with bigger steps. Afterwards self.path has the result
+        """
+        self.start_search()
+        while not self.search(gameStateObj, adj_good_enough, ally_block, limit, step):
+            yield
+            if self.generation != last_generation:
+                # Take bigger steps each time, so it can't be kept from ever finishing
+                step *= 2
+                self.start_search()
+
+    cpdef start_search(self):
+        cdef SearchBuffers buffers = self.grid.buffers
+        cdef int start = self.start
+        self.path = []
+        self.generation = new_generation()
+        buffers.g.data.as_ints[start] = 0
+        buffers.f.data.as_doubles[start] = 0
+        buffers.parent.data.as_ints[start] = -1
+        buffers.generation.data.as_longs[start] = self.generation
+        buffers.state.data.as_schars[start] = OPEN
+        # add starting cell to open heap queue
+        buffers.heap_clear()
+        buffers.heap_push(0, start)
+
+    cpdef bint search(self, gameStateObj, bint adj_good_enough=False, bint ally_block=False, limit=None, int step=0):
+        """
+        Continues the search until it is done, or until step more tiles have been closed.
+        Returns whether it is done
+        """
+        cdef SearchBuffers buffers = self.grid.buffers
+        cdef int *cost = self.grid.cost.data.as_ints
+        cdef signed char *reachable = self.grid.reachable.data.as_schars
+        cdef signed char *team_ids = self.grid.team_ids.data.as_schars
+        cdef int *g = buffers.g.data.as_ints
+        cdef double *f = buffers.f.data.as_doubles
+        cdef int *parent = buffers.parent.data.as_ints
+        cdef long *stamp = buffers.generation.data.as_longs
+        cdef signed char *state = buffers.state.data.as_schars
+        cdef array.array allies_array = get_allies(self.unit_team, self.grid.team_names)
+        cdef signed char *allies = allies_array.data.as_schars
+        cdef long generation = self.generation
+        cdef bint has_limit = bool(limit)
+        cdef double limit_value = limit if has_limit else 0
+        cdef int cell, c, n, num_adj, team_id, new_g
+        cdef int adj[4]
+        cdef double cell_f
+        cdef int closed = 0
+        while buffers.heap_size:
+            # pop cell from heap queue
+            cell = buffers.heap_pop(&cell_f)
+            # Lazy deletion -- skip entries left behind by a decrease-key
+            if state[cell] == CLOSED or cell_f != f[cell]:
+                continue
+            # close cell so we don't process it twice
+            state[cell] = CLOSED
+            # If this cell is past the limit, just return None. No valid path
+            if has_limit and cell_f > limit_value:
+                break
+            # if ending cell, display found path
+            if cell == self.end or (adj_good_enough and cell in self.adj_end):
+                self.path = self.return_path(cell)
+                break
+            # get adjacent cells for cell, clockwise starting from the one on the right
+            num_adj = 0
+            if cell // self.gridHeight < self.gridWidth-1:
+                adj[num_adj] = cell + self.gridHeight
+                num_adj += 1
+            if cell % self.gridHeight > 0:
+                adj[num_adj] = cell - 1
+                num_adj += 1
+            if cell // self.gridHeight > 0:
+                adj[num_adj] = cell - self.gridHeight
+                num_adj += 1
+            if cell % self.gridHeight < self.gridHeight-1:
+                adj[num_adj] = cell + 1
+                num_adj += 1
+            for n in range(num_adj):
+                c = adj[n]
+                if reachable[c]:
+                    if stamp[c] != generation:
+                        stamp[c] = generation
+                        state[c] = UNSEEN
+                    elif state[c] == CLOSED:
+                        continue
+                    team_id = team_ids[c]
+                    if not team_id or (not ally_block and allies[team_id]) or self.pass_through:
+                        new_g = g[cell] + cost[c]
+                        if state[c] != OPEN or g[c] > new_g:
+                            g[c] = new_g
+                            f[c] = new_g + self.get_heuristic(c)
+                            parent[c] = cell
+                            state[c] = OPEN
+                            buffers.heap_push(f[c], c)
+            closed += 1
+            if closed == step:
+                return False
+        buffers.heap_clear()
+        return True
+
+cdef class FlatDjikstra:
+    """
+    Djikstra over a FlatGrid. Works on tile indices instead of Nodes
+    """
+    cdef FlatGrid grid
+    cdef int gridWidth
+    cdef int gridHeight
+    cdef tuple startposition
+    cdef int start
+    cdef str unit_team
+    cdef bint pass_through
+    cdef long generation
+    cdef set closed
+
+    def __init__(self, tuple startposition, FlatGrid grid, int grid_width, int grid_height, str unit_team, bint pass_through):
+        self.generation = 0
+        self.closed = set()
+        self.grid = grid
+        self.gridHeight = grid_height
+        self.gridWidth = grid_width
+        self.startposition = startposition
+        self.start = self.startposition[0] * self.gridHeight + self.startposition[1]
+        self.unit_team = unit_team
+        self.pass_through = pass_through
+
+    cpdef set process(self, list team_map, int movement_left):
+        self.start_search()
+        self.search(team_map, movement_left)
+        return self.get_valid_moves()
+
+    def process_steps(self, list team_map, int movement_left, int step=64):
+        """
+        Generator version of process that yields every step tiles closed,
+        so the caller can spread the search over several frames.
+        If another search begins in between, this one starts over with bigger steps. Afterwards get_valid_moves has the result
+        """
+        self.start_search()
+        while not self.search(team_map, movement_left, step):
+            yield
+            if self.generation != last_generation:
+                # Take bigger steps each time, so it can't be kept from ever finishing
+                step *= 2
+                self.start_search()
+
+    cpdef start_search(self):
+        cdef SearchBuffers buffers = self.grid.buffers
+        cdef int start = self.start
+        self.closed = set()
+        self.generation = new_generation()
+        buffers.g.data.as_ints[start] = 0
+        buffers.parent.data.as_ints[start] = -1
+        buffers.generation.data.as_longs[start] = self.generation
+        buffers.state.data.as_schars[start] = OPEN
+        # add starting cell to open heap queue
+        buffers.heap_clear()
+        buffers.heap_push(0, start)
+
+    cpdef bint search(self, list team_map, int movement_left, int step=0):
+        """
+        Continues the search until it is done, or until step more tiles have been closed.
+        Returns whether it is done
+        """
+        # team_map is unused. The FlatGrid carries its own team occupancy
+        cdef SearchBuffers buffers = self.grid.buffers
+        cdef int *cost = self.grid.cost.data.as_ints
+        cdef signed char *reachable = self.grid.reachable.data.as_schars
+        cdef signed char *team_ids = self.grid.team_ids.data.as_schars
+        cdef int *g = buffers.g.data.as_ints
+        cdef int *parent = buffers.parent.data.as_ints
+        cdef long *stamp = buffers.generation.data.as_longs
+        cdef signed char *state = buffers.state.data.as_schars
+        cdef array.array allies_array = get_allies(self.unit_team, self.grid.team_names)
+        cdef signed char *allies = allies_array.data.as_schars
+        cdef long generation = self.generation
+        cdef set closed = self.closed
+        cdef int cell, c, n, num_adj, team_id, new_g
+        cdef int adj[4]
+        cdef double cell_g
+        cdef int num_closed = 0
+        while buffers.heap_size:
+            # pop cell from heap queue
+            cell = buffers.heap_pop(&cell_g)
+            if cell_g > movement_left:
+                break
+            # Lazy deletion -- skip entries left behind by a decrease-key
+            if state[cell] == CLOSED or cell_g != g[cell]:
+                continue
+            # close cell so we don't process it twice
+            state[cell] = CLOSED
+            closed.add((cell // self.gridHeight, cell % self.gridHeight))
+            # get adjacent cells for cell, clockwise starting from the one on the right
+            num_adj = 0
+            if cell // self.gridHeight < self.gridWidth-1:
+                adj[num_adj] = cell + self.gridHeight
+                num_adj += 1
+            if cell % self.gridHeight > 0:
+                adj[num_adj] = cell - 1
+                num_adj += 1
+            if cell // self.gridHeight > 0:
+                adj[num_adj] = cell - self.gridHeight
+                num_adj += 1
+            if cell % self.gridHeight < self.gridHeight-1:
+                adj[num_adj] = cell + 1
+                num_adj += 1
+            for n in range(num_adj):
+                c = adj[n]
+                if reachable[c]:
+                    if stamp[c] != generation:
+                        stamp[c] = generation
+                        state[c] = UNSEEN
+                    elif state[c] == CLOSED:
+                        continue
+                    team_id = team_ids[c]
+                    if not team_id or allies[team_id] or self.pass_through:
+                        new_g = g[cell] + cost[c]
+                        if state[c] != OPEN or g[c] > new_g:
+                            g[c] = new_g
+                            parent[c] = cell
+                            state[c] = OPEN
+                            buffers.heap_push(new_g, c)
+            num_closed += 1
+            if num_closed == step:
+                return False
+        # Sometimes runs out of cells if unit is enclosed.
+        buffers.heap_clear()
+        return True
+
+    cpdef set get_valid_moves(self):
+        return self.closed
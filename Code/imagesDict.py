@@ -1,39 +1,178 @@
-import os
+import os, threading, time, timeit, atexit
+from collections import OrderedDict
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 
 try:
-    import Engine, AnimationManager
+    import Engine, AnimationManager, AssetCache
 except ImportError:
-    from . import Engine, AnimationManager
+    from . import Engine, AnimationManager, AssetCache
+
+import logging
+logger = logging.getLogger(__name__)
 
 COLORKEY = (128, 160, 128)
+# Whether decoded images and sounds are kept in Saves/ between launches, instead of decoding every file on every launch
+USE_ASSET_CACHE = True
+# Whether a background thread decodes the remaining assets once the first frame is drawn, so they are ready before they are needed
+WARM_UP = True
+WARM_UP_ORDER = ('General', 'Icons', 'Items', 'Sounds', 'Characters') # Menus need the general sprites first. Portraits can wait
+WARM_UP_PAUSE = 0.001 # Seconds the warm-up thread sleeps after each asset, so the game keeps running smoothly
+
+START_TIME = timeit.default_timer() # main imports this module first
+first_frame_time = None
+# How each category of assets has loaded so far
+# Key: category, Value: {'files': number of files, 'loaded': number decoded, 'cached': number read from the asset cache, 'ms': time spent decoding}
+LOAD_REPORT = OrderedDict()
+# Assets the game had to stop and decode after the first frame was drawn: (category, name, ms)
+PLAY_LOADS = []
+# Asset dictionaries by category, for the warm-up thread
+ASSET_DICTS = {}
+# Only one asset is decoded at a time, so the asset caches and the report stay consistent between threads
+load_lock = threading.Lock()
+
+class AssetDict(Mapping):
+    """
+    Knows the path of every asset from the start, but only decodes an asset the first time it is looked up.
+    Unknown names raise KeyError, or return default() if a default is given
+    """
+    def __init__(self, category, paths, load, cache=None, default=None):
+        self.category = category
+        self.paths = paths  # Key: name, Value: path
+        self.load = load  # load(cache, name, path) returns the decoded asset
+        self.cache = cache
+        self.default = default
+        self.assets = {}
+        LOAD_REPORT[category] = {'files': len(paths), 'loaded': 0, 'cached': 0, 'ms': 0.}
+        ASSET_DICTS[category] = self
+
+    def __getitem__(self, name):
+        asset = self.assets.get(name)
+        if asset is None:
+            if name not in self.paths:
+                if self.default:
+                    return self.default()
+                raise KeyError(name)
+            asset = self.decode(name)
+        return asset
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, name):
+        return name in self.paths
+
+    def get(self, name, default=None):
+        return self[name] if name in self.paths else default
+
+    def get_loaded(self):
+        return self.assets.items()
+
+    def decode(self, name):
+        with load_lock:
+            if name in self.assets:  # The other thread got to it first
+                return self.assets[name]
+            time1 = timeit.default_timer()
+            hits = self.cache.hits if self.cache else 0
+            asset = self.assets[name] = self.load(self.cache, name, self.paths[name])
+            ms = (timeit.default_timer() - time1)*1000
+            report = LOAD_REPORT[self.category]
+            report['loaded'] += 1
+            report['cached'] += self.cache.hits - hits if self.cache else 0
+            report['ms'] += ms
+        if first_frame_time and threading.current_thread().name == 'MainThread':
+            PLAY_LOADS.append((self.category, name, round(ms, 1)))
+            logger.debug('Waited %.1f ms for %s %s', ms, self.category, name)
+        return asset
+
+    def warm_up(self):
+        for name in list(self.paths):
+            if not Engine.get_display_format():  # The game is shutting down
+                return
+            if name not in self.assets:
+                self.decode(name)
+                time.sleep(WARM_UP_PAUSE)
+
+def get_cache(filename, asset_format, home):
+    if USE_ASSET_CACHE and asset_format and os.path.isdir(home + 'Saves/'):
+        cache = AssetCache.AssetCache(home + 'Saves/' + filename, asset_format)
+        atexit.register(save_cache, cache)
+        return cache
+    return None
+
+def save_cache(cache):
+    # Assets are decoded as the game runs, so the cache is saved when it exits
+    cache.save()
+
+def load_image(cache, path, convert=False, convert_alpha=False, colorkey=None):
+    if cache:
+        return cache.load_image(path, convert, convert_alpha, colorkey)
+    image = Engine.image_load(path, convert=convert, convert_alpha=convert_alpha)
+    if colorkey:
+        Engine.set_colorkey(image, colorkey, rleaccel=True)
+    return image
+
+def load_alpha_image(cache, name, path):
+    return load_image(cache, path, convert_alpha=True)
+
+def load_colorkey_image(cache, name, path):
+    return load_image(cache, path, convert=True, colorkey=COLORKEY)
+
+def load_sound(cache, name, path):
+    sound = cache.load_sound(path) if cache else Engine.create_sound(path)
+    sound.set_volume(get_sound_volume(name))
+    return sound
+
+def get_load_report():
+    return LOAD_REPORT
+
+def first_frame_drawn():
+    global first_frame_time
+    first_frame_time = timeit.default_timer()
+    logger.debug('Time to first frame: %.1f ms', (first_frame_time - START_TIME)*1000)
+    for category, stats in LOAD_REPORT.items():
+        logger.debug('Startup %s: %s of %s files decoded (%s from asset cache) in %.1f ms',
+                     category, stats['loaded'], stats['files'], stats['cached'], stats['ms'])
+    if WARM_UP:
+        thread = threading.Thread(target=warm_up, name='AssetWarmUp')
+        thread.daemon = True
+        thread.start()
+
+def warm_up():
+    time1 = timeit.default_timer()
+    for category in WARM_UP_ORDER:
+        if category in ASSET_DICTS:
+            ASSET_DICTS[category].warm_up()
+    logger.debug('Warmed up assets in %.1f ms', (timeit.default_timer() - time1)*1000)
+    caches = {asset_dict.cache for asset_dict in ASSET_DICTS.values() if asset_dict.cache}
+    for cache in caches:
+        cache.save()
+
+def find_paths(loc, walk=False):
+    # Key: image name, Value: path of every png in the folder (and its subfolders if walk)
+    if walk:
+        return {name[:-4]: os.path.join(root, name) for root, dirs, files in os.walk(loc) for name in files if name.endswith('.png')}
+    return {name[:-4]: loc + name for name in os.listdir(loc) if name.endswith('.png')}
+
 def getImages(home='./'):
+    cache = get_cache('image_cache.p', Engine.get_display_format(), home)
+
     # General Sprites
-    IMAGESDICT = {}
-    for root, dirs, files in os.walk(home + 'Sprites/General/'):
-        for name in files:
-            if name.endswith('.png'):
-                full_name = os.path.join(root, name)
-                IMAGESDICT[name[:-4]] = Engine.image_load(full_name, convert_alpha=True)
+    IMAGESDICT = AssetDict('General', find_paths(home + 'Sprites/General/', walk=True), load_alpha_image, cache)
 
     # Icon Sprites
-    loc = home + 'Sprites/Icons/'
-    ICONDICT = {image[:-4]: Engine.image_load(loc + image, convert_alpha=True) for image in os.listdir(loc) if image.endswith('.png')}
+    ICONDICT = AssetDict('Icons', find_paths(home + 'Sprites/Icons/'), load_alpha_image, cache)
     
     # Item and Skill and Status sprites
-    loc = home + 'Data/Items/'
-    ITEMDICT = {image[:-4]: Engine.image_load(loc + image, convert=True) for image in os.listdir(loc) if image.endswith('.png')}
-    for image in ITEMDICT.values():
-        Engine.set_colorkey(image, COLORKEY, rleaccel=True)
+    ITEMDICT = AssetDict('Items', find_paths(home + 'Data/Items/'), load_colorkey_image, cache)
 
     # Unit Sprites
-    UNITDICT = {}
-    for root, dirs, files in os.walk(home + 'Data/Characters/'):
-        for name in files:
-            if name.endswith('.png'):
-                full_name = os.path.join(root, name)
-                image = Engine.image_load(full_name, convert=True)
-                Engine.set_colorkey(image, COLORKEY, rleaccel=True)
-                UNITDICT[name[:-4]] = image
+    UNITDICT = AssetDict('Characters', find_paths(home + 'Data/Characters/', walk=True), load_colorkey_image, cache)
 
     # Battle Animations
     ANIMDICT = AnimationManager.BattleAnimationManager(COLORKEY, home)
@@ -42,17 +181,13 @@ def getImages(home='./'):
 
 def getSounds(home='./'):
     # SFX Sounds
-    class SoundDict(dict):
-        def __getitem__(self, key):
-            return dict.get(self, key, Engine.BaseSound())
-
+    cache = get_cache('sound_cache.p', Engine.get_mixer_format(), home)
     loc = home + 'Audio/sfx/'
     if os.path.isdir(loc):
-        sfxnameList = [sfx[:-4] for sfx in os.listdir(loc) if sfx.endswith('.wav') or sfx.endswith('.ogg')]
-        sfxList = [Engine.create_sound(loc + sfx) for sfx in os.listdir(loc) if sfx.endswith('.wav') or sfx.endswith('.ogg')]
-        SOUNDDICT = SoundDict(zip(sfxnameList, sfxList))
+        paths = {sfx[:-4]: loc + sfx for sfx in os.listdir(loc) if sfx.endswith('.wav') or sfx.endswith('.ogg')}
     else:
-        SOUNDDICT = SoundDict()
+        paths = {}
+    SOUNDDICT = AssetDict('Sounds', paths, load_sound, cache, Engine.BaseSound)
 
     class MusicDict(dict):
         def __getitem__(self, key):
@@ -73,11 +208,14 @@ def getSounds(home='./'):
 sound_volume = 1.0
 def set_sound_volume(volume, SOUNDDICT):
     global sound_volume
-    sound_volume = volume
-    for name, sound in SOUNDDICT.items():
-        sound.set_volume(volume)
-    # Sets cursor sound volume
-    SOUNDDICT['Select 5'].set_volume(.5*volume)
+    with load_lock:  # Sounds decoded from now on pick up the new volume themselves
+        sound_volume = volume
+        for name, sound in SOUNDDICT.get_loaded():
+            sound.set_volume(get_sound_volume(name))
+
+def get_sound_volume(name):
+    # Cursor sound is quieter
+    return .5*sound_volume if name == 'Select 5' else sound_volume
 
 if __name__ == '__main__':
     getImages()
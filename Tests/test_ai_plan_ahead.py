@@ -0,0 +1,100 @@
+# Check that an AI decision planned ahead of time survives a unit moving elsewhere, and is thrown out when a unit moves into its way
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import Code.SaveLoad as SaveLoad
+import Code.GameStateObj as GameStateObj
+import Code.AI_fsm as AI_fsm
+import Code.configuration as cf
+
+def move_unit(unit, position, gameStateObj):
+    unit.leave(gameStateObj)
+    unit.position = position
+    unit.arrive(gameStateObj)
+
+def unit_state(unit):
+    return unit.position, tuple(unit.items), sorted(status.id for status in unit.status_effects)
+
+def plan_ahead(unit, gameStateObj):
+    # Other units act in between frames, so they must not see this unit moved or holding an item it is testing
+    state = unit_state(unit)
+    while not unit.ai.think(gameStateObj, speculative=True):
+        assert unit_state(unit) == state, '%s was left mid-test in between frames' % unit.name
+        assert unit.ai.get_plan_key(gameStateObj) == unit.ai.planner_key, '%s has an out of date plan key' % unit.name
+    return unit.ai.position_to_move_to, unit.ai.target_to_interact_with, unit.ai.item_to_use
+
+def find_unrelated_move(unit, gameStateObj):
+    # Another unit that is not a target, and can move from outside this unit's plan region to somewhere else outside of it
+    region = set(unit.ai.plan_region)
+    occupied = {other.position for other in gameStateObj.allunits if other.position}
+    for other in gameStateObj.allunits:
+        if other is not unit and other.position and other.position not in region and other not in unit.ai.plan_targets:
+            moves = other.getValidMoves(gameStateObj, force=True) - region - occupied
+            if moves:
+                return other, sorted(moves)[0]
+    return None, None
+
+def find_blocking_move(unit, gameStateObj):
+    # Another unit that can move onto an empty tile of this unit's plan region
+    region = set(unit.ai.plan_region)
+    occupied = {other.position for other in gameStateObj.allunits if other.position}
+    for other in gameStateObj.allunits:
+        if other is not unit and other.position and other.position not in region:
+            moves = (other.getValidMoves(gameStateObj, force=True) & region) - occupied
+            if moves:
+                return other, sorted(moves)[0]
+    return None, None
+
+def check_level(num, gameStateObj, metaDataObj):
+    SaveLoad.load_level('Data/Level' + str(num), gameStateObj, metaDataObj)
+    reused, replanned = 0, 0
+    planners = [unit for unit in gameStateObj.allunits if unit.position and unit.team.startswith('enemy') and
+                unit.ai.ai1_state & AI_fsm.PRIMARYAI['Move']]
+    for unit in planners:
+        unit.reset()
+        decision = plan_ahead(unit, gameStateObj)
+        frames_used = unit.ai.frames_used
+        other, position = find_unrelated_move(unit, gameStateObj)
+        if other:
+            move_unit(other, position, gameStateObj)
+            assert unit.ai.get_plan_key(gameStateObj) == unit.ai.planner_key, '%s lost its plan when %s moved' % (unit.name, other.name)
+            assert unit.ai.think(gameStateObj), '%s did not use its plan' % unit.name
+            assert unit.ai.frames_used == frames_used and not unit.ai.planned, '%s planned again' % unit.name
+            assert (unit.ai.position_to_move_to, unit.ai.target_to_interact_with, unit.ai.item_to_use) == decision
+            reused += 1
+
+        unit.reset()
+        plan_ahead(unit, gameStateObj)
+        other, position = find_blocking_move(unit, gameStateObj)
+        if other:
+            move_unit(other, position, gameStateObj)
+            assert unit.ai.get_plan_key(gameStateObj) != unit.ai.planner_key, '%s kept its plan when %s moved in the way' % (unit.name, other.name)
+            abandoned = []
+            abandon_plan = unit.ai.abandon_plan
+            unit.ai.abandon_plan = lambda: abandoned.append(abandon_plan())
+            while not unit.ai.think(gameStateObj):
+                pass
+            del unit.ai.abandon_plan
+            assert abandoned, '%s used its plan when %s moved in the way' % (unit.name, other.name)
+            replanned += 1
+        unit.reset()
+    gameStateObj.clean_up()
+    return len(planners), reused, replanned
+
+def main():
+    gameStateObj = GameStateObj.GameStateObj()
+    metaDataObj = {}
+    gameStateObj.build_new()
+    gameStateObj.set_generic_mode()
+    # Plan a step or so per frame, so that plans are spread over many frames
+    cf.CONSTANTS['ai_frame_budget'] = 1
+    num = 0
+    while os.path.exists('Data/Level' + str(num)):
+        planners, reused, replanned = check_level(num, gameStateObj, metaDataObj)
+        print('Level: %s  AI units: %s  Plans reused after an unrelated move: %s  Plans redone after a blocking move: %s' %
+              (num, planners, reused, replanned))
+        num += 1
+
+if __name__ == '__main__':
+    main()
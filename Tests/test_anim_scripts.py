@@ -0,0 +1,16 @@
+# Check every battle animation script against the frames it draws, without waiting for a fight to use it
+import Code.GlobalConstants as GC
+import Code.BattleAnimation as BattleAnimation
+
+def main():
+    problems = GC.ANIMDICT.validate_all()
+    for path, poses in sorted(GC.ANIMDICT.scripts.items()):
+        for pose, ops in poses.items():
+            for op in ops:
+                assert op[0] in BattleAnimation.COMMANDS, '%s in pose %s of %s is not supported command' % (op[0], pose, path)
+    for name, missing in sorted(problems.items()):
+        print('%s: %s' % (name, missing))
+    print('Scripts: %s  Animations with missing frames: %s' % (len(GC.ANIMDICT.scripts), len(problems)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# Check that images and sounds read back from the asset cache match decoding the files directly
+import os, wave, struct, tempfile
+
+import Code.GlobalConstants as GC
+import Code.Engine as Engine
+import Code.AssetCache as AssetCache
+import Code.imagesDict as imagesDict
+
+def load_all(cache, paths):
+    return [cache.load_image(path, convert, convert_alpha, colorkey) for path, convert, convert_alpha, colorkey in paths]
+
+def check_images(cache_file):
+    paths = [('Sprites/General/' + name, False, True, None) for name in sorted(os.listdir('Sprites/General/'))[:40] if name.endswith('.png')]
+    paths += [('Data/Items/' + name, True, False, imagesDict.COLORKEY) for name in sorted(os.listdir('Data/Items/')) if name.endswith('.png')]
+    cold_cache = AssetCache.AssetCache(cache_file, Engine.get_display_format())
+    cold = load_all(cold_cache, paths)
+    cold_cache.save()
+    warm_cache = AssetCache.AssetCache(cache_file, Engine.get_display_format())
+    warm = load_all(warm_cache, paths)
+    assert warm_cache.get_stats()['hits'] == len(paths), warm_cache.get_stats()
+    for (path, convert, convert_alpha, colorkey), image, cached in zip(paths, cold, warm):
+        direct = imagesDict.load_image(None, path, convert, convert_alpha, colorkey)
+        assert cached.get_size() == direct.get_size(), path
+        assert cached.get_colorkey() == image.get_colorkey(), path
+        assert Engine.image_tostring(cached, 'RGBA') == Engine.image_tostring(direct, 'RGBA'), path
+    # A different display format makes every entry stale
+    other_cache = AssetCache.AssetCache(cache_file, (8, (0, 0, 0, 0)))
+    assert not other_cache.entries
+
+def check_sounds(cache_file, sound_file):
+    fp = wave.open(sound_file, 'wb')
+    fp.setnchannels(1)
+    fp.setsampwidth(2)
+    fp.setframerate(22050)
+    fp.writeframes(''.join(struct.pack('<h', (num*331) % 20000 - 10000) for num in range(4000)))
+    fp.close()
+    cold_cache = AssetCache.AssetCache(cache_file, Engine.get_mixer_format())
+    direct = cold_cache.load_sound(sound_file)
+    cold_cache.save()
+    warm_cache = AssetCache.AssetCache(cache_file, Engine.get_mixer_format())
+    cached = warm_cache.load_sound(sound_file)
+    assert warm_cache.get_stats()['hits'] == 1
+    assert Engine.sound_to_buffer(cached) == Engine.sound_to_buffer(direct)
+
+def main():
+    directory = tempfile.mkdtemp()
+    check_images(os.path.join(directory, 'image_cache.p'))
+    if Engine.get_mixer_format():
+        check_sounds(os.path.join(directory, 'sound_cache.p'), os.path.join(directory, 'test.wav'))
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+    for category, stats in imagesDict.get_load_report().items():
+        print('%s: %s' % (category, stats))
+
+if __name__ == '__main__':
+    main()
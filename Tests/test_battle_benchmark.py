@@ -0,0 +1,188 @@
+# Play whole turns of each level without a window, and report where the time goes as JSON
+# Usage: python Tests/test_battle_benchmark.py [output.json] [num_turns] [level ...]
+import os, sys, json, random, timeit
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import Code.configuration as cf
+import Code.SaveLoad as SaveLoad
+import Code.GameStateObj as GameStateObj
+import Code.UnitObject as UnitObject
+import Code.Interaction as Interaction
+import Code.AI_fsm as AI_fsm
+import Code.AStar as AStar
+import Code.Utility as Utility
+import Code.static_random as static_random
+
+SEED = 0
+NUM_TURNS = 3
+# Player units move toward and attack the closest enemy, the same way enemies with this AI would
+PLAYER_AI = (AI_fsm.PRIMARYAI['Move'] | AI_fsm.PRIMARYAI['Attack'], 1, 2)
+
+class Timers(object):
+    """Cumulative time spent in each subsystem. Calls nested inside a subsystem count toward it only once"""
+    def __init__(self):
+        self.totals = {}
+        self.calls = {}
+        self.active = set()
+
+    def wrap(self, owner, name, subsystem):
+        func = owner.__dict__[name] if isinstance(owner, type) else getattr(owner, name)
+        self.totals[subsystem] = 0.
+        self.calls[subsystem] = 0
+
+        def timed(*args, **kwargs):
+            if subsystem in self.active:
+                return func(*args, **kwargs)
+            self.active.add(subsystem)
+            time1 = timeit.default_timer()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.totals[subsystem] += timeit.default_timer() - time1
+                self.calls[subsystem] += 1
+                self.active.discard(subsystem)
+        setattr(owner, name, timed)
+        return func
+
+    def reset(self):
+        for subsystem in self.totals:
+            self.totals[subsystem] = 0.
+            self.calls[subsystem] = 0
+
+    def report(self):
+        return {subsystem: {'ms': ms(self.totals[subsystem]), 'calls': self.calls[subsystem]} for subsystem in self.totals}
+
+def ms(seconds):
+    return round(seconds*1000, 3)
+
+def install_timers(timers):
+    timers.wrap(UnitObject.UnitObject, 'getValidMoves', 'pathfinding')
+    timers.wrap(UnitObject.UnitObject, 'getPath', 'pathfinding')
+    timers.wrap(AI_fsm.Secondary_AI, 'build_distance_field', 'pathfinding')
+    timers.wrap(AI_fsm.Secondary_AI, 'getPath', 'pathfinding')
+    timers.wrap(Utility, 'line_of_sight', 'line_of_sight')
+    timers.wrap(Interaction.Solver, 'get_a_result', 'combat')
+    timers.wrap(Interaction.Combat, '_apply_result', 'combat')
+    timers.wrap(AI_fsm.AI, 'think', 'ai')
+
+def resolve_combat(unit, item, target, gameStateObj, metaDataObj):
+    # Same results as a map combat, without the animation, exp and death scripts
+    unit.equip(item)
+    defender, splash = Interaction.convert_positions(gameStateObj, unit, unit.position, target, item)
+    solver = Interaction.Solver(unit, defender, target, splash, item, None)
+    combat = Interaction.Combat()
+    result = solver.get_a_result(gameStateObj, metaDataObj)
+    while result:
+        combat._apply_result(result, gameStateObj)
+        result = solver.get_a_result(gameStateObj, metaDataObj)
+    for other in [unit, defender] + splash:
+        if isinstance(other, UnitObject.UnitObject) and other.position and other.currenthp <= 0:
+            other.die(gameStateObj)
+
+def take_turn(unit, gameStateObj, metaDataObj):
+    time1 = timeit.default_timer()
+    while not unit.ai.think(gameStateObj):
+        pass
+    think_time = timeit.default_timer() - time1
+    ai = unit.ai
+    action = 'wait'
+    if ai.position_to_move_to and ai.position_to_move_to != unit.position:
+        unit.getPath(gameStateObj, ai.position_to_move_to)
+        unit.leave(gameStateObj)
+        unit.position = ai.position_to_move_to
+        unit.arrive(gameStateObj)
+        action = 'move'
+    if ai.target_to_interact_with and ai.item_to_use in unit.items and (ai.item_to_use.weapon or ai.item_to_use.spell):
+        resolve_combat(unit, ai.item_to_use, ai.target_to_interact_with, gameStateObj, metaDataObj)
+        action = 'combat'
+    if unit.position:
+        unit.wait(gameStateObj, script=False)
+    return {'unit': unit.id, 'team': unit.team, 'action': action, 'think_ms': ms(think_time),
+            'frames': ai.frames_used, 'total_ms': ms(timeit.default_timer() - time1)}
+
+def play_phase(team, gameStateObj, metaDataObj):
+    units = [unit for unit in gameStateObj.allunits if unit.position and unit.team == team]
+    for unit in units:
+        unit.reset()
+    # Same order as the AI state
+    units = sorted(units, key=lambda unit: unit.distance_to_closest_enemy(gameStateObj))
+    units = sorted(units, key=lambda unit: unit.ai.ai_group)
+    units = sorted(units, key=lambda unit: unit.ai.priority, reverse=True)
+    return [take_turn(unit, gameStateObj, metaDataObj) for unit in units if unit.position]
+
+def arrange_formation(gameStateObj):
+    # What the arrange_formation script command does when preparations are skipped
+    player_units = [unit for unit in gameStateObj.allunits if unit.team == 'player' and not unit.dead and not unit.position]
+    formation_spots = sorted(pos for pos, value in gameStateObj.map.tile_info_dict.items()
+                             if 'Formation' in value and not gameStateObj.grid_manager.get_unit_node(pos))
+    for unit, position in zip(player_units, formation_spots):
+        unit.position = position
+        unit.place_on_map(gameStateObj)
+        unit.arrive(gameStateObj)
+
+def play_level(num, num_turns, gameStateObj, metaDataObj, timers):
+    random.seed(SEED)
+    static_random.r = static_random.StaticRandom(SEED)
+    time1 = timeit.default_timer()
+    SaveLoad.load_level('Data/Level' + str(num), gameStateObj, metaDataObj)
+    load_time = timeit.default_timer() - time1
+    arrange_formation(gameStateObj)
+    timers.reset()
+
+    own_ai = {}
+    for unit in gameStateObj.allunits:
+        if unit.team == 'player':
+            own_ai[unit] = unit.ai
+            unit.ai = AI_fsm.AI(unit, PLAYER_AI[0], PLAYER_AI[1], view_range=PLAYER_AI[2])
+
+    phases = []
+    for turn in range(1, num_turns + 1):
+        for team in ('player', 'enemy', 'enemy2', 'other'):
+            if any(unit.position and unit.team == team for unit in gameStateObj.allunits):
+                time1 = timeit.default_timer()
+                units = play_phase(team, gameStateObj, metaDataObj)
+                phases.append({'turn': turn, 'team': team, 'ms': ms(timeit.default_timer() - time1), 'units': units})
+
+    for unit, ai in own_ai.items():
+        unit.ai = ai
+    # What the level looks like at the end, so a change in behavior shows up next to a change in speed
+    outcome = sorted([unit.id, unit.position, unit.currenthp] for unit in gameStateObj.allunits if unit.position)
+    report = {'level': num, 'load_ms': ms(load_time), 'map_size': [gameStateObj.map.width, gameStateObj.map.height],
+              'phases': phases, 'subsystems': timers.report(), 'outcome': outcome}
+    gameStateObj.clean_up()
+    return report
+
+def main():
+    out_file = sys.argv[1] if len(sys.argv) > 1 else None
+    num_turns = int(sys.argv[2]) if len(sys.argv) > 2 else NUM_TURNS
+    levels = [int(arg) for arg in sys.argv[3:]]
+    if not levels:
+        while os.path.exists('Data/Level' + str(len(levels))):
+            levels.append(len(levels))
+
+    gameStateObj = GameStateObj.GameStateObj()
+    metaDataObj = {}
+    gameStateObj.build_new()
+    gameStateObj.set_generic_mode()
+    timers = Timers()
+    install_timers(timers)
+
+    reports = []
+    for num in levels:
+        report = play_level(num, num_turns, gameStateObj, metaDataObj, timers)
+        reports.append(report)
+        print('Level: %s  Load: %.1f ms  Phases: %s  %s' % (num, report['load_ms'], ' '.join('%s %.1f' % (phase['team'], phase['ms']) for phase in report['phases']),
+              '  '.join('%s: %.1f ms' % (subsystem, stats['ms']) for subsystem, stats in sorted(report['subsystems'].items()))))
+
+    totals = {subsystem: round(sum(report['subsystems'][subsystem]['ms'] for report in reports), 3) for subsystem in timers.totals}
+    totals['phases'] = round(sum(phase['ms'] for report in reports for phase in report['phases']), 3)
+    result = {'seed': SEED, 'turns': num_turns, 'fast_pathfinding': AStar.FAST_PATHFINDING,
+              'ai_frame_budget': cf.CONSTANTS['ai_frame_budget'], 'totals': totals, 'levels': reports}
+    if out_file:
+        with open(out_file, 'w') as fp:
+            json.dump(result, fp, indent=1, sort_keys=True)
+    print('Totals: %s' % json.dumps(totals, sort_keys=True))
+
+if __name__ == '__main__':
+    main()
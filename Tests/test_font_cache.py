@@ -0,0 +1,47 @@
+# Compare drawing strings from the rendered string cache against drawing them glyph by glyph
+import time
+
+import Code.GlobalConstants as GC
+import Code.Engine as Engine
+import Code.bmpfont as bmpfont
+
+LABELS = ['Iron Sword', 'HP', 'Lv', 'Exp', '40', '12', 'Attack', 'Item', 'Trade', 'Wait', 'Rescue', 'Steal']
+
+def draw(font, string, background, cached):
+    bmpfont.CACHE_STRINGS = cached
+    surf = Engine.copy_surface(background)
+    font.blit(string, surf, (3, 5))
+    return Engine.image_tostring(surf, 'RGB')
+
+def compare(font, background):
+    # Alpha blending can round opaque pixels differently depending on what is under them
+    for string in LABELS:
+        direct = draw(font, string, background, False)
+        for _ in range(3):
+            cached = draw(font, string, background, True)
+            assert max(abs(ord(a) - ord(b)) for a, b in zip(direct, cached)) <= 2, 'Cached %s does not match' % string
+
+def time_labels(font, surf, cached, num_frames=200):
+    bmpfont.CACHE_STRINGS = cached
+    time1 = time.clock()
+    for _ in range(num_frames):
+        for string in LABELS:
+            font.blit(string, surf, (3, 5))
+    return (time.clock() - time1)*1000/num_frames
+
+def main():
+    background = Engine.create_surface((GC.WINWIDTH, 32))
+    for x in range(GC.WINWIDTH):
+        for y in range(32):
+            background.set_at((x, y), ((x*7)%256, (y*13)%256, (x*y)%256))
+    for name in ('text_white', 'text_blue', 'small_white', 'info_black', 'convo_black'):
+        font = GC.FONT[name]
+        compare(font, background)
+        direct = time_labels(font, Engine.copy_surface(background), False)
+        cached = time_labels(font, Engine.copy_surface(background), True)
+        print('Font: %s  Per Frame: %.3f ms  Cached: %.3f ms  Speedup: %.1fx' % (name, direct, cached, direct/max(cached, 1e-9)))
+    print(bmpfont.get_cache_stats())
+    bmpfont.CACHE_STRINGS = True
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# Check that asset dictionaries only decode what is looked up, and that warming up decodes the same images
+import time, threading
+
+import Code.GlobalConstants as GC
+import Code.Engine as Engine
+import Code.imagesDict as imagesDict
+
+def check_lazy():
+    report = imagesDict.get_load_report()
+    assert report['Characters']['loaded'] < len(GC.UNITDICT), 'Unit sprites were decoded up front'
+    name = sorted(GC.UNITDICT)[0]
+    assert name in GC.UNITDICT and 'Not an image' not in GC.UNITDICT
+    was_loaded = name in dict(GC.UNITDICT.get_loaded())
+    loaded = report['Characters']['loaded']
+    assert GC.UNITDICT[name] is GC.UNITDICT.get(name)
+    assert report['Characters']['loaded'] == loaded + (0 if was_loaded else 1)
+    assert GC.UNITDICT.get('Not an image') is None
+    assert isinstance(GC.SOUNDDICT['Not a sound'], Engine.BaseSound)
+    try:
+        GC.IMAGESDICT['Not an image']
+        assert False, 'Missing image did not raise KeyError'
+    except KeyError:
+        pass
+
+def check_warm_up():
+    imagesDict.WARM_UP_PAUSE = 0
+    imagesDict.first_frame_drawn()
+    name = sorted(GC.ICONDICT)[-1]
+    GC.ICONDICT[name]
+    for thread in threading.enumerate():
+        if thread.name == 'AssetWarmUp':
+            thread.join()
+    for category in imagesDict.WARM_UP_ORDER:
+        stats = imagesDict.get_load_report()[category]
+        assert stats['loaded'] == stats['files'], (category, stats)
+    for images, loader in ((GC.IMAGESDICT, imagesDict.load_alpha_image), (GC.UNITDICT, imagesDict.load_colorkey_image)):
+        for name in sorted(images)[:50]:
+            direct = loader(None, name, images.paths[name])
+            assert Engine.image_tostring(images[name], 'RGBA') == Engine.image_tostring(direct, 'RGBA'), name
+
+def main():
+    time1 = time.time()
+    check_lazy()
+    check_warm_up()
+    print('Time to first frame: %.1f ms' % ((imagesDict.first_frame_time - imagesDict.START_TIME)*1000))
+    for category, stats in imagesDict.get_load_report().items():
+        print('%s: %s of %s decoded (%s cached) in %.1f ms' % (category, stats['loaded'], stats['files'], stats['cached'], stats['ms']))
+    print('Loaded during play: %s  Checked in %.1f ms' % (imagesDict.PLAY_LOADS, (time.time() - time1)*1000))
+
+if __name__ == '__main__':
+    main()
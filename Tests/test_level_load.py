@@ -5,6 +5,7 @@ import cProfile
 
 import Code.SaveLoad as SaveLoad
 import Code.GameStateObj as GameStateObj
+GameStateObj.CHECK_UNIT_INDEX = True
 
 import logging
 my_level = logging.DEBUG
@@ -0,0 +1,59 @@
+# Compare bulk tile data decoding against decoding one pixel at a time
+import os, time
+
+import Code.Engine as Engine
+import Code.TileObject as TileObject
+import Code.SaveLoad as SaveLoad
+import Code.GameStateObj as GameStateObj
+
+def decode(current_map, image):
+    colorkey, width, height = current_map.build_color_key(image)
+    current_map._tiles = {}
+    current_map.populate_tiles(colorkey)
+    return current_map._tiles
+
+def tile_key(tile):
+    return tile.name, tile.minimap, tile.platform, tile.mcost, tile.stats['DEF'], tile.AVO
+
+def compare(current_map, image, num_runs=3):
+    times = {}
+    results = {}
+    for fast in (False, True):
+        TileObject.FAST_DECODE = fast
+        time1 = time.clock()
+        for _ in range(num_runs):
+            tiles = decode(current_map, image)
+        times[fast] = (time.clock() - time1)/num_runs
+        results[fast] = {pos: tile_key(tile) for pos, tile in tiles.items()}
+    assert results[True] == results[False], 'Bulk decoding does not match'
+    return times
+
+def tiled(image, repeat):
+    # Bigger map made of copies of the image
+    width, height = image.get_size()
+    surf = Engine.create_surface((width*repeat, height*repeat))
+    for x in range(repeat):
+        for y in range(repeat):
+            surf.blit(image, (x*width, y*height))
+    return surf
+
+def main():
+    gameStateObj = GameStateObj.GameStateObj()
+    gameStateObj.build_new()
+    num = 0
+    while True:
+        levelfolder = 'Data/Level' + str(num)
+        if not os.path.exists(levelfolder):
+            break
+        current_map = SaveLoad.create_map(levelfolder)
+        image = Engine.image_load(levelfolder + '/TileData.png', convert=True)
+        for repeat in (1, 2, 4):
+            surf = tiled(image, repeat)
+            times = compare(current_map, surf)
+            print('Level: %s  Map Size: %sx%s  Per Pixel: %.4f  Bulk: %.4f  Speedup: %.1fx' %
+                  (num, surf.get_width(), surf.get_height(), times[False], times[True], times[False]/max(times[True], 1e-9)))
+        num += 1
+    TileObject.FAST_DECODE = True
+
+if __name__ == '__main__':
+    main()
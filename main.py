@@ -75,6 +75,8 @@ def run(gameStateObj, metaDataObj):
         Engine.push_display(mapSurf, new_size, GC.DISPLAYSURF)
         # Keep gameloop (update, renders, etc) ticking
         Engine.update_display()
+        if imagesDict.first_frame_time is None:
+            imagesDict.first_frame_drawn()
         gameStateObj.playtime += GC.FPSCLOCK.tick(GC.FPS)
     # === END OF MAIN GAME LOOP ===
 